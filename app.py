@@ -1,20 +1,21 @@
 import os
-from typing import Dict, Optional
-import requests
+from dataclasses import asdict
+from typing import Dict, List, Optional
 
 import streamlit as st
 import streamlit.components.v1 as components
 from dotenv import load_dotenv
 
 from src.models.types import Profile
-from src.data.github_client import fetch_github_user
-from src.data.reddit_client import fetch_reddit_user
-from src.data.instagram_client import fetch_instagram_user
 from src.data.web_search import web_mentions
-from src.similarity.text_similarity import compare_usernames, bio_similarity
-from src.similarity.image_similarity import image_similarity
+from src.similarity.dedup import dedupe_mentions
+from src.similarity.text_similarity import BIO_SIMILARITY_TIER, warm_up
+from src.similarity.scoring import score_comparison
 from src.graph.graph_builder import build_footprint_html, build_comparison_html
-from pyvis.network import Network
+from src.graph.layout import static_options
+
+# Heavy or mode-specific modules (HTTP clients, PIL, pyvis, requests) are imported
+# where they are first used, so cold start only pays for what the chosen mode needs.
 
 # Load .env early
 load_dotenv()
@@ -258,7 +259,7 @@ with st.sidebar:
     
     st.markdown("### ⚙️ Settings")
     enable_imgs = os.getenv("ENABLE_IMAGE_SIMILARITY", "true").lower() == "true"
-    enable_emb = os.getenv('ENABLE_EMBEDDINGS','false').lower()=='true'
+    enable_emb = BIO_SIMILARITY_TIER == "embeddings"
     friendly_graph = st.checkbox("Beginner-friendly graph labels", value=True)
     use_api_backend = st.checkbox("Use API backend (FastAPI)", value=True)
     api_base_url = st.text_input("API Base URL", value=os.getenv("API_BASE_URL", "http://localhost:8000"), help="FastAPI server base URL")
@@ -267,7 +268,7 @@ with st.sidebar:
     with col1:
         st.metric("Image Analysis", "✅" if enable_imgs else "❌")
     with col2:
-        st.metric("AI Embeddings", "✅" if enable_emb else "❌")
+        st.metric("Bio Matching", {"embeddings": "AI", "ngram": "N-gram"}.get(BIO_SIMILARITY_TIER, "Fuzzy"))
     
     st.markdown("---")
     
@@ -285,6 +286,10 @@ with st.sidebar:
     st.info("💡 **Pro Tip:** Enable API keys in environment variables for enhanced data collection and analysis accuracy.")
 
 def collect_profiles(username: str) -> Dict[str, Profile]:
+    from src.data.github_client import fetch_github_user
+    from src.data.reddit_client import fetch_reddit_user
+    from src.data.instagram_client import fetch_instagram_user
+
     profiles: Dict[str, Profile] = {}
     gh = fetch_github_user(username)
     if gh:
@@ -348,7 +353,16 @@ def show_profiles_cards(title: str, profiles: Dict[str, Profile]):
                 st.markdown(f"**🔗 [View {platform.title()} Profile]({p.profile_url})**")
         i += 1
 
+def api_get(base_url: str, path: str, params: Dict[str, str]) -> Dict:
+    import requests  # only needed in API mode
+
+    r = requests.get(f"{base_url}{path}", params=params, timeout=90)
+    r.raise_for_status()
+    return r.json()
+
 def graph_from_api(nodes, edges) -> str:
+    from pyvis.network import Network
+
     net = Network(height="650px", width="100%", bgcolor="#0f172a", font_color="#e2e8f0")
     for n in nodes:
         nid = n.get("id")
@@ -363,17 +377,81 @@ def graph_from_api(nodes, edges) -> str:
         if meta.get("url"):
             title_parts.append(str(meta.get("url")))
         title = "\n".join(title_parts)
-        net.add_node(nid, label=label, title=title, group=group)
+        pos = {"x": n["x"], "y": n["y"]} if n.get("x") is not None and n.get("y") is not None else {}
+        net.add_node(nid, label=label, title=title, group=group, **pos)
     for e in edges:
         net.add_edge(e.get("source"), e.get("target"), title=e.get("label"), value=e.get("weight"))
-    net.set_options("""
+    options = """
 {
   "nodes": { "font": { "color": "#e2e8f0" } },
   "edges": { "color": { "color": "#64748b" } }
 }
-""")
+"""
+    # Server-side layout was applied to large graphs; skip browser physics for them
+    positioned = any(n.get("x") is not None for n in nodes)
+    net.set_options(static_options(options) if positioned else options)
     return net.generate_html(notebook=False)
 
+def profile_from_node(platform: str, uname: str, meta: Dict) -> Profile:
+    return Profile(
+        platform=platform,
+        username=uname,
+        display_name=meta.get("display_name") or uname,
+        bio=meta.get("bio"),
+        followers=meta.get("followers"),
+        profile_url=meta.get("url"),
+        avatar_url=meta.get("avatar"),
+    )
+
+# Cached wrappers: widget toggles rerun the script, but reuse fetched data and rendered HTML
+CACHE_TTL = int(os.getenv("STREAMLIT_CACHE_TTL", "900"))
+
+@st.cache_resource(show_spinner=False)
+def warm_embeddings() -> bool:
+    warm_up(background=True)
+    return True
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_profiles(username: str) -> Dict[str, Profile]:
+    return collect_profiles(username)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_mentions(query: str) -> List[Dict]:
+    # Syndicated copies and mirrors collapse into one entry, so counts are distinct mentions
+    return dedupe_mentions(web_mentions(query, num_results=5))
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def cached_api_get(base_url: str, path: str, params: Dict[str, str]) -> Dict:
+    return api_get(base_url, path, params)
+
+def show_incomplete(data: Dict, cached_fn, *args) -> None:
+    missing = data.get("incomplete") or []
+    if missing:
+        st.info(f"Partial results: {', '.join(missing)} did not answer in time.")
+        # Don't keep a partial answer around for the whole cache TTL
+        cached_fn.clear(*args)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_graph_from_api(nodes, edges) -> str:
+    return graph_from_api(nodes, edges)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_footprint_html(label: str, profiles: Dict[str, Profile], friendly: bool) -> str:
+    return build_footprint_html(label, profiles, friendly=friendly)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def cached_comparison_html(ua: str, ub: str, profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile],
+                           platform_scores: Dict[str, float], friendly: bool) -> str:
+    return build_comparison_html(ua, ub, profiles_a, profiles_b, platform_scores, friendly=friendly)
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def compare_scores(ua: str, ub: str, profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile],
+                   with_images: bool) -> Dict:
+    return asdict(score_comparison(ua, ub, profiles_a, profiles_b, with_images=with_images))
+
+if enable_emb:
+    warm_embeddings()
+
 if "Footprint" in mode:
     st.markdown("### 🔍 Digital Footprint Analysis")
     st.markdown("Discover and analyze a user's digital presence across multiple platforms.")
@@ -390,18 +468,23 @@ if "Footprint" in mode:
     with col2:
         search_clicked = st.button("🔍 Analyze", type="primary", use_container_width=True)
     
+    # The last submitted search survives reruns, so toggling an option re-renders from cache
     if search_clicked and username.strip():
+        st.session_state["footprint_query"] = (search_mode, username.strip())
+    footprint_query = st.session_state.get("footprint_query")
+
+    if footprint_query:
+        query_mode, query = footprint_query
         with st.spinner(""):
             profiles = {}
             mentions = []
             used_api = False
             if use_api_backend:
                 try:
-                    params = {"username": username.strip()} if search_mode == "Username" else {"full_name": username.strip()}
-                    r = requests.get(f"{api_base_url}/footprint", params=params, timeout=90)
-                    r.raise_for_status()
-                    data = r.json()
+                    params = {"username": query} if query_mode == "Username" else {"full_name": query}
+                    data = cached_api_get(api_base_url, "/footprint", params)
                     used_api = True
+                    show_incomplete(data, cached_api_get, api_base_url, "/footprint", params)
                     # Build profile cards directly from API nodes
                     profiles_api: Dict[str, Profile] = {}
                     for n in data.get("nodes", []):
@@ -413,35 +496,25 @@ if "Footprint" in mode:
                         if len(parts) != 2:
                             continue
                         platform, uname = parts[0], parts[1]
-                        meta = n.get("meta") or {}
-                        profiles_api[platform] = Profile(
-                            platform=platform,
-                            username=uname,
-                            display_name=meta.get("display_name") or uname,
-                            bio=meta.get("bio"),
-                            followers=meta.get("followers"),
-                            profile_url=meta.get("url"),
-                            avatar_url=meta.get("avatar"),
-                        )
+                        profiles_api[platform] = profile_from_node(platform, uname, n.get("meta") or {})
                     # Prefer local graph for consistency when local fetch succeeds; otherwise use API graph
                     if profiles_api:
                         profiles = profiles_api
-                        html_api = graph_from_api(data.get("nodes", []), data.get("edges", []))
+                        html_api = cached_graph_from_api(data.get("nodes", []), data.get("edges", []))
                         components.html(html_api, height=650, scrolling=True)
                     else:
-                        profiles = collect_profiles(username.strip())
-                        html_local = build_footprint_html(username.strip(), profiles, friendly=friendly_graph)
+                        profiles = cached_profiles(query)
+                        html_local = cached_footprint_html(query, profiles, friendly_graph)
                         components.html(html_local, height=650, scrolling=True)
                 except Exception as e:
                     st.warning(f"API unavailable, falling back to local: {e}")
             if not used_api:
                 # local mode supports only username; if a full name was provided, keep it simple: try heuristics here too
-                handle = username.strip()
-                profiles = collect_profiles(handle)
-                html = build_footprint_html(username.strip(), profiles, friendly=friendly_graph)
+                profiles = cached_profiles(query)
+                html = cached_footprint_html(query, profiles, friendly_graph)
                 components.html(html, height=650, scrolling=True)
             # mentions shown regardless
-            mentions = web_mentions(username.strip(), num_results=5)
+            mentions = cached_mentions(query)
 
         # Show profile cards once
         show_profiles_cards("Profiles", profiles)
@@ -507,6 +580,9 @@ if "Footprint" in mode:
                     st.markdown(f"**🔗 [Open Link]({m.get('link')})**")
                     if m.get("snippet"):
                         st.markdown(f"*{m['snippet']}*")
+                    if m.get("duplicates"):
+                        copies = ", ".join(f"[{i}]({link})" for i, link in enumerate(m["duplicates"], 1) if link)
+                        st.caption(f"Also found on {len(m['duplicates'])} near-duplicate page(s): {copies}")
         else:
             st.info("🔍 No web mentions found. This could be due to limited search results or Google CSE not configured.")
 
@@ -537,76 +613,40 @@ else:
     compare_clicked = st.button("⚖️ Compare Users", type="primary", use_container_width=True)
     
     if compare_clicked and user_a.strip() and user_b.strip():
-        ua = user_a.strip()
-        ub = user_b.strip()
+        st.session_state["compare_query"] = (user_a.strip(), user_b.strip())
+    compare_query = st.session_state.get("compare_query")
+
+    if compare_query:
+        ua, ub = compare_query
         with st.spinner(""):
             used_api = False
             profiles_a = {}
             profiles_b = {}
             if use_api_backend:
                 try:
-                    r = requests.get(f"{api_base_url}/compare", params={"user_a": ua, "user_b": ub}, timeout=90)
-                    r.raise_for_status()
-                    data = r.json()
-                    html_api = graph_from_api(data.get("nodes", []), data.get("edges", []))
+                    data = cached_api_get(api_base_url, "/compare", {"user_a": ua, "user_b": ub})
+                    # Profiles and scores come from the same response; nothing is recomputed here.
+                    # Parse everything before rendering so a response this UI can't read falls back cleanly
+                    profiles_a = {k: Profile(**v) for k, v in data["profiles_a"].items()}
+                    profiles_b = {k: Profile(**v) for k, v in data["profiles_b"].items()}
+                    scores = data["scores"]
+                    html_api = cached_graph_from_api(data.get("nodes", []), data.get("edges", []))
+                    show_incomplete(data, cached_api_get, api_base_url, "/compare", {"user_a": ua, "user_b": ub})
                     components.html(html_api, height=650, scrolling=True)
                     used_api = True
-                    # Also fetch local profiles for details consistency
-                    profiles_a = collect_profiles(ua)
-                    profiles_b = collect_profiles(ub)
                 except Exception as e:
                     st.warning(f"API unavailable, falling back to local: {e}")
             if not used_api:
-                profiles_a = collect_profiles(ua)
-                profiles_b = collect_profiles(ub)
-
-            # Platform similarity
-            platform_scores: Dict[str, float] = {}
-            for platform in set(list(profiles_a.keys()) + list(profiles_b.keys())):
-                pa = profiles_a.get(platform)
-                pb = profiles_b.get(platform)
-                if pa and pb:
-                    user_sim = compare_usernames(pa.username, pb.username)
-                    bio_sim = bio_similarity(pa.bio, pb.bio)
-                    # Weight usernames and bios
-                    platform_scores[platform] = (0.5 * user_sim) + (0.5 * bio_sim)
-
-            # Overall metrics
-            overall_username = compare_usernames(ua, ub)
-            # Average bio similarity where both bios exist
-            bio_sims = []
-            for platform in platform_scores:
-                pa = profiles_a.get(platform)
-                pb = profiles_b.get(platform)
-                if pa and pb and pa.bio and pb.bio:
-                    bio_sims.append(bio_similarity(pa.bio, pb.bio))
-            overall_bio = sum(bio_sims) / len(bio_sims) if bio_sims else 0.0
-
-            shared = len([p for p in platform_scores.keys()])
-            total_unique = len(set(list(profiles_a.keys()) + list(profiles_b.keys())))
-            mutual_presence = (shared / total_unique) if total_unique else 0.0
-
-            img_sim_val: Optional[float] = None
-            if enable_imgs:
-                # Try image sim only across shared platforms first; fallback to main GH avatars
-                candidates = []
-                for platform in platform_scores:
-                    pa = profiles_a.get(platform)
-                    pb = profiles_b.get(platform)
-                    if pa and pb and pa.avatar_url and pb.avatar_url:
-                        candidates.append((pa.avatar_url, pb.avatar_url))
-                if not candidates:
-                    # fallback: try github avatars if present
-                    ga, gb = profiles_a.get("github"), profiles_b.get("github")
-                    if ga and gb and ga.avatar_url and gb.avatar_url:
-                        candidates.append((ga.avatar_url, gb.avatar_url))
-                if candidates:
-                    img_sim_val = image_similarity(candidates[0][0], candidates[0][1])
-
-            # Impersonation likelihood (heuristic)
-            # 40% bio, 30% username, 20% mutual presence, 10% image similarity (if any)
-            imp_like = (0.4 * overall_bio) + (0.3 * overall_username) + (0.2 * mutual_presence) + (0.1 * (img_sim_val or 0.0))
-            imp_like = max(0.0, min(1.0, imp_like))
+                profiles_a = cached_profiles(ua)
+                profiles_b = cached_profiles(ub)
+                scores = compare_scores(ua, ub, profiles_a, profiles_b, enable_imgs)
+
+            platform_scores = scores["platform_scores"]
+            overall_bio = scores["overall_bio"]
+            overall_username = scores["overall_username"]
+            mutual_presence = scores["mutual_presence"]
+            img_sim_val = scores["image_similarity"]
+            imp_like = scores["impersonation_likelihood"]
 
         # Enhanced metrics panel
         st.markdown("### 📊 Similarity Analysis Results")
@@ -687,6 +727,19 @@ else:
             else:
                 st.success("✅ **LOW RISK**\nMinimal impersonation indicators.")
 
+        # Same person (or impersonator) on a different platform than the one compared
+        cross_matches = scores.get("cross_matches") or []
+        if cross_matches:
+            st.markdown("### 🔀 Cross-Platform Matches")
+            for cm in cross_matches:
+                flags = {"skeleton": "lookalike handle", "affix": "handle + affix"}
+                evidence = ", ".join(flags[k] if k in flags else f"{k.replace('_', ' ')} {int(v*100)}%"
+                                     for k, v in cm["evidence"].items())
+                st.markdown(
+                    f"- **A {cm['a']}:{cm['username_a']}** ↔ **B {cm['b']}:{cm['username_b']}** — "
+                    f"{int(cm['score']*100)}% ({evidence})"
+                )
+
         # Enhanced AI Insights
         st.markdown("### 🤖 AI-Powered Insights")
 
@@ -761,7 +814,7 @@ else:
 
         # Graph (local only)
         if not use_api_backend:
-            html = build_comparison_html(ua, ub, profiles_a, profiles_b, platform_scores, friendly=friendly_graph)
+            html = cached_comparison_html(ua, ub, profiles_a, profiles_b, platform_scores, friendly_graph)
             components.html(html, height=650, scrolling=True)
 
 # Footer
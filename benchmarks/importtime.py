@@ -0,0 +1,107 @@
+"""Cold-import budget check based on `python -X importtime`.
+
+    python -m benchmarks.importtime            # report and check budgets
+    python -m benchmarks.importtime --top 20   # also list the slowest modules
+
+Each target is imported in a fresh interpreter. A target fails when its
+cumulative import time exceeds its budget, or when it pulls in a module that
+should only load on first use (pyvis, PIL, ...).
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _app_imports() -> str:
+    """Import statement for every module app.py imports at the top level, read from app.py
+    itself so the target can't drift from it. Streamlit is left out: it is the host process,
+    loaded before app.py runs (and app.py can't be imported outside streamlit)."""
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        modules.extend(n for n in names if n.split(".")[0] != "streamlit" and n not in modules)
+    return "import " + ", ".join(modules)
+
+
+# name -> (import statement, budget in ms, modules that must not be imported eagerly)
+TARGETS: Dict[str, Tuple[str, float, Tuple[str, ...]]] = {
+    # What app.py imports before the UI renders
+    "app": (
+        _app_imports(),
+        150.0,
+        ("pyvis", "networkx", "PIL", "imagehash", "requests", "praw", "instaloader", "googleapiclient"),
+    ),
+    "api": (
+        "import src.api.server",
+        1200.0,
+        ("pyvis", "networkx", "PIL", "imagehash", "praw", "instaloader", "googleapiclient", "sentence_transformers"),
+    ),
+    "graph_builder": ("import src.graph.graph_builder", 100.0, ("pyvis", "networkx")),
+    "image_similarity": ("import src.similarity.image_similarity", 50.0, ("PIL", "imagehash")),
+}
+
+
+def measure(statement: str) -> Tuple[float, Dict[str, float]]:
+    """Total cumulative import time (ms) and per-top-level-package cumulative times."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    packages: Dict[str, float] = {}
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, tree = line[len("import time:"):].split("|")
+        name = tree.strip()
+        us = float(cumulative)
+        if len(tree) - len(tree.lstrip()) == 1:  # top-level import of the statement
+            total += us
+        root = name.split(".")[0]
+        packages[root] = max(packages.get(root, 0.0), us / 1000.0)
+    return total / 1000.0, packages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MeMap+ import-time budgets")
+    parser.add_argument("-k", dest="pattern", default="", help="only check targets whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters per target (best is kept)")
+    parser.add_argument("--top", type=int, default=0, help="show the N slowest top-level packages")
+    args = parser.parse_args(argv)
+
+    failed = False
+    # Interpreter startup (site, sitecustomize, ...) is not charged to any target
+    startup_ms, startup_pkgs = min((measure("pass") for _ in range(max(1, args.repeat))), key=lambda r: r[0])
+    for name, (statement, budget, forbidden) in TARGETS.items():
+        if args.pattern not in name:
+            continue
+        runs = [measure(statement) for _ in range(max(1, args.repeat))]
+        total, packages = min(runs, key=lambda r: r[0])
+        total = max(0.0, total - startup_ms)
+        packages = {k: v for k, v in packages.items() if k not in startup_pkgs}
+        eager = sorted(m for m in forbidden if m in packages)
+        ok = total <= budget and not eager
+        failed |= not ok
+        status = "ok" if ok else "FAIL"
+        print(f"{name:<18} {total:8.1f} ms  (budget {budget:.0f} ms)  {status}")
+        if eager:
+            print(f"  imported eagerly: {', '.join(eager)}")
+        for pkg, ms in sorted(packages.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"  {pkg:<28} {ms:8.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""End-to-end load test for the FastAPI server against local platform stubs.
+
+    python -m benchmarks.loadtest --concurrency 32 --duration 30 \
+        --mix username=5,full_name=1,compare=3 --stub-latency-ms 80 --workers 2
+
+By default it spawns the stub server and a uvicorn API wired to it; pass
+--api-url / --stub-url to target processes you started yourself.
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from src.devtools.stub_server import client_env
+
+_HANDLES = [f"{base}{suffix}" for base in ("octocat", "alice", "bob_dev", "carol", "tanmay", "shadow", "pixel", "nova")
+            for suffix in ("", "_", "1", "official", "_real")]
+_NAMES = ["Ada Lovelace", "Grace Hopper", "Alan Turing", "Shah Rukh Khan", "Linus Torvalds", "Margaret Hamilton"]
+
+# Histogram bucket upper bounds in milliseconds
+_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, float("inf")]
+
+
+def _request_for(kind: str, rng: random.Random) -> Tuple[str, Dict[str, str]]:
+    if kind == "username":
+        return "/footprint", {"username": rng.choice(_HANDLES)}
+    if kind == "full_name":
+        return "/footprint", {"full_name": rng.choice(_NAMES)}
+    if kind == "compare":
+        a = rng.choice(_HANDLES)
+        return "/compare", {"user_a": a, "user_b": rng.choice(_HANDLES)}
+    raise ValueError(f"unknown request kind: {kind}")
+
+
+def _parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        mix.append((kind.strip(), float(weight or 1)))
+    return mix
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return float("nan")
+    idx = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+def _spawn(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable] + args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+
+async def _drive(api_url: str, mix: List[Tuple[str, float]], concurrency: int, duration: float,
+                 max_requests: int, timeout: float, seed: int):
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    outcomes: Dict[str, Counter] = defaultdict(Counter)
+    kinds = [k for k, _ in mix]
+    weights = [w for _, w in mix]
+    sent = 0
+    stop_at = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=api_url, timeout=timeout,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker(wid: int):
+            nonlocal sent
+            rng = random.Random(seed * 1000 + wid)
+            while time.perf_counter() < stop_at and (not max_requests or sent < max_requests):
+                sent += 1
+                kind = rng.choices(kinds, weights)[0]
+                path, params = _request_for(kind, rng)
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(path, params=params)
+                    outcome = str(r.status_code)
+                except httpx.TimeoutException:
+                    outcome = "timeout"
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+                latencies[kind].append((time.perf_counter() - t0) * 1000.0)
+                outcomes[kind][outcome] += 1
+
+        t_start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - t_start
+    return latencies, outcomes, elapsed
+
+
+def _report(latencies, outcomes, elapsed: float, upstream: Dict[str, int]) -> None:
+    total = sum(len(v) for v in latencies.values())
+    errors = sum(c for oc in outcomes.values() for k, c in oc.items() if k != "200")
+    print(f"\n{total} requests in {elapsed:.1f}s -> {total / elapsed:.1f} req/s, "
+          f"error rate {errors / max(1, total):.2%}")
+    print(f"\n{'kind':<10} {'n':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  outcomes")
+    for kind, vals in sorted(latencies.items()):
+        s = sorted(vals)
+        print(f"{kind:<10} {len(s):>6} {_percentile(s, .5):>8.1f}ms {_percentile(s, .9):>8.1f}ms "
+              f"{_percentile(s, .99):>8.1f}ms {s[-1]:>8.1f}ms  {dict(outcomes[kind])}")
+
+    print("\nlatency histogram (all kinds)")
+    counts = [0] * len(_BUCKETS_MS)
+    for vals in latencies.values():
+        for v in vals:
+            counts[bisect.bisect_left(_BUCKETS_MS, v)] += 1
+    peak = max(counts) or 1
+    lower = 0.0
+    for bound, c in zip(_BUCKETS_MS, counts):
+        if c:
+            label = f"{lower:g}-{bound:g}ms" if bound != float("inf") else f">{lower:g}ms"
+            print(f"  {label:>14} {c:>7} {'#' * max(1, int(40 * c / peak))}")
+        lower = bound
+
+    if upstream:
+        print("\nupstream calls (total / per request)")
+        for key, c in sorted(upstream.items()):
+            print(f"  {key:<24} {c:>8} {c / max(1, total):>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test /footprint and /compare")
+    parser.add_argument("--api-url", help="existing API server (default: spawn one)")
+    parser.add_argument("--stub-url", help="existing stub server (default: spawn one)")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--stub-port", type=int, default=9765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned API")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="stop after N requests (0 = duration only)")
+    parser.add_argument("--mix", default="username=5,full_name=1,compare=3")
+    parser.add_argument("--timeout", type=float, default=90.0)
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-rate-limit", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    procs: List[subprocess.Popen] = []
+    try:
+        stub_url = args.stub_url
+        if not stub_url:
+            stub_url = f"http://127.0.0.1:{args.stub_port}"
+            procs.append(_spawn([
+                "-m", "src.devtools.stub_server", "--port", str(args.stub_port),
+                "--latency-ms", str(args.stub_latency_ms), "--latency-jitter-ms", str(args.stub_jitter_ms),
+                "--error-rate", str(args.stub_error_rate), "--rate-limit", str(args.stub_rate_limit),
+                "--seed", str(args.seed),
+            ], dict(os.environ)))
+        _wait_ready(f"{stub_url}/_stats")
+
+        api_url = args.api_url
+        if not api_url:
+            api_url = f"http://127.0.0.1:{args.api_port}"
+            env = dict(os.environ, **client_env(stub_url))
+            env.pop("HTTP_CASSETTE_MODE", None)
+            procs.append(_spawn([
+                "-m", "uvicorn", "src.api.server:app", "--port", str(args.api_port),
+                "--workers", str(args.workers), "--log-level", "warning",
+            ], env))
+        _wait_ready(f"{api_url}/health")
+
+        httpx.post(f"{stub_url}/_stats/reset")
+        latencies, outcomes, elapsed = asyncio.run(_drive(
+            api_url, _parse_mix(args.mix), args.concurrency, args.duration, args.requests, args.timeout, args.seed,
+        ))
+        upstream = httpx.get(f"{stub_url}/_stats").json()
+        _report(latencies, outcomes, elapsed, upstream)
+        if not args.api_url:
+            print("\nInstagram disabled for this run (no stub; ENABLE_INSTAGRAM=false)")
+    finally:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""Microbenchmarks for MeMap+ hot paths.
+
+    python -m benchmarks.run                  # run and print timings
+    python -m benchmarks.run --save           # record benchmarks/baseline.json
+    python -m benchmarks.run --compare        # fail (exit 1) on >20% regressions; first run saves the baseline
+    python -m benchmarks.run -k graph --compare --threshold 0.3
+
+Everything runs offline: raw platform clients are replaced by in-memory fakes
+(below the cache, breaker and hedging layer) and avatar hashing uses generated images. Graph cases clear the layout cache on every
+call. Baselines are per machine and not committed.
+"""
+import argparse
+import inspect
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.models.types import Profile
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PLATFORMS = ("github", "reddit", "instagram", "twitter")
+
+# name -> (setup, number of calls per timing); setup returns the callable to time
+Case = Tuple[Callable[[], Optional[Callable[[], object]]], int]
+CASES: Dict[str, Case] = {}
+
+
+def bench(name: str, number: int = 100):
+    """Register `setup`: it returns the callable to time (or None to skip), or yields it
+    and undoes whatever it changed after the yield."""
+    def register(setup):
+        CASES[name] = (setup, number)
+        return setup
+    return register
+
+
+def _fake_profile(platform: str, username: str) -> Profile:
+    return Profile(
+        platform=platform,
+        username=username,
+        display_name=username.title(),
+        bio=f"{username} builds open source tools in python and rust. Coffee, cats and climbing.",
+        followers=len(username) * 37,
+        profile_url=f"https://example.com/{platform}/{username}",
+        avatar_url=f"https://example.com/{platform}/{username}.png",
+    )
+
+
+def _profiles(n: int, prefix: str = "user") -> Dict[str, Profile]:
+    return {f"{PLATFORMS[i % 4]}{i}": _fake_profile(PLATFORMS[i % 4], f"{prefix}{i}") for i in range(n)}
+
+
+def _png(seed: int) -> bytes:
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (128, 128), (seed * 40 % 255, 90, 160))
+    draw = ImageDraw.Draw(img)
+    draw.ellipse((20 + seed, 20, 100, 100 - seed), fill=(240, 240, 240))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@contextmanager
+def _prepared(setup):
+    if inspect.isgeneratorfunction(setup):
+        with contextmanager(setup)() as fn:
+            yield fn
+    else:
+        yield setup()
+
+
+@contextmanager
+def _bio_tier(tier: str) -> Iterator[None]:
+    """Run with BIO_SIMILARITY_TIER set to `tier`, restoring the configured one after."""
+    from src.similarity import text_similarity
+
+    saved = text_similarity.BIO_SIMILARITY_TIER
+    text_similarity.BIO_SIMILARITY_TIER = tier
+    try:
+        yield
+    finally:
+        text_similarity.BIO_SIMILARITY_TIER = saved
+
+
+# --- similarity ----------------------------------------------------------
+
+@bench("compare_usernames", number=20000)
+def _compare_usernames():
+    from src.similarity.text_similarity import compare_usernames
+    return lambda: compare_usernames("tanmaybodas", "tanmay_bodas_official")
+
+
+@bench("username_features.50x50", number=200)
+def _username_features():
+    from src.similarity.username_features import username_features, username_score
+    a = [f"alice_{i}" for i in range(25)] + [f"tanmay.bodas{i}" for i in range(25)]
+    b = [f"al1ce{i}" for i in range(25)] + [f"realtanmaybodas{i}" for i in range(25)]
+    return lambda: username_score(username_features(a, b))
+
+
+@bench("bio_similarity.fuzzy", number=5000)
+def _bio_fuzzy():
+    from src.similarity import text_similarity
+    a = "Security researcher. Python, Rust and open source. Opinions are my own."
+    b = "Security researcher | python & rust | open-source maintainer. Views my own."
+    with _bio_tier("fuzzy"):
+        yield lambda: text_similarity.bio_similarity(a, b)
+
+
+@bench("bio_similarity.ngram", number=500)
+def _bio_ngram():
+    from src.similarity import text_similarity
+    a = "Security researcher. Python, Rust and open source. Opinions are my own."
+    b = "Security researcher | python & rust | open-source maintainer. Views my own."
+    with _bio_tier("ngram"):
+        yield lambda: text_similarity.bio_similarity(a, b)
+
+
+@bench("bio_similarity.embeddings", number=50)
+def _bio_embeddings():
+    try:
+        import sentence_transformers  # noqa: F401
+    except Exception:
+        yield None
+        return
+    from src.similarity import embeddings, text_similarity
+    a = "Security researcher. Python, Rust and open source. Opinions are my own."
+    b = "Security researcher | python & rust | open-source maintainer. Views my own."
+    with _bio_tier("embeddings"):
+        yield None if embeddings.encode(["warm up"]) is None else lambda: text_similarity.bio_similarity(a, b)
+
+
+@bench("score_comparison.cross_platform", number=2000)
+def _score_comparison():
+    from src.similarity import text_similarity
+    from src.similarity.scoring import score_comparison
+    pa = {p: _fake_profile(p, f"alice_{p}") for p in PLATFORMS}
+    pb = {p: _fake_profile(p, f"al1ce.{p}") for p in PLATFORMS[1:]}
+    with _bio_tier("fuzzy"):
+        yield lambda: score_comparison("alice", "al1ce", pa, pb, with_images=False)
+
+
+def _watchlist(n: int):
+    import random
+    rng = random.Random(11)
+    words = "python rust security cats climbing coffee maintainer gardening music travel photography".split()
+
+    def person(handle: str) -> Dict[str, Profile]:
+        return {p: Profile(platform=p, username=handle, display_name=handle.title(), bio=" ".join(rng.sample(words, 6)))
+                for p in rng.sample(PLATFORMS, rng.randint(1, 4))}
+
+    handles = [f"{rng.choice(['al1ce', 'alice_', 'bob', 'carol', 'dmitri', 'erin'])}{i}" for i in range(n)]
+    return person("alice"), {h: person(h) for h in handles}
+
+
+@bench("scan.cascade.50", number=20)
+def _scan_cascade():
+    from src.similarity import text_similarity
+    from src.similarity.cascade import scan
+    target, candidates = _watchlist(50)
+    with _bio_tier("fuzzy"):
+        yield lambda: scan("alice", target, candidates, with_images=False)
+
+
+@bench("scan.full.50", number=20)
+def _scan_full():
+    from src.similarity import text_similarity
+    from src.similarity.scoring import score_comparison
+    target, candidates = _watchlist(50)
+    with _bio_tier("fuzzy"):
+        yield lambda: [score_comparison("alice", h, target, c, with_images=False) for h, c in candidates.items()]
+
+
+@bench("image_similarity.phash", number=200)
+def _phash():
+    from src.similarity.image_similarity import phash_bytes, hash_similarity
+    a, b = _png(1), _png(3)
+    return lambda: hash_similarity(phash_bytes(a), phash_bytes(b))
+
+
+@bench("dedupe_mentions.300", number=5)
+def _dedupe_mentions():
+    import random
+    from src.similarity.dedup import dedupe_mentions
+    rng = random.Random(7)
+    words = [f"word{i}" for i in range(2000)]
+    mentions = []
+    for i in range(200):
+        snippet = " ".join(rng.choices(words, k=25))
+        mentions.append({"title": f"Result {i}", "snippet": snippet, "link": f"https://example.com/{i}"})
+        if i % 2 == 0:  # syndicated copy with a date prefix
+            mentions.append({"title": f"Result {i}", "snippet": "Mar 3, 2024 ... " + snippet,
+                             "link": f"https://mirror.example.net/{i}"})
+    return lambda: dedupe_mentions(mentions)
+
+
+# --- candidate generation ------------------------------------------------
+
+@bench("handle_candidates_from_name", number=5000)
+def _candidates():
+    from src.data.candidates import handle_candidates
+    return lambda: handle_candidates("Shah Rukh Khan", max_candidates=50)
+
+
+# --- graph building ------------------------------------------------------
+
+def _cold_layout(fn: Callable[[], object]) -> Callable[[], object]:
+    """Time `fn` with an empty layout cache, so every call pays for the layout it needs."""
+    from src.graph import layout
+
+    def call():
+        layout._layout_cache.clear()
+        return fn()
+    return call
+
+
+def _register_graph_benches():
+    for n in (10, 100, 1000):
+        number = max(1, 200 // n)
+
+        @bench(f"build_footprint_html.{n}", number=number)
+        def _footprint(n=n):
+            from src.graph.graph_builder import build_footprint_html
+            profiles = _profiles(n)
+            return _cold_layout(lambda: build_footprint_html("octocat", profiles))
+
+        @bench(f"build_comparison_html.{n}", number=number)
+        def _comparison(n=n):
+            from src.graph.graph_builder import build_comparison_html
+            pa, pb = _profiles(n // 2, "alice"), _profiles(n // 2, "alice_")
+            scores = {k: 0.75 for k in pa if k in pb}
+            return _cold_layout(lambda: build_comparison_html("alice", "alice_", pa, pb, scores))
+
+
+_register_graph_benches()
+
+
+# --- API handlers ----------------------------------------------------------
+
+@contextmanager
+def _fake_clients() -> Iterator[object]:
+    """The API app with each platform's raw client swapped for an in-memory fake (every
+    other handle exists). The fakes sit below platform_fetcher, so lookups still pass
+    through the profile cache, negative index, circuit breaker and hedging."""
+    import src.api.server as server
+    from src.data.fetching import platform_fetcher
+
+    def fake(platform):
+        def fetch(username: str) -> Optional[Profile]:
+            return _fake_profile(platform, username) if len(username) % 2 == 0 else None
+        return fetch
+
+    saved = {p: getattr(server, f"fetch_{p}_user") for p in PLATFORMS}
+    for p in PLATFORMS:
+        setattr(server, f"fetch_{p}_user", platform_fetcher(p)(fake(p)))
+    try:
+        yield server.app
+    finally:
+        for p, fetch in saved.items():
+            setattr(server, f"fetch_{p}_user", fetch)
+
+
+@bench("api.footprint.username", number=200)
+def _api_footprint():
+    from fastapi.testclient import TestClient
+    with _fake_clients() as app:
+        client = TestClient(app)
+        yield lambda: client.get("/footprint", params={"username": "octocat"})
+
+
+@bench("api.footprint.full_name", number=100)
+def _api_footprint_name():
+    from fastapi.testclient import TestClient
+    with _fake_clients() as app:
+        client = TestClient(app)
+        yield lambda: client.get("/footprint", params={"full_name": "Shah Rukh Khan", "limit": 25})
+
+
+@bench("api.compare", number=200)
+def _api_compare():
+    from fastapi.testclient import TestClient
+    with _fake_clients() as app:
+        client = TestClient(app)
+        yield lambda: client.get("/compare", params={"user_a": "octocat", "user_b": "0ctocat"})
+
+
+# --- runner --------------------------------------------------------------
+
+def run(selected: List[str], repeat: int) -> Dict[str, float]:
+    """Best-of-`repeat` seconds per call for each case."""
+    results: Dict[str, float] = {}
+    for name in selected:
+        setup, number = CASES[name]
+        with _prepared(setup) as fn:
+            if fn is None:
+                print(f"{name:<34} skipped (optional dependency unavailable)")
+                continue
+            fn()  # warm caches and lazy imports outside the timed region
+            per_call = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+        results[name] = per_call
+        print(f"{name:<34} {per_call * 1e6:12.1f} us/call")
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    regressions = []
+    for name, t in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        ratio = t / base
+        flag = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:<34} {ratio:6.2f}x baseline {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="MeMap+ microbenchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown ratio (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    selected = [n for n in CASES if args.pattern in n]
+    results = run(selected, args.repeat)
+
+    if args.compare and not os.path.exists(args.baseline):
+        # First run on this machine: nothing to compare against, so this run becomes the baseline
+        print(f"no baseline at {args.baseline}; saving this run as the baseline")
+        args.save, args.compare = True, False
+    if args.save:
+        payload = {"python": sys.version.split()[0], "machine": platform.machine(), "results": results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.baseline}")
+    if args.compare:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,33 @@
-from typing import Dict, List, Optional
-from fastapi import FastAPI, HTTPException, Query
+import itertools
+import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 from src.models.types import Profile
 from src.data.github_client import fetch_github_user
 from src.data.reddit_client import fetch_reddit_user
 from src.data.instagram_client import fetch_instagram_user
 from src.data.twitter_client import fetch_twitter_user
-from src.similarity.text_similarity import compare_usernames, bio_similarity
+from src.similarity.text_similarity import warm_up
+from src.similarity.scoring import score_comparison
+from src.similarity.cascade import CASCADE_THRESHOLD, scan as cascade_scan
+from src.data.crawler import crawl_identity
+from src.data.candidates import handle_candidates, is_valid_handle, iter_handle_candidates
+from src.graph.layout import compute_layout
+from src.graph.export import to_columnar, iter_graphml, iter_csv_edges
+from src.utils import metrics, profiling
+from src.utils.breaker import OPEN, breaker
+from src.utils.hedge import FETCH_DEADLINE_S, Deadline, gather
 
 
 class Node(BaseModel):
@@ -15,6 +35,9 @@ class Node(BaseModel):
     label: str
     group: Optional[str] = None
     meta: Optional[Dict] = None
+    # Precomputed position for large graphs; clients should disable physics when set
+    x: Optional[float] = None
+    y: Optional[float] = None
 
 
 class Edge(BaseModel):
@@ -27,63 +50,182 @@ class Edge(BaseModel):
 class GraphResponse(BaseModel):
     nodes: List[Node]
     edges: List[Edge]
+    # Platforms with no answer (deadline hit or circuit breaker open); the graph may be missing them
+    incomplete: List[str] = []
+    # Circuit breaker state per platform: closed, open or half_open
+    breakers: Dict[str, str] = {}
+
+
+class ProfileOut(BaseModel):
+    platform: str
+    username: str
+    display_name: Optional[str] = None
+    bio: Optional[str] = None
+    followers: Optional[int] = None
+    location: Optional[str] = None
+    profile_url: Optional[str] = None
+    avatar_url: Optional[str] = None
+    extra: Optional[Dict[str, Any]] = None
+
+
+class CrossMatchOut(BaseModel):
+    a: str
+    b: str
+    username_a: str
+    username_b: str
+    score: float
+    evidence: Dict[str, float]
+
+
+class Scores(BaseModel):
+    platform_scores: Dict[str, float]
+    overall_bio: float
+    overall_username: float
+    mutual_presence: float
+    image_similarity: Optional[float] = None
+    impersonation_likelihood: float
+    cross_matches: List[CrossMatchOut] = []
+
+
+class CompareResponse(GraphResponse):
+    # Everything the UI needs in one round trip: graph, both users' profiles and the scores
+    profiles_a: Dict[str, ProfileOut]
+    profiles_b: Dict[str, ProfileOut]
+    scores: Scores
+
+
+class ScanResult(BaseModel):
+    username: str
+    above: bool
+    likelihood: float
+    lower: float
+    upper: float
+    # Last scoring stage that ran: username, bio or image
+    stage: str
+
+
+class ScanResponse(BaseModel):
+    user: str
+    threshold: float
+    results: List[ScanResult]
+    incomplete: List[str] = []
+    breakers: Dict[str, str] = {}
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-rendered JSON for routes that return plain dicts (e.g. columnar exports).
+
+    Routes with a response_model don't need it: FastAPI serializes those straight
+    to bytes with pydantic-core, which beats jsonable_encoder + orjson by an order
+    of magnitude on large graphs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+ENABLE_IMAGE_SIMILARITY = os.getenv("ENABLE_IMAGE_SIMILARITY", "true").lower() == "true"
+# Ranked name variants probed per /footprint?full_name= request
+MAX_NAME_CANDIDATES = int(os.getenv("MAX_NAME_CANDIDATES", "50"))
+# Candidates looked up concurrently per round; results are still taken in rank order
+NAME_PROBE_BATCH = int(os.getenv("NAME_PROBE_BATCH", "4"))
+MAX_SCAN_CANDIDATES = int(os.getenv("MAX_SCAN_CANDIDATES", "50"))
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the embedding model in the background so the first /compare doesn't pay for it
+    warm_up(background=True)
+    yield
+    from src.similarity import embeddings
+    embeddings.shutdown()
+
+
+app = FastAPI(title="MeMap+ API", version="1.0.0", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_BYTES)
+
+
+if profiling.ADMIN_TOKEN:
+    # Only registered when PROFILE_ADMIN_TOKEN is set, so normal deployments pay nothing
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        mode = profiling.requested_mode(request.headers, request.query_params)
+        if mode is None:
+            return await call_next(request)
+        run = profiling.start(mode)
+        response = await call_next(request)
+        if run.id:
+            response.headers["X-Profile-Id"] = run.id
+            response.headers["X-Profile-Mode"] = run.mode
+            response.headers["X-Profile-Wall-Ms"] = f"{run.wall_ms:.1f}"
+            response.headers["X-Profile-Peak-KB"] = f"{run.peak_kb:.1f}"
+        return response
+
+    @app.get("/debug/profiles/{profile_id}", include_in_schema=False)
+    def get_profile(profile_id: str, request: Request):
+        if not profiling.is_admin(request.headers):
+            raise HTTPException(status_code=403, detail="admin token required")
+        path = profiling.profile_path(profile_id)
+        if path is None:
+            raise HTTPException(status_code=404, detail="profile not found")
+        return FileResponse(path, filename=path.rsplit("/", 1)[-1])
+
+
+def _layout_graph(nodes: List[Node], edges: List[Edge]) -> GraphResponse:
+    positions = compute_layout((n.id for n in nodes), ((e.source, e.target) for e in edges))
+    for n in nodes:
+        if n.id in positions:
+            n.x, n.y = positions[n.id]
+    return GraphResponse(nodes=nodes, edges=edges)
+
+
+PLATFORMS = ("github", "reddit", "instagram", "twitter")
+
+
+def _fetchers() -> Dict[str, Any]:
+    # Resolved per call so the module-level fetch_* names stay patchable
+    return {
+        "github": fetch_github_user,
+        "reddit": fetch_reddit_user,
+        "instagram": fetch_instagram_user,
+        "twitter": fetch_twitter_user,
+    }
 
 
-app = FastAPI(title="MeMap+ API", version="1.0.0")
+@metrics.timed("collect_profiles")
+def gather_profiles(
+    usernames: Sequence[str], deadline: Deadline, platforms: Sequence[str] = PLATFORMS
+) -> Tuple[List[Dict[str, Profile]], List[str]]:
+    """Look up every username on every platform concurrently, stopping at `deadline`.
+
+    Returns one platform->Profile dict per username plus the platforms that were
+    still outstanding when the deadline hit or whose breaker is open.
+    """
+    fetchers = _fetchers()
+    slots = [(i, p) for i in range(len(usernames)) for p in platforms]
+    results, incomplete = gather([(p, fetchers[p], (usernames[i],)) for i, p in slots], deadline)
+    out: List[Dict[str, Profile]] = [{} for _ in usernames]
+    for (i, platform), prof in zip(slots, results):
+        if prof:
+            out[i][platform] = prof
+    skipped = [p for p in platforms if breaker(p).current_state() == OPEN]
+    return out, sorted(set(incomplete).union(skipped))
+
+
+def breaker_states() -> Dict[str, str]:
+    return {p: breaker(p).current_state() for p in PLATFORMS}
 
 
 def collect_profiles(username: str) -> Dict[str, Profile]:
-    profiles: Dict[str, Profile] = {}
-    gh = fetch_github_user(username)
-    if gh:
-        profiles["github"] = gh
-    rd = fetch_reddit_user(username)
-    if rd:
-        profiles["reddit"] = rd
-    ig = fetch_instagram_user(username)
-    if ig:
-        profiles["instagram"] = ig
-    tw = fetch_twitter_user(username)
-    if tw:
-        profiles["twitter"] = tw
-    return profiles
-
-
-def _handle_candidates_from_name(full_name: str, max_candidates: int = 30) -> List[str]:
-    name = full_name.strip()
-    if not name:
-        return []
-    parts = [p for p in name.lower().replace("\t", " ").split(" ") if p]
-    joined = "".join(parts)
-    dashed = "-".join(parts)
-    dotted = ".".join(parts)
-    underscored = "_".join(parts)
-    initials = "".join(p[0] for p in parts)
-    variants = [
-        joined,
-        dashed,
-        dotted,
-        underscored,
-        joined + "official",
-        joined + "_official",
-        joined + "1",
-        initials + parts[-1] if parts else joined,
-        parts[-1] + initials if parts else joined,
-    ]
-    # Deduplicate and cap
-    seen = set()
-    out: List[str] = []
-    for v in variants:
-        v = v.replace("..", ".").replace("__", "_").strip("._")
-        if v and v not in seen:
-            seen.add(v)
-            out.append(v)
-        if len(out) >= max_candidates:
-            break
-    return out
+    return gather_profiles([username], Deadline(FETCH_DEADLINE_S))[0][0]
+
 
 def guess_username_from_name(full_name: str) -> Optional[str]:
-    for cand in _handle_candidates_from_name(full_name, max_candidates=10):
+    for cand in handle_candidates(full_name, max_candidates=10, platform="github"):
         gh = fetch_github_user(cand)
         if gh:
             return cand
@@ -92,15 +234,23 @@ def guess_username_from_name(full_name: str) -> Optional[str]:
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "breakers": {p: breaker(p).snapshot() for p in PLATFORMS}}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/footprint", response_model=GraphResponse)
+@profiling.profiled
 def footprint(
     username: Optional[str] = Query(None, min_length=1),
     full_name: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=25),
     per_platform: int = Query(5, ge=1, le=10),
+    depth: int = Query(0, ge=0, le=3),
+    max_requests: int = Query(20, ge=1, le=100),
 ):
     nodes: List[Node] = []
     edges: List[Edge] = []
@@ -110,10 +260,14 @@ def footprint(
 
     profiles_map: Dict[str, Profile] = {}
 
-    def add_profile(p: Profile):
+    node_ids = {nodes[0].id}
+
+    def add_profile(p: Profile, link_to_center: bool = True) -> bool:
+        """Add p's node (and its edge to the center); False if it was already in the graph."""
         pid = f"{p.platform}:{p.username}"
-        if pid in {n.id for n in nodes}:
-            return
+        if pid in node_ids:
+            return False
+        node_ids.add(pid)
         nodes.append(
             Node(
                 id=pid,
@@ -128,23 +282,46 @@ def footprint(
                 },
             )
         )
-        edges.append(Edge(source=f"user:{center_label}", target=pid))
+        if link_to_center:
+            edges.append(Edge(source=f"user:{center_label}", target=pid))
+        return True
 
+    deadline = Deadline(FETCH_DEADLINE_S)
+    incomplete: set = set()
     if username:
-        profiles_map = collect_profiles(username.strip())
+        [profiles_map], missed = gather_profiles([username.strip()], deadline)
+        incomplete.update(missed)
         for p in profiles_map.values():
             add_profile(p)
+        if depth:
+            # Follow bio/blog links outward to other platforms, one hop per level
+            crawl = crawl_identity(profiles_map.values(), max_depth=depth, max_requests=max_requests,
+                                   fetchers=_fetchers(), deadline=deadline)
+            incomplete.update(crawl.incomplete)
+            for p in crawl.profiles.values():
+                add_profile(p, link_to_center=False)
+            edges.extend(Edge(source=src, target=dst, label=evidence) for src, dst, evidence in crawl.edges)
     elif full_name:
-        # Expand candidates and gather across platforms until limit is reached
-        for cand in _handle_candidates_from_name(full_name, max_candidates=50):
-            if len([n for n in nodes if n.group and n.group != "user"]) >= limit:
+        # Walk ranked candidates lazily, a few at a time, and stop as soon as the limit is reached
+        found = 0
+        ranked = itertools.islice(iter_handle_candidates(full_name), MAX_NAME_CANDIDATES)
+        while found < limit:
+            batch = list(itertools.islice(ranked, NAME_PROBE_BATCH))
+            if not batch:
                 break
-            for fetcher in (fetch_instagram_user, fetch_twitter_user, fetch_github_user, fetch_reddit_user):
-                p = fetcher(cand)
-                if p:
-                    add_profile(p)
-                    if len([n for n in nodes if n.group and n.group != "user"]) >= limit:
-                        break
+            # Skip lookups for handles the platform can't have
+            slots = [(cand, p) for cand in batch for p in PLATFORMS if is_valid_handle(cand, p)]
+            if deadline.expired:
+                incomplete.update(p for _, p in slots)
+                break
+            fetchers = _fetchers()
+            results, missed = gather([(p, fetchers[p], (cand,)) for cand, p in slots], deadline)
+            incomplete.update(missed)
+            incomplete.update(p for _, p in slots if breaker(p).current_state() == OPEN)
+            for prof in results:
+                # Candidates that resolve to an account already shown (e.g. case variants) don't count
+                if prof and found < limit and add_profile(prof):
+                    found += 1
     else:
         raise HTTPException(status_code=400, detail="username or full_name is required")
 
@@ -164,18 +341,22 @@ def footprint(
             platform_counts[n.group] = c + 1
     filtered_edges = [e for e in edges if e.source in keep_ids and e.target in keep_ids]
 
-    return GraphResponse(nodes=filtered_nodes, edges=filtered_edges)
+    graph = _layout_graph(filtered_nodes, filtered_edges)
+    graph.incomplete = sorted(incomplete)
+    graph.breakers = breaker_states()
+    return graph
 
 
-@app.get("/compare", response_model=GraphResponse)
+@app.get("/compare", response_model=CompareResponse)
+@profiling.profiled
 def compare(user_a: str = Query(..., min_length=1), user_b: str = Query(..., min_length=1)):
     ua = user_a.strip()
     ub = user_b.strip()
     if not ua or not ub:
         raise HTTPException(status_code=400, detail="user_a and user_b are required")
 
-    profiles_a = collect_profiles(ua)
-    profiles_b = collect_profiles(ub)
+    (profiles_a, profiles_b), incomplete = gather_profiles([ua, ub], Deadline(FETCH_DEADLINE_S))
+    scores = score_comparison(ua, ub, profiles_a, profiles_b, with_images=ENABLE_IMAGE_SIMILARITY)
 
     nodes: List[Node] = [
         Node(id="user:A", label=ua, group="user"),
@@ -213,9 +394,7 @@ def compare(user_a: str = Query(..., min_length=1), user_b: str = Query(..., min
 
         # similarity edge if both exist
         if pa and pb:
-            u_sim = compare_usernames(pa.username, pb.username)
-            b_sim = bio_similarity(pa.bio, pb.bio)
-            score = 0.5 * u_sim + 0.5 * b_sim
+            score = scores.platform_scores[platform]
             edges.append(
                 Edge(
                     source=f"A:{platform}",
@@ -225,6 +404,95 @@ def compare(user_a: str = Query(..., min_length=1), user_b: str = Query(..., min
                 )
             )
 
-    return GraphResponse(nodes=nodes, edges=edges)
+    graph = _layout_graph(nodes, edges)
+    return CompareResponse(
+        nodes=graph.nodes,
+        edges=graph.edges,
+        profiles_a={k: ProfileOut(**asdict(p)) for k, p in profiles_a.items()},
+        profiles_b={k: ProfileOut(**asdict(p)) for k, p in profiles_b.items()},
+        scores=Scores(**asdict(scores)),
+        incomplete=incomplete,
+        breakers=breaker_states(),
+    )
+
+
+@app.get("/scan", response_model=ScanResponse)
+@profiling.profiled
+def scan(
+    user: str = Query(..., min_length=1),
+    candidates: str = Query(..., min_length=1, description="comma-separated handles"),
+    threshold: float = Query(CASCADE_THRESHOLD, ge=0.0, le=1.0),
+):
+    """Screen many handles against one identity; expensive signals only run for borderline pairs."""
+    u = user.strip()
+    names = list(dict.fromkeys(c.strip() for c in candidates.split(",") if c.strip() and c.strip() != u))
+    if not u or not names:
+        raise HTTPException(status_code=400, detail="user and at least one candidate are required")
+    if len(names) > MAX_SCAN_CANDIDATES:
+        raise HTTPException(status_code=400, detail=f"at most {MAX_SCAN_CANDIDATES} candidates per scan")
+    invalid = [h for h in [u] + names if not is_valid_handle(h)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"not a valid handle on any platform: {', '.join(invalid[:10])}")
+
+    found, incomplete = gather_profiles([u] + names, Deadline(FETCH_DEADLINE_S))
+    results = cascade_scan(u, found[0], dict(zip(names, found[1:])), threshold, with_images=ENABLE_IMAGE_SIMILARITY)
+    return ScanResponse(
+        user=u,
+        threshold=threshold,
+        results=[
+            ScanResult(username=name, above=r.above, likelihood=r.scores.impersonation_likelihood,
+                       lower=r.lower, upper=r.upper, stage=r.stage)
+            for name, r in results
+        ],
+        incomplete=incomplete,
+        breakers=breaker_states(),
+    )
+
+
+ExportFormat = Literal["columnar", "graphml", "csv"]
+
+
+def _export(graph: GraphResponse, fmt: ExportFormat, include_meta: bool, name: str):
+    if fmt == "graphml":
+        return StreamingResponse(
+            iter_graphml(graph.nodes, graph.edges),
+            media_type="application/graphml+xml",
+            headers={"Content-Disposition": f'attachment; filename="{name}.graphml"'},
+        )
+    if fmt == "csv":
+        return StreamingResponse(
+            iter_csv_edges(graph.edges),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{name}_edges.csv"'},
+        )
+    return FastJSONResponse(to_columnar(graph.nodes, graph.edges, include_meta=include_meta))
 
 
+@app.get("/export/footprint", response_class=FastJSONResponse)
+@profiling.profiled
+def export_footprint(
+    username: Optional[str] = Query(None, min_length=1),
+    full_name: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=25),
+    per_platform: int = Query(5, ge=1, le=10),
+    depth: int = Query(0, ge=0, le=3),
+    max_requests: int = Query(20, ge=1, le=100),
+    format: ExportFormat = Query("columnar"),
+    include_meta: bool = Query(False),
+):
+    graph = footprint(
+        username=username, full_name=full_name, limit=limit, per_platform=per_platform, depth=depth, max_requests=max_requests
+    )
+    return _export(graph, format, include_meta, "footprint")
+
+
+@app.get("/export/compare", response_class=FastJSONResponse)
+@profiling.profiled
+def export_compare(
+    user_a: str = Query(..., min_length=1),
+    user_b: str = Query(..., min_length=1),
+    format: ExportFormat = Query("columnar"),
+    include_meta: bool = Query(False),
+):
+    graph = compare(user_a=user_a, user_b=user_b)
+    return _export(graph, format, include_meta, "compare")
@@ -0,0 +1,135 @@
+import heapq
+import itertools
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Per-platform handle rules: (min length, max length, full-match pattern)
+PLATFORM_RULES: Dict[str, Tuple[int, int, "re.Pattern[str]"]] = {
+    # letters, digits, single inner hyphens
+    "github": (1, 39, re.compile(r"[a-z0-9](?:[a-z0-9]|-(?=[a-z0-9]))*")),
+    "twitter": (1, 15, re.compile(r"[a-z0-9_]+")),
+    # letters, digits, underscores, dots (not leading/trailing/consecutive)
+    "instagram": (1, 30, re.compile(r"[a-z0-9_](?:[a-z0-9_]|\.(?=[a-z0-9_]))*")),
+    "reddit": (3, 20, re.compile(r"[a-z0-9_-]+")),
+}
+# Nothing longer than this is valid anywhere, so longer variants are never built
+_MAX_LEN = max(r[1] for r in PLATFORM_RULES.values())
+
+_SEPARATORS = (("", 0.0), ("_", 1.0), (".", 1.5), ("-", 2.0))
+_PREFIXES = (("real", 2.5), ("the", 3.0), ("its", 3.5), ("iam", 3.5), ("real_", 3.0), ("the_", 3.5), ("official", 4.5))
+_SUFFIXES = (("official", 2.0), ("_official", 2.5), ("_", 3.0), ("real", 4.0), ("_real", 4.0), ("hq", 4.5), ("x", 5.0), ("_x", 5.0))
+_LEET = {"a": "4", "e": "3", "i": "1", "l": "1", "o": "0", "s": "5", "t": "7"}
+
+Ranked = Tuple[float, str]
+
+
+def is_valid_handle(handle: str, platform: Optional[str] = None) -> bool:
+    """Whether `handle` could exist on `platform` (or on any supported platform when None)."""
+    rules = [PLATFORM_RULES[platform]] if platform else PLATFORM_RULES.values()
+    return any(lo <= len(handle) <= hi and pattern.fullmatch(handle) for lo, hi, pattern in rules)
+
+
+def _name_parts(full_name: str) -> List[str]:
+    ascii_name = unicodedata.normalize("NFKD", full_name).encode("ascii", "ignore").decode("ascii")
+    return re.findall(r"[a-z0-9]+", ascii_name.lower())
+
+
+def _bases(parts: List[str]) -> List[Ranked]:
+    """Core handles built from the name itself, cheapest (most likely) first."""
+    first, last = parts[0], parts[-1]
+    initials = "".join(p[0] for p in parts)
+    out: List[Ranked] = []
+    for sep, cost in _SEPARATORS:
+        out.append((cost, sep.join(parts)))
+    if len(parts) > 1:
+        out += [
+            (2.5, first[0] + last),
+            (3.0, initials + last if len(parts) > 2 else first + last[0]),
+            (3.5, last + initials),
+            (3.5, last + first),
+            (4.0, first + "_" + last[0]),
+            (4.5, first),
+            (5.0, initials),
+        ]
+    return sorted(out)
+
+
+def _affixed(bases: List[Ranked]) -> Iterator[Ranked]:
+    combos: List[Ranked] = []
+    for c, h in bases:
+        # Separated bases take affixes with their own separator ("shah_rukh_khan_official")
+        sep = next((s for s in "_.-" if s in h), None)
+        for a, ac in _SUFFIXES:
+            word = a.strip("_")
+            combos.append((c + ac, h + (sep + word if sep else a)))
+        for a, ac in _PREFIXES:
+            word = a.strip("_")
+            combos.append((c + ac, (word + sep if sep else a) + h))
+    return iter(sorted(combos))
+
+
+def _numbered(cost: float, handle: str) -> Iterator[Ranked]:
+    # Single digits, then two-digit numbers and birth years, then everything up to 999
+    for n in range(1, 10):
+        yield cost + 3.0 + 0.05 * n, f"{handle}{n}"
+    years = [(cost + 4.0 + 0.02 * abs(1995 - y), f"{handle}{y}") for y in range(1960, 2011)]
+    short = [(cost + 4.0 + 0.02 * abs(95 - (y % 100)) + 0.3, f"{handle}{y % 100:02d}") for y in range(1960, 2011)]
+    tens = [(cost + 5.0 + 0.01 * n, f"{handle}{n}") for n in range(10, 100)]
+    yield from sorted(years + short + tens)
+    for n in range(100, 1000):
+        yield cost + 7.0 + 0.001 * n, f"{handle}{n}"
+
+
+def _leet(cost: float, handle: str, max_subs: int = 3) -> Iterator[Ranked]:
+    positions = [i for i, ch in enumerate(handle) if ch in _LEET]
+    for k in range(1, min(max_subs, len(positions)) + 1):
+        for combo in itertools.combinations(positions, k):
+            chars = list(handle)
+            for i in combo:
+                chars[i] = _LEET[chars[i]]
+            yield cost + 5.0 + 1.5 * (k - 1), "".join(chars)
+
+
+def _typos(cost: float, handle: str) -> Iterator[Ranked]:
+    # Doubled letters, then inserted separators, then dropped letters
+    for i in range(len(handle)):
+        if handle[i].isalpha():
+            yield cost + 6.0, handle[:i + 1] + handle[i] + handle[i + 1:]
+    for sep, sc in (("_", 6.5), (".", 7.0)):
+        for i in range(1, len(handle)):
+            if handle[i - 1].isalnum() and handle[i].isalnum():
+                yield cost + sc, handle[:i] + sep + handle[i:]
+    for i in range(len(handle)):
+        yield cost + 7.5, handle[:i] + handle[i + 1:]
+
+
+def iter_handle_candidates(full_name: str, platform: Optional[str] = None) -> Iterator[str]:
+    """Lazily yield plausible handles for a person's name, most likely first.
+
+    Variant families (separators, initials, affixes, numbers, leet spellings, typos)
+    are each generated in cost order and merged with heapq.merge, so callers can
+    stop after the first few candidates without the rest ever being built.
+    Candidates invalid for `platform` (or for every platform) are skipped.
+    """
+    parts = _name_parts(full_name)
+    if not parts:
+        return
+    bases = _bases(parts)
+    top = [b for b in bases if b[0] <= 2.5]
+    families: List[Iterable[Ranked]] = [iter(bases), _affixed(bases)]
+    families += [_numbered(c, h) for c, h in top]
+    families += [_leet(c, h) for c, h in top]
+    families += [_typos(c, h) for c, h in top[:2]]
+
+    seen = set()
+    for _, handle in heapq.merge(*families):
+        if handle in seen or len(handle) > _MAX_LEN:
+            continue
+        seen.add(handle)
+        if is_valid_handle(handle, platform):
+            yield handle
+
+
+def handle_candidates(full_name: str, max_candidates: int = 30, platform: Optional[str] = None) -> List[str]:
+    return list(itertools.islice(iter_handle_candidates(full_name, platform), max_candidates))
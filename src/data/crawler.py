@@ -0,0 +1,154 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.models.types import Profile
+from src.data.github_client import fetch_github_user
+from src.data.reddit_client import fetch_reddit_user
+from src.data.instagram_client import fetch_instagram_user
+from src.data.twitter_client import fetch_twitter_user
+from src.utils.hedge import FETCH_DEADLINE_S, Deadline, gather
+
+Fetcher = Callable[[str], Optional[Profile]]
+# (platform, username, evidence) discovered on a profile
+Link = Tuple[str, str, str]
+
+DEFAULT_FETCHERS: Dict[str, Fetcher] = {
+    "github": fetch_github_user,
+    "reddit": fetch_reddit_user,
+    "instagram": fetch_instagram_user,
+    "twitter": fetch_twitter_user,
+}
+
+_URL_PATTERNS = [
+    ("github", re.compile(r"(?:https?://)?(?:www\.)?github\.com/([A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))(?![A-Za-z0-9-])", re.I)),
+    ("twitter", re.compile(r"(?:https?://)?(?:www\.|mobile\.)?(?:twitter|x)\.com/([A-Za-z0-9_]{1,15})(?![A-Za-z0-9_])", re.I)),
+    ("instagram", re.compile(r"(?:https?://)?(?:www\.)?instagram\.com/([A-Za-z0-9._]{1,30})", re.I)),
+    ("reddit", re.compile(r"(?:(?:https?://)?(?:www\.|old\.)?reddit\.com/u(?:ser)?/|(?<![\w/.])/?u/)([A-Za-z0-9_-]{3,20})", re.I)),
+]
+
+# First path segments that are site pages rather than accounts
+_RESERVED = {
+    "github": {"about", "user", "orgs", "settings", "sponsors", "topics", "features", "marketplace", "explore", "login"},
+    "twitter": {"home", "i", "intent", "share", "search", "hashtag", "login", "explore"},
+    "instagram": {"p", "reel", "reels", "explore", "stories", "accounts", "tv"},
+    "reddit": set(),
+}
+
+
+def _node_id(platform: str, username: str) -> str:
+    return f"{platform}:{username}"
+
+
+def extract_links(profile: Profile) -> List[Link]:
+    """Other-platform handles referenced by a profile (bio URLs, GitHub blog/twitter fields)."""
+    found: List[Link] = []
+    extra = profile.extra or {}
+    tw = extra.get("twitter_username")
+    if tw:
+        found.append(("twitter", tw, "twitter_username"))
+    texts = [("bio", profile.bio), ("blog", extra.get("blog"))]
+    for evidence, text in texts:
+        if not text:
+            continue
+        for platform, pattern in _URL_PATTERNS:
+            for m in pattern.finditer(text):
+                handle = m.group(1).rstrip(".")
+                if handle and handle.lower() not in _RESERVED[platform]:
+                    found.append((platform, handle, evidence))
+
+    seen: Set[Tuple[str, str]] = set()
+    out: List[Link] = []
+    for platform, handle, evidence in found:
+        key = (platform, handle.lower())
+        if key in seen or key == (profile.platform, profile.username.lower()):
+            continue
+        seen.add(key)
+        out.append((platform, handle, evidence))
+    return out
+
+
+@dataclass
+class CrawlResult:
+    # Newly discovered profiles keyed by node id ("platform:username")
+    profiles: Dict[str, Profile] = field(default_factory=dict)
+    # (source node id, target node id, evidence)
+    edges: List[Tuple[str, str, str]] = field(default_factory=list)
+    requests: int = 0
+    # True when the depth, request budget or deadline cut the crawl short
+    truncated: bool = False
+    # Platforms with lookups still outstanding (or never started) when the deadline hit
+    incomplete: Set[str] = field(default_factory=set)
+
+
+def crawl_identity(
+    seeds: Iterable[Profile],
+    max_depth: int = 2,
+    max_requests: int = 20,
+    fetchers: Optional[Dict[str, Fetcher]] = None,
+    deadline: Optional[Deadline] = None,
+) -> CrawlResult:
+    """Bounded BFS from seed profiles along cross-platform links.
+
+    Each level is fetched concurrently on the shared lookup pool; (platform, username)
+    pairs are fetched at most once and links to already-known accounts become edges
+    without a fetch. Nothing new is started once `deadline` has passed.
+    """
+    fetchers = fetchers or DEFAULT_FETCHERS
+    deadline = deadline or Deadline(FETCH_DEADLINE_S)
+    result = CrawlResult()
+    # (platform, lower(username)) -> node id, or None when the fetch found nothing
+    known: Dict[Tuple[str, str], Optional[str]] = {}
+
+    frontier: List[Tuple[str, str, str, str]] = []  # (parent id, platform, username, evidence)
+    for p in seeds:
+        pid = _node_id(p.platform, p.username)
+        known[(p.platform, p.username.lower())] = pid
+        frontier.extend((pid, plat, handle, ev) for plat, handle, ev in extract_links(p))
+
+    def link_known(entries: List[Tuple[str, str, str, str]]) -> None:
+        for parent, platform, handle, evidence in entries:
+            target = known.get((platform, handle.lower()))
+            if target and target != parent:
+                result.edges.append((parent, target, evidence))
+
+    for _ in range(max_depth):
+        to_fetch: Dict[Tuple[str, str], str] = {}
+        for _parent, platform, handle, _evidence in frontier:
+            key = (platform, handle.lower())
+            if platform not in fetchers or key in known or key in to_fetch:
+                continue
+            if result.requests + len(to_fetch) >= max_requests:
+                result.truncated = True
+                continue
+            to_fetch[key] = handle
+        if to_fetch and deadline.expired:
+            result.truncated = True
+            result.incomplete.update(platform for platform, _ in to_fetch)
+            break
+
+        keys = list(to_fetch)
+        profiles, missed = gather([(key[0], fetchers[key[0]], (to_fetch[key],)) for key in keys], deadline)
+        result.requests += len(keys)
+        result.incomplete.update(missed)
+        next_frontier: List[Tuple[str, str, str, str]] = []
+        for key, prof in zip(keys, profiles):
+            if prof is None:
+                if key[0] not in missed:
+                    known[key] = None
+                continue
+            nid = _node_id(prof.platform, prof.username)
+            known[key] = nid
+            result.profiles[nid] = prof
+            next_frontier.extend((nid, plat, handle, ev) for plat, handle, ev in extract_links(prof))
+
+        link_known(frontier)
+        frontier = next_frontier
+        if not frontier:
+            break
+
+    # Links found at the depth limit: connect known accounts, flag the rest as unexplored
+    link_known(frontier)
+    if any(p in fetchers and (p, h.lower()) not in known for _, p, h, _ in frontier):
+        result.truncated = True
+    return result
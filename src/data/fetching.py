@@ -0,0 +1,80 @@
+import os
+from functools import wraps
+from typing import Callable, Optional
+
+from src.models.types import Profile
+from src.utils import hedge, http, metrics
+from src.utils.bloom import negative_index
+from src.utils.breaker import breaker
+from src.utils.cache import get_cache
+
+FETCH_RESULTS = metrics.counter(
+    "memap_fetch_results_total",
+    "Platform lookups by outcome (found/cached/absent/absent_cached/error/unconfigured/short_circuited)",
+    ("platform", "outcome"),
+)
+
+# Found profiles are reused for this long (seconds); 0 disables the cache
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL") or "900")
+_profile_cache = get_cache("profiles", maxsize=int(os.getenv("PROFILE_CACHE_SIZE") or "4096"), ttl=PROFILE_CACHE_TTL)
+
+
+class NotConfigured(Exception):
+    """The platform can't be queried here (missing credentials or optional dependency)."""
+
+
+def platform_fetcher(platform: str) -> Callable[[Callable[[str], Optional[Profile]]], Callable[[str], Optional[Profile]]]:
+    """Wrap a raw client lookup into the public `fetch_<platform>_user` contract.
+
+    The wrapped function returns a Profile when the account exists, None when the
+    platform confirmed it does not, and raises on any other failure. Callers of the
+    wrapper always get Profile-or-None; failures are counted instead of raised.
+    Found profiles are cached (across worker processes with a shared backend) and
+    confirmed-absent handles go into the platform's negative index; neither is
+    looked up again until it ages out. Repeated failures trip the platform's
+    circuit breaker, which returns None straight away until its cool-down ends.
+    Hedging (HEDGE_PLATFORMS) duplicates only `func`, so each lookup is admitted by
+    the breaker once and reports exactly one outcome to it.
+    """
+    stage = f"fetch_{platform}"
+
+    def decorate(func: Callable[[str], Optional[Profile]]) -> Callable[[str], Optional[Profile]]:
+        @wraps(func)
+        def wrapper(username: str) -> Optional[Profile]:
+            if not username:
+                return None
+            absent = negative_index(platform)
+            if absent is not None and username in absent:
+                FETCH_RESULTS.inc(platform, "absent_cached")
+                return None
+            key = (platform, username.lower())
+            if PROFILE_CACHE_TTL:
+                cached = _profile_cache.get(key)
+                if cached is not None:
+                    FETCH_RESULTS.inc(platform, "cached")
+                    return cached
+            cb = breaker(platform)
+            if not cb.allow():
+                FETCH_RESULTS.inc(platform, "short_circuited")
+                return None
+            try:
+                with metrics.track(stage, expected=(NotConfigured,)), http.for_platform(platform):
+                    # Hedged below the breaker: a duplicate is part of the same admitted call
+                    profile = hedge.get_hedger().call(platform, func, username, hedge=platform in hedge.HEDGE_PLATFORMS)
+            except NotConfigured:
+                cb.release()
+                FETCH_RESULTS.inc(platform, "unconfigured")
+                return None
+            except Exception as e:
+                cb.record_failure(e)
+                FETCH_RESULTS.inc(platform, "error")
+                return None
+            cb.record_success()
+            FETCH_RESULTS.inc(platform, "found" if profile else "absent")
+            if profile is not None and PROFILE_CACHE_TTL:
+                _profile_cache.set(key, profile)
+            elif profile is None and absent is not None:
+                absent.add(username)
+            return profile
+        return wrapper
+    return decorate
@@ -1,34 +1,35 @@
 import os
 from typing import Optional
-import requests
 from src.models.types import Profile
+from src.data.fetching import platform_fetcher
+from src.utils import http
 
-GITHUB_API = "https://api.github.com"
+GITHUB_API = os.getenv("GITHUB_API_URL") or "https://api.github.com"
 
+@platform_fetcher("github")
 def fetch_github_user(username: str) -> Optional[Profile]:
-    if not username:
-        return None
     url = f"{GITHUB_API}/users/{username}"
     headers = {}
     token = os.getenv("GITHUB_TOKEN")
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    try:
-        r = requests.get(url, headers=headers, timeout=15)
-        if r.status_code == 404:
-            return None
-        r.raise_for_status()
-        data = r.json()
-        return Profile(
-            platform="github",
-            username=data.get("login") or username,
-            display_name=data.get("name"),
-            bio=data.get("bio"),
-            followers=data.get("followers"),
-            location=data.get("location"),
-            profile_url=data.get("html_url"),
-            avatar_url=data.get("avatar_url"),
-            extra={"public_repos": data.get("public_repos")},
-        )
-    except Exception:
+    r = http.get(url, headers=headers, timeout=15)
+    if r.status_code == 404:
         return None
+    r.raise_for_status()
+    data = r.json()
+    return Profile(
+        platform="github",
+        username=data.get("login") or username,
+        display_name=data.get("name"),
+        bio=data.get("bio"),
+        followers=data.get("followers"),
+        location=data.get("location"),
+        profile_url=data.get("html_url"),
+        avatar_url=data.get("avatar_url"),
+        extra={
+            "public_repos": data.get("public_repos"),
+            "blog": data.get("blog") or None,
+            "twitter_username": data.get("twitter_username"),
+        },
+    )
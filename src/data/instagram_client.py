@@ -1,35 +1,49 @@
 import os
 from typing import Optional
 from src.models.types import Profile
+from src.data.fetching import NotConfigured, platform_fetcher
+from src.utils import http
+from src.utils.metrics import RATE_LIMITED
 
+# instaloader talks to instagram.com through its own session, which the stub server can't
+# stand in for; offline and load-test runs switch Instagram off instead
+_ENABLE_INSTAGRAM = os.getenv("ENABLE_INSTAGRAM", "true").lower() == "true"
+
+@platform_fetcher("instagram")
 def fetch_instagram_user(username: str) -> Optional[Profile]:
-    if not username:
-        return None
+    if not _ENABLE_INSTAGRAM:
+        raise NotConfigured("Instagram is disabled (ENABLE_INSTAGRAM=false)")
+    if http.session.mode == "replay":
+        # instaloader's own session bypasses the cassette; don't let an offline replay go online
+        raise NotConfigured("Instagram is not covered by HTTP cassettes")
     try:
         import instaloader  # lazy import
     except Exception:
-        return None
+        raise NotConfigured("instaloader is not installed")
 
+    L = instaloader.Instaloader(download_pictures=False, download_videos=False, download_video_thumbnails=False,
+                                 download_geotags=False, download_comments=False, save_metadata=False, compress_json=False)
+    ig_user = os.getenv("IG_USERNAME")
+    ig_pass = os.getenv("IG_PASSWORD")
+    if ig_user and ig_pass:
+        try:
+            L.login(ig_user, ig_pass)
+        except Exception:
+            pass  # proceed without login
+    ctx = L.context
     try:
-        L = instaloader.Instaloader(download_pictures=False, download_videos=False, download_video_thumbnails=False,
-                                     download_geotags=False, download_comments=False, save_metadata=False, compress_json=False)
-        ig_user = os.getenv("IG_USERNAME")
-        ig_pass = os.getenv("IG_PASSWORD")
-        if ig_user and ig_pass:
-            try:
-                L.login(ig_user, ig_pass)
-            except Exception:
-                pass  # proceed without login
-        ctx = L.context
         profile = instaloader.Profile.from_username(ctx, username)
-        return Profile(
-            platform="instagram",
-            username=profile.username,
-            display_name=profile.full_name or profile.username,
-            bio=profile.biography or None,
-            followers=profile.followers,
-            profile_url=f"https://instagram.com/{profile.username}",
-            avatar_url=str(profile.profile_pic_url) if getattr(profile, "profile_pic_url", None) else None,
-        )
-    except Exception:
+    except instaloader.exceptions.ProfileNotExistsException:
         return None
+    except instaloader.exceptions.TooManyRequestsException:
+        RATE_LIMITED.inc("instagram")
+        raise
+    return Profile(
+        platform="instagram",
+        username=profile.username,
+        display_name=profile.full_name or profile.username,
+        bio=profile.biography or None,
+        followers=profile.followers,
+        profile_url=f"https://instagram.com/{profile.username}",
+        avatar_url=str(profile.profile_pic_url) if getattr(profile, "profile_pic_url", None) else None,
+    )
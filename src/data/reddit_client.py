@@ -2,6 +2,11 @@ import os
 from typing import Optional
 
 from src.models.types import Profile
+from src.data.fetching import NotConfigured, platform_fetcher
+from src.utils import http
+
+# praw's Requestor sets its User-Agent on the session it is given; keep that off the shared one
+_session = http.session.fork()
 
 def _build_reddit():
     try:
@@ -15,48 +20,55 @@ def _build_reddit():
     if not client_id or not client_secret:
         return None
     try:
+        # Route praw through the shared (record/replay-capable) session; URLs are overridable for stubs
+        urls = {k: v for k, v in (("oauth_url", os.getenv("REDDIT_OAUTH_URL")), ("reddit_url", os.getenv("REDDIT_URL"))) if v}
         reddit = praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
             user_agent=user_agent,
+            requestor_kwargs={"session": _session},
+            **urls,
         )
         return reddit
     except Exception:
         return None
 
+@platform_fetcher("reddit")
 def fetch_reddit_user(username: str) -> Optional[Profile]:
     reddit = _build_reddit()
-    if not reddit or not username:
-        return None
+    if not reddit:
+        raise NotConfigured("praw or Reddit credentials missing")
+    from prawcore.exceptions import NotFound  # praw dependency, importable once _build_reddit succeeded
+
+    redditor = reddit.redditor(username)
+    # Accessing attributes may raise if suspended or not found
     try:
-        redditor = reddit.redditor(username)
-        # Accessing attributes may raise if suspended or not found
         _ = redditor.id  # forces a fetch
-        display_name = f"u/{username}"
+    except NotFound:
+        return None
+    display_name = f"u/{username}"
+    bio = None
+    try:
+        bio = getattr(redditor, "subreddit", None).public_description if getattr(redditor, "subreddit", None) else None
+    except Exception:
         bio = None
-        try:
-            bio = getattr(redditor, "subreddit", None).public_description if getattr(redditor, "subreddit", None) else None
-        except Exception:
-            bio = None
-        profile_url = f"https://www.reddit.com/user/{username}"
+    profile_url = f"https://www.reddit.com/user/{username}"
+    avatar_url = None
+    try:
+        avatar_url = getattr(redditor, "icon_img", None)
+    except Exception:
         avatar_url = None
-        try:
-            avatar_url = getattr(redditor, "icon_img", None)
-        except Exception:
-            avatar_url = None
-        followers = None
-        try:
-            followers = getattr(redditor, "subreddit", None).subscribers if getattr(redditor, "subreddit", None) else None
-        except Exception:
-            followers = None
-        return Profile(
-            platform="reddit",
-            username=username,
-            display_name=display_name,
-            bio=bio,
-            followers=followers,
-            profile_url=profile_url,
-            avatar_url=avatar_url,
-        )
+    followers = None
+    try:
+        followers = getattr(redditor, "subreddit", None).subscribers if getattr(redditor, "subreddit", None) else None
     except Exception:
-        return None
+        followers = None
+    return Profile(
+        platform="reddit",
+        username=username,
+        display_name=display_name,
+        bio=bio,
+        followers=followers,
+        profile_url=profile_url,
+        avatar_url=avatar_url,
+    )
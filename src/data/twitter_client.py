@@ -1,11 +1,13 @@
 import os
 from typing import Optional
-import requests
 from src.models.types import Profile
+from src.data.fetching import NotConfigured, platform_fetcher
+from src.utils import http
 
-TWITTER_API = "https://api.twitter.com/2"
+TWITTER_API = os.getenv("TWITTER_API_URL") or "https://api.twitter.com/2"
 
 
+@platform_fetcher("twitter")
 def fetch_twitter_user(query: str) -> Optional[Profile]:
     """Fetch a Twitter user by username or full name (best-effort).
 
@@ -15,56 +17,40 @@ def fetch_twitter_user(query: str) -> Optional[Profile]:
     """
     token = os.getenv("TWITTER_BEARER_TOKEN")
     if not token:
-        return None
+        raise NotConfigured("TWITTER_BEARER_TOKEN is not set")
 
     headers = {"Authorization": f"Bearer {token}"}
 
-    def get_by_username(username: str) -> Optional[Profile]:
-        url = f"{TWITTER_API}/users/by/username/{username}"
-        params = {"user.fields": "name,username,description,public_metrics,profile_image_url"}
-        r = requests.get(url, headers=headers, params=params, timeout=15)
-        if r.status_code != 200:
+    def get(url: str, params: dict) -> Optional[dict]:
+        r = http.get(url, headers=headers, params=params, timeout=15)
+        # 400 = malformed handle, 404 = unknown; both mean "no such user"
+        if r.status_code in (400, 404):
             return None
-        data = r.json().get("data")
-        if not data:
-            return None
-        metrics = (data.get("public_metrics") or {})
+        r.raise_for_status()
+        return r.json()
+
+    def to_profile(u: dict) -> Profile:
+        metrics = (u.get("public_metrics") or {})
         return Profile(
             platform="twitter",
-            username=data.get("username"),
-            display_name=data.get("name"),
-            bio=data.get("description"),
+            username=u.get("username"),
+            display_name=u.get("name"),
+            bio=u.get("description"),
             followers=metrics.get("followers_count"),
-            profile_url=f"https://twitter.com/{data.get('username')}",
-            avatar_url=data.get("profile_image_url"),
+            profile_url=f"https://twitter.com/{u.get('username')}",
+            avatar_url=u.get("profile_image_url"),
         )
 
+    fields = "name,username,description,public_metrics,profile_image_url"
     q = query.strip().lstrip("@")
     # Try as username first
-    prof = get_by_username(q)
-    if prof:
-        return prof
+    res = get(f"{TWITTER_API}/users/by/username/{q}", {"user.fields": fields})
+    if res and res.get("data"):
+        return to_profile(res["data"])
 
     # Fallback: search users by query (name). Note: Elevated access may be required.
-    search_url = f"{TWITTER_API}/users/by"
-    params = {"usernames": q.replace(" ", ""), "user.fields": "name,username,description,public_metrics,profile_image_url"}
-    try:
-        r = requests.get(search_url, headers=headers, params=params, timeout=15)
-        if r.status_code == 200:
-            for u in (r.json().get("data") or []):
-                metrics = (u.get("public_metrics") or {})
-                return Profile(
-                    platform="twitter",
-                    username=u.get("username"),
-                    display_name=u.get("name"),
-                    bio=u.get("description"),
-                    followers=metrics.get("followers_count"),
-                    profile_url=f"https://twitter.com/{u.get('username')}",
-                    avatar_url=u.get("profile_image_url"),
-                )
-    except Exception:
-        pass
+    res = get(f"{TWITTER_API}/users/by", {"usernames": q.replace(" ", ""), "user.fields": fields})
+    for u in ((res or {}).get("data") or []):
+        return to_profile(u)
 
     return None
-
-
@@ -1,23 +1,129 @@
 import os
-from typing import List, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.utils import profiling
+from src.utils.cache import get_cache
+
+# CSE returns at most 10 results per page and 100 per query
+_PAGE_SIZE = 10
+MENTION_MAX_PAGES = int(os.getenv("MENTION_MAX_PAGES", "3"))
+_mention_cache = get_cache(
+    "web_mentions",
+    maxsize=int(os.getenv("MENTION_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("MENTION_CACHE_TTL", "3600")),
+)
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "si", "spm"}
+
+_service = None
+_service_key: Optional[Tuple[str, Optional[str]]] = None
+_service_lock = threading.Lock()
+_local = threading.local()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used to dedupe mentions: no scheme/www/fragment/tracking params, sorted query."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def _get_service(api_key: str, endpoint: Optional[str]):
+    # Building the discovery client parses a large API document; do it once per key/endpoint
+    global _service, _service_key
+    key = (api_key, endpoint)
+    if _service is not None and _service_key == key:
+        return _service
+    with _service_lock:
+        if _service is None or _service_key != key:
+            from googleapiclient.discovery import build  # lazy import
+            client_options = {"api_endpoint": endpoint} if endpoint else None
+            _service = build("customsearch", "v1", developerKey=api_key, client_options=client_options,
+                             cache_discovery=False)
+            _service_key = key
+    return _service
+
+
+def _thread_http():
+    from src.utils import http as http_utils
+
+    if http_utils.session.mode:
+        # Recording or replaying: go through the shared session so CSE lands in the cassette
+        return http_utils.GoogleHttp(http_utils.session)
+    # httplib2.Http is not thread-safe; give each worker thread its own connection
+    http = getattr(_local, "http", None)
+    if http is None:
+        import httplib2
+        http = _local.http = httplib2.Http(timeout=15)
+    return http
+
+
+def _fetch_page(service, query: str, cse_id: str, start: int, num: int) -> List[Dict]:
+    from src.utils import http as http_utils
+
+    with http_utils.for_platform("google_cse"):
+        res = service.cse().list(q=query, cx=cse_id, start=start, num=num).execute(http=_thread_http())
+    return res.get("items", [])
+
 
 def web_mentions(query: str, num_results: int = 5) -> List[Dict]:
+    """Up to `num_results` distinct CSE results; beyond one page, pages are fetched concurrently
+    (at most MENTION_MAX_PAGES). Each page is a CSE query against the daily quota."""
     api_key = os.getenv("GOOGLE_API_KEY")
     cse_id = os.getenv("GOOGLE_CSE_ID")
     if not api_key or not cse_id:
         return []
+    cache_key = (query.strip().lower(), num_results)
+    cached = _mention_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
     try:
-        from googleapiclient.discovery import build  # lazy import
-        service = build("customsearch", "v1", developerKey=api_key)
-        res = service.cse().list(q=query, cx=cse_id, num=num_results).execute()
-        items = res.get("items", [])
-        results: List[Dict] = []
-        for it in items:
-            results.append({
-                "title": it.get("title"),
-                "link": it.get("link"),
-                "snippet": it.get("snippet"),
-            })
-        return results
+        # GOOGLE_CSE_ENDPOINT points the client at a stub server for offline runs
+        service = _get_service(api_key, os.getenv("GOOGLE_CSE_ENDPOINT"))
     except Exception:
         return []
+
+    # Pages start=1,11,21,... fetched concurrently
+    num_results = max(1, min(num_results, MENTION_MAX_PAGES * _PAGE_SIZE))
+    pages = [(start, min(_PAGE_SIZE, num_results - start + 1)) for start in range(1, num_results + 1, _PAGE_SIZE)]
+    complete = True
+    items: List[Dict] = []
+    with ThreadPoolExecutor(max_workers=len(pages)) as pool:
+        fetch_page = profiling.worker(_fetch_page)
+        futures = [pool.submit(fetch_page, service, query, cse_id, start, num) for start, num in pages]
+        for fut in futures:
+            try:
+                items.extend(fut.result())
+            except Exception:
+                complete = False
+
+    results: List[Dict] = []
+    seen = set()
+    for it in items:
+        link = it.get("link")
+        # Link-less results are told apart by their text rather than all sharing one key
+        key = normalize_url(link) if link else ("", it.get("title"), it.get("snippet"))
+        if key in seen:
+            continue
+        seen.add(key)
+        results.append({
+            "title": it.get("title"),
+            "link": link,
+            "snippet": it.get("snippet"),
+        })
+        if len(results) >= num_results:
+            break
+    # Partial results (a page failed) are returned but not cached
+    if complete:
+        _mention_cache.set(cache_key, results)
+    return list(results)
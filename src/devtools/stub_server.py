@@ -0,0 +1,295 @@
+"""Offline stand-in for the GitHub, Twitter, Reddit and Google CSE endpoints.
+
+Run it, then point the clients at it via the printed environment variables:
+
+    python -m src.devtools.stub_server --port 9100 --latency-ms 80 --error-rate 0.02
+
+Account existence is a deterministic function of the handle, so repeated runs
+(and benchmarks built on them) see the same data.
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Probability of answering with a 5xx
+    error_rate: float = 0.0
+    # Requests allowed per platform per window before 429/403 responses (0 = unlimited)
+    rate_limit: int = 0
+    rate_window_s: float = 60.0
+    # Fraction of handles that exist
+    exists_ratio: float = 0.5
+    search_results: int = 40
+    seed: int = 0
+
+
+def _digest(name: str) -> int:
+    return int.from_bytes(hashlib.blake2b(name.lower().encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _exists(name: str, ratio: float) -> bool:
+    return (_digest(name) % 10_000) < ratio * 10_000
+
+
+class _RateLimiter:
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._windows: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, platform: str) -> tuple:
+        """Returns (allowed, remaining, reset_epoch)."""
+        now = time.time()
+        with self._lock:
+            start, used = self._windows.get(platform, (now, 0))
+            if now - start >= self.window:
+                start, used = now, 0
+            used += 1
+            self._windows[platform] = (start, used)
+        reset = int(start + self.window)
+        if not self.limit:
+            return True, 1_000_000, reset
+        return used <= self.limit, max(0, self.limit - used), reset
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    app = FastAPI(title="MeMap+ platform stubs")
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+    limiter = _RateLimiter(config.rate_limit, config.rate_window_s)
+    stats: Counter = Counter()
+
+    async def gate(platform: str, limit_status: int) -> Optional[Response]:
+        """Apply latency, random failures and rate limiting; returns an early response or None."""
+        stats[platform] += 1
+        with rng_lock:
+            delay = max(0.0, rng.gauss(config.latency_ms, config.latency_jitter_ms)) / 1000.0
+            fail = rng.random() < config.error_rate
+        if delay:
+            await asyncio.sleep(delay)
+        allowed, remaining, reset = limiter.hit(platform)
+        headers = {
+            "X-RateLimit-Limit": str(config.rate_limit or 1_000_000),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+            "x-rate-limit-remaining": str(remaining),
+            "x-rate-limit-reset": str(reset),
+        }
+        if not allowed:
+            stats[f"{platform}:rate_limited"] += 1
+            return JSONResponse({"message": "rate limit exceeded"}, status_code=limit_status, headers=headers)
+        if fail:
+            stats[f"{platform}:errors"] += 1
+            return JSONResponse({"message": "stub upstream error"}, status_code=503, headers=headers)
+        return None
+
+    def base_url(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    def bio(name: str) -> str:
+        topics = ["python", "rust", "open source", "photography", "security", "design", "gaming", "music"]
+        d = _digest(name)
+        return f"{name} here. Into {topics[d % len(topics)]} and {topics[(d >> 8) % len(topics)]}."
+
+    # --- GitHub -----------------------------------------------------------
+
+    @app.get("/github/users/{name}")
+    async def github_user(name: str, request: Request):
+        early = await gate("github", 403)
+        if early:
+            return early
+        if not _exists(name, config.exists_ratio):
+            return JSONResponse({"message": "Not Found"}, status_code=404)
+        d = _digest(name)
+        return {
+            "login": name,
+            "name": name.title(),
+            "bio": bio(name),
+            "followers": d % 5000,
+            "location": None,
+            "html_url": f"https://github.com/{name}",
+            "avatar_url": f"{base_url(request)}/avatars/{name}.png",
+            "public_repos": d % 200,
+            "blog": f"https://twitter.com/{name}" if d % 3 == 0 else "",
+            "twitter_username": name if d % 5 == 0 else None,
+        }
+
+    # --- Twitter v2 -------------------------------------------------------
+
+    def twitter_user(name: str, request: Request) -> Dict:
+        d = _digest(name)
+        return {
+            "id": str(d % 10**12),
+            "name": name.title(),
+            "username": name,
+            "description": bio(name),
+            "public_metrics": {"followers_count": d % 20000},
+            "profile_image_url": f"{base_url(request)}/avatars/{name}.png",
+        }
+
+    @app.get("/twitter/2/users/by/username/{name}")
+    async def twitter_by_username(name: str, request: Request):
+        early = await gate("twitter", 429)
+        if early:
+            return early
+        if not _exists("tw:" + name, config.exists_ratio):
+            return {"errors": [{"title": "Not Found Error", "value": name, "detail": f"Could not find user with username: [{name}]."}]}
+        return {"data": twitter_user(name, request)}
+
+    @app.get("/twitter/2/users/by")
+    async def twitter_by_usernames(usernames: str, request: Request):
+        early = await gate("twitter", 429)
+        if early:
+            return early
+        found = [twitter_user(u, request) for u in usernames.split(",") if _exists("tw:" + u, config.exists_ratio)]
+        return {"data": found} if found else {"errors": [{"title": "Not Found Error"}]}
+
+    # --- Reddit (OAuth token + user about, as used by praw) ---------------
+
+    @app.post("/reddit/api/v1/access_token")
+    async def reddit_token():
+        return {"access_token": "stub-token", "token_type": "bearer", "expires_in": 86400, "scope": "*"}
+
+    # prawcore joins absolute API paths onto the OAuth host, so this lives at the root
+    @app.get("/user/{name}/about")
+    @app.get("/user/{name}/about/")
+    async def reddit_about(name: str, request: Request):
+        early = await gate("reddit", 429)
+        if early:
+            return early
+        if not _exists("rd:" + name, config.exists_ratio):
+            return JSONResponse({"message": "Not Found", "error": 404}, status_code=404)
+        d = _digest(name)
+        return {
+            "kind": "t2",
+            "data": {
+                "id": format(d % 36**6, "x"),
+                "name": name,
+                "icon_img": f"{base_url(request)}/avatars/{name}.png",
+                "created_utc": 1_500_000_000 + d % 10**8,
+                "subreddit": {"display_name": f"u_{name}", "public_description": bio(name), "subscribers": d % 3000},
+            },
+        }
+
+    # --- Google Custom Search JSON API ------------------------------------
+
+    @app.get("/cse/customsearch/v1")
+    async def cse(q: str, request: Request, num: int = 10, start: int = 1):
+        early = await gate("cse", 429)
+        if early:
+            return early
+        num = max(1, min(10, num))
+        items = []
+        for i in range(start, min(start + num, config.search_results + 1)):
+            # Every fourth result syndicates an earlier one, as real result pages do
+            src = i - 1 if i % 4 == 0 else i
+            items.append({
+                "title": f"{q} — result {src}",
+                "link": f"https://example.com/{q.replace(' ', '-')}/{src}" + ("?utm_source=feed" if src != i else ""),
+                "snippet": f"Mention {src} of {q} on the open web.",
+            })
+        return {"items": items, "searchInformation": {"totalResults": str(config.search_results)}}
+
+    # --- Avatars ----------------------------------------------------------
+
+    @app.get("/avatars/{name}.png")
+    async def avatar(name: str):
+        early = await gate("avatars", 429)
+        if early:
+            return early
+        from PIL import Image, ImageDraw  # lazy import
+
+        d = _digest(name.rstrip("_0123456789"))  # lookalike handles share an avatar
+        img = Image.new("RGB", (64, 64), (d & 255, (d >> 8) & 255, (d >> 16) & 255))
+        draw = ImageDraw.Draw(img)
+        for k in range(4):
+            x, y = (d >> (24 + 8 * k)) % 48, (d >> (28 + 8 * k)) % 48
+            draw.ellipse((x, y, x + 16, y + 16), fill=(255 - (d >> k) % 255, 255, 255))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return Response(buf.getvalue(), media_type="image/png")
+
+    # --- Introspection ----------------------------------------------------
+
+    @app.get("/_stats")
+    async def get_stats():
+        return dict(stats)
+
+    @app.post("/_stats/reset")
+    async def reset_stats():
+        stats.clear()
+        return {"ok": True}
+
+    return app
+
+
+def client_env(base_url: str) -> Dict[str, str]:
+    """Environment that points every client at a stub server running at `base_url`.
+
+    Instagram has no stub (instaloader uses its own session), so it is disabled.
+    """
+    base_url = base_url.rstrip("/")
+    return {
+        "GITHUB_API_URL": f"{base_url}/github",
+        "TWITTER_API_URL": f"{base_url}/twitter/2",
+        "TWITTER_BEARER_TOKEN": "stub",
+        "REDDIT_URL": f"{base_url}/reddit",
+        "REDDIT_OAUTH_URL": base_url,
+        "REDDIT_CLIENT_ID": "stub",
+        "REDDIT_CLIENT_SECRET": "stub",
+        "GOOGLE_CSE_ENDPOINT": f"{base_url}/cse",
+        "GOOGLE_API_KEY": "stub",
+        "GOOGLE_CSE_ID": "stub",
+        "ENABLE_INSTAGRAM": "false",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline platform stubs for MeMap+")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per platform per window (0 = unlimited)")
+    parser.add_argument("--rate-window-s", type=float, default=60.0)
+    parser.add_argument("--exists-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_window_s=args.rate_window_s,
+        exists_ratio=args.exists_ratio,
+        seed=args.seed,
+    )
+    for k, v in client_env(f"http://{args.host}:{args.port}").items():
+        print(f"export {k}={v}")
+    print("# Instagram is not stubbed; ENABLE_INSTAGRAM=false keeps clients off instagram.com", file=sys.stderr)
+    uvicorn.run(create_stub_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
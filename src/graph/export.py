@@ -0,0 +1,86 @@
+import csv
+import io
+from typing import Any, Dict, Iterator, List, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+# Meta keys exported as GraphML node attributes / columnar meta columns
+_META_KEYS = ("display_name", "bio", "followers", "url", "avatar")
+
+
+def to_columnar(nodes: Sequence[Any], edges: Sequence[Any], include_meta: bool = False) -> Dict[str, Any]:
+    """Struct-of-arrays graph: groups are dictionary-encoded, edges reference node indexes."""
+    index = {n.id: i for i, n in enumerate(nodes)}
+    groups: List[str] = []
+    group_codes: Dict[str, int] = {}
+    node_groups: List[int] = []
+    for n in nodes:
+        g = n.group or ""
+        if g not in group_codes:
+            group_codes[g] = len(groups)
+            groups.append(g)
+        node_groups.append(group_codes[g])
+
+    kept = [e for e in edges if e.source in index and e.target in index]
+    out: Dict[str, Any] = {
+        "groups": groups,
+        "nodes": {
+            "id": [n.id for n in nodes],
+            "label": [n.label for n in nodes],
+            "group": node_groups,
+        },
+        "edges": {
+            "source": [index[e.source] for e in kept],
+            "target": [index[e.target] for e in kept],
+            "weight": [e.weight for e in kept],
+            "label": [e.label for e in kept],
+        },
+    }
+    if any(getattr(n, "x", None) is not None for n in nodes):
+        out["nodes"]["x"] = [getattr(n, "x", None) for n in nodes]
+        out["nodes"]["y"] = [getattr(n, "y", None) for n in nodes]
+    if include_meta:
+        out["meta"] = {k: [(n.meta or {}).get(k) for n in nodes] for k in _META_KEYS}
+    return out
+
+
+def iter_graphml(nodes: Sequence[Any], edges: Sequence[Any]) -> Iterator[str]:
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+    yield '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+    yield '  <key id="group" for="node" attr.name="group" attr.type="string"/>\n'
+    for k in _META_KEYS:
+        yield f'  <key id="{k}" for="node" attr.name="{k}" attr.type="string"/>\n'
+    yield '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n'
+    yield '  <key id="elabel" for="edge" attr.name="label" attr.type="string"/>\n'
+    yield '  <graph edgedefault="undirected">\n'
+    for n in nodes:
+        parts = [f"    <node id={quoteattr(n.id)}>", f'<data key="label">{escape(n.label)}</data>']
+        if n.group:
+            parts.append(f'<data key="group">{escape(n.group)}</data>')
+        for k, v in (n.meta or {}).items():
+            if k in _META_KEYS and v is not None:
+                parts.append(f'<data key="{k}">{escape(str(v))}</data>')
+        parts.append("</node>\n")
+        yield "".join(parts)
+    for e in edges:
+        parts = [f"    <edge source={quoteattr(e.source)} target={quoteattr(e.target)}>"]
+        if e.weight is not None:
+            parts.append(f'<data key="weight">{e.weight}</data>')
+        if e.label:
+            parts.append(f'<data key="elabel">{escape(e.label)}</data>')
+        parts.append("</edge>\n")
+        yield "".join(parts)
+    yield "  </graph>\n</graphml>\n"
+
+
+def iter_csv_edges(edges: Sequence[Any], chunk_rows: int = 500) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["source", "target", "weight", "label"])
+    for i, e in enumerate(edges, 1):
+        writer.writerow([e.source, e.target, "" if e.weight is None else e.weight, e.label or ""])
+        if i % chunk_rows == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
@@ -1,7 +1,13 @@
-from typing import Dict
-import networkx as nx
-from pyvis.network import Network
+from typing import TYPE_CHECKING, Dict
 from src.models.types import Profile
+from src.graph.layout import compute_layout, static_options
+from src.utils.metrics import timed
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+# networkx and pyvis are imported inside the builders: pyvis alone costs ~0.5s
+# (it drags in IPython/jinja2) and API-only callers never render HTML.
 
 # Colors for platforms
 _PLATFORM_COLORS = {
@@ -29,6 +35,99 @@ def _edge_label(score: float, friendly: bool) -> str:
         return f"{pct} — Medium"
     return f"{pct} — Weak"
 
+_FOOTPRINT_OPTIONS = """
+{
+  "nodes": { 
+    "font": { 
+      "color": "#e2e8f0", 
+      "size": 16 
+    },
+    "borderWidth": 2,
+    "borderColor": "#1e293b",
+    "shadow": {
+      "enabled": true,
+      "color": "rgba(0,0,0,0.3)",
+      "size": 10,
+      "x": 5,
+      "y": 5
+    }
+  },
+  "edges": {
+    "color": { "color": "#64748b" },
+    "smooth": { "type": "dynamic" },
+    "font": { "size": 12, "strokeWidth": 0 },
+    "shadow": {
+      "enabled": true,
+      "color": "rgba(0,0,0,0.2)"
+    }
+  },
+  "physics": {
+    "barnesHut": { 
+      "gravitationalConstant": -12000, 
+      "centralGravity": 0.1, 
+      "springLength": 180, 
+      "springConstant": 0.04 
+    },
+    "stabilization": true
+  },
+  "interaction": {
+    "hover": true,
+    "hoverConnectedEdges": true,
+    "selectConnectedEdges": false
+  }
+}
+"""
+
+_COMPARISON_OPTIONS = """
+{
+  "nodes": { 
+    "font": { 
+      "color": "#e2e8f0", 
+      "size": 16 
+    },
+    "borderWidth": 2,
+    "borderColor": "#1e293b",
+    "shadow": {
+      "enabled": true,
+      "color": "rgba(0,0,0,0.3)",
+      "size": 10,
+      "x": 5,
+      "y": 5
+    }
+  },
+  "edges": {
+    "smooth": { "type": "dynamic" },
+    "font": { "size": 12, "align": "top", "strokeWidth": 0 },
+    "shadow": {
+      "enabled": true,
+      "color": "rgba(0,0,0,0.2)"
+    }
+  },
+  "physics": {
+    "enabled": true,
+    "barnesHut": { 
+      "gravitationalConstant": -8000, 
+      "centralGravity": 0.1, 
+      "springLength": 180, 
+      "springConstant": 0.04 
+    },
+    "stabilization": true
+  },
+  "interaction": {
+    "hover": true,
+    "hoverConnectedEdges": true,
+    "selectConnectedEdges": false
+  }
+}
+"""
+
+def _apply_layout(G: "nx.Graph") -> bool:
+    # Large graphs get precomputed positions so the browser skips physics entirely
+    positions = compute_layout(G.nodes, G.edges)
+    for node_id, (x, y) in positions.items():
+        G.nodes[node_id].update(x=x, y=y)
+    return bool(positions)
+
 def _inject_overlay(html: str, legend_html: str) -> str:
     # Inject a small legend overlay before </body>
     overlay_css = """
@@ -62,11 +161,15 @@ def _inject_overlay(html: str, legend_html: str) -> str:
     """
     return html.replace("</body>", f"{injection}</body>")
 
+@timed("build_footprint_html")
 def build_footprint_html(
     central_label: str,
     profiles: Dict[str, Profile],
     friendly: bool = True
 ) -> str:
+    import networkx as nx
+    from pyvis.network import Network
+
     G = nx.Graph()
     # Center node
     G.add_node(central_label, color="#6366f1", shape="dot", size=25, label=central_label)
@@ -86,50 +189,10 @@ def build_footprint_html(
                   shape="dot")
         G.add_edge(central_label, node_id, color="#64748b", width=3)
 
+    static = _apply_layout(G)
     net = Network(height="650px", width="100%", bgcolor="#0f172a", font_color="#e2e8f0")
     net.from_nx(G)
-    net.set_options("""
-{
-  "nodes": { 
-    "font": { 
-      "color": "#e2e8f0", 
-      "size": 16 
-    },
-    "borderWidth": 2,
-    "borderColor": "#1e293b",
-    "shadow": {
-      "enabled": true,
-      "color": "rgba(0,0,0,0.3)",
-      "size": 10,
-      "x": 5,
-      "y": 5
-    }
-  },
-  "edges": {
-    "color": { "color": "#64748b" },
-    "smooth": { "type": "dynamic" },
-    "font": { "size": 12, "strokeWidth": 0 },
-    "shadow": {
-      "enabled": true,
-      "color": "rgba(0,0,0,0.2)"
-    }
-  },
-  "physics": {
-    "barnesHut": { 
-      "gravitationalConstant": -12000, 
-      "centralGravity": 0.1, 
-      "springLength": 180, 
-      "springConstant": 0.04 
-    },
-    "stabilization": true
-  },
-  "interaction": {
-    "hover": true,
-    "hoverConnectedEdges": true,
-    "selectConnectedEdges": false
-  }
-}
-""")
+    net.set_options(static_options(_FOOTPRINT_OPTIONS) if static else _FOOTPRINT_OPTIONS)
     html = net.generate_html(notebook=False)
 
     legend = f"""
@@ -146,6 +209,7 @@ def build_footprint_html(
     """
     return _inject_overlay(html, legend)
 
+@timed("build_comparison_html")
 def build_comparison_html(
     user_a: str,
     user_b: str,
@@ -154,6 +218,9 @@ def build_comparison_html(
     platform_scores: Dict[str, float],
     friendly: bool = True
 ) -> str:
+    import networkx as nx
+    from pyvis.network import Network
+
     G = nx.Graph()
 
     # Use internal ids but show the real usernames as labels
@@ -214,50 +281,10 @@ def build_comparison_html(
                 title=f"{platform.capitalize()} similarity: {int(score*100)}%"
             )
 
+    static = _apply_layout(G)
     net = Network(height="700px", width="100%", bgcolor="#0f172a", font_color="#e2e8f0")
     net.from_nx(G)
-    net.set_options("""
-{
-  "nodes": { 
-    "font": { 
-      "color": "#e2e8f0", 
-      "size": 16 
-    },
-    "borderWidth": 2,
-    "borderColor": "#1e293b",
-    "shadow": {
-      "enabled": true,
-      "color": "rgba(0,0,0,0.3)",
-      "size": 10,
-      "x": 5,
-      "y": 5
-    }
-  },
-  "edges": {
-    "smooth": { "type": "dynamic" },
-    "font": { "size": 12, "align": "top", "strokeWidth": 0 },
-    "shadow": {
-      "enabled": true,
-      "color": "rgba(0,0,0,0.2)"
-    }
-  },
-  "physics": {
-    "enabled": true,
-    "barnesHut": { 
-      "gravitationalConstant": -8000, 
-      "centralGravity": 0.1, 
-      "springLength": 180, 
-      "springConstant": 0.04 
-    },
-    "stabilization": true
-  },
-  "interaction": {
-    "hover": true,
-    "hoverConnectedEdges": true,
-    "selectConnectedEdges": false
-  }
-}
-""")
+    net.set_options(static_options(_COMPARISON_OPTIONS) if static else _COMPARISON_OPTIONS)
     html = net.generate_html(notebook=False)
 
     legend = f"""
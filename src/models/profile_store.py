@@ -0,0 +1,202 @@
+import json
+import math
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.models.types import CompactProfile, Profile
+from src.similarity.image_similarity import hash_similarity
+from src.similarity.text_similarity import simhash64, username_similarity_matrix
+
+HAS_BIO = 1
+HAS_AVATAR = 2
+
+_COLUMNS = ("platform", "followers", "bio_hash", "avatar_hash", "fetched_at", "flags",
+            "username_offsets", "username_data")
+
+class ProfileStore:
+    """Column-oriented profile corpus (one NumPy array per field).
+
+    Usernames are stored Arrow-style as one UTF-8 byte buffer plus offsets, so
+    every column is a flat fixed-dtype array that can be memory-mapped from
+    disk. Bios and avatars are kept as 64-bit SimHash / pHash fingerprints,
+    which the similarity methods score column-wise with the same functions
+    src/similarity uses for single pairs, without building Profile objects.
+    """
+
+    def __init__(self, platforms: Sequence[str], columns: Dict[str, np.ndarray]):
+        self.platforms = list(platforms)
+        self.platform = columns["platform"]
+        self.followers = columns["followers"]
+        self.bio_hash = columns["bio_hash"]
+        self.avatar_hash = columns["avatar_hash"]
+        self.fetched_at = columns["fetched_at"]
+        self.flags = columns["flags"]
+        self.username_offsets = columns["username_offsets"]
+        self.username_data = columns["username_data"]
+
+    def __len__(self) -> int:
+        return len(self.platform)
+
+    @classmethod
+    def from_profiles(
+        cls,
+        profiles: Iterable[Profile],
+        avatar_hashes: Optional[Dict[str, int]] = None,
+        fetched_at: Union[None, float, Sequence[float]] = None,
+    ) -> "ProfileStore":
+        """Build a store; `avatar_hashes` maps avatar URL -> pHash (see image_similarity.avatar_phash).
+
+        `fetched_at` is one time for every row, or one per profile (in order); default now.
+        """
+        avatar_hashes = avatar_hashes or {}
+        platforms: List[str] = []
+        codes: Dict[str, int] = {}
+        plat, followers, bio_h, av_h, flags = [], [], [], [], []
+        offsets = [0]
+        data = bytearray()
+        for p in profiles:
+            if p.platform not in codes:
+                codes[p.platform] = len(platforms)
+                platforms.append(p.platform)
+            plat.append(codes[p.platform])
+            followers.append(-1 if p.followers is None else p.followers)
+            f = 0
+            bio_h.append(simhash64(p.bio))
+            if p.bio:
+                f |= HAS_BIO
+            ah = avatar_hashes.get(p.avatar_url) if p.avatar_url else None
+            av_h.append(ah or 0)
+            if ah is not None:
+                f |= HAS_AVATAR
+            flags.append(f)
+            data += p.username.encode("utf-8")
+            offsets.append(len(data))
+        if len(platforms) > 255:
+            raise ValueError("ProfileStore supports at most 255 platforms")
+        n = len(plat)
+        if fetched_at is None or np.ndim(fetched_at) == 0:
+            fetched = np.full(n, time.time() if fetched_at is None else fetched_at, dtype=np.float64)
+        else:
+            fetched = np.asarray(fetched_at, dtype=np.float64)
+            if fetched.shape != (n,):
+                raise ValueError(f"fetched_at has {len(fetched)} times for {n} profiles")
+        columns = {
+            "platform": np.array(plat, dtype=np.uint8),
+            "followers": np.array(followers, dtype=np.int64),
+            "bio_hash": np.array(bio_h, dtype=np.uint64),
+            "avatar_hash": np.array(av_h, dtype=np.uint64),
+            "fetched_at": fetched,
+            "flags": np.array(flags, dtype=np.uint8),
+            "username_offsets": np.array(offsets, dtype=np.int64),
+            "username_data": np.frombuffer(bytes(data), dtype=np.uint8),
+        }
+        return cls(platforms, columns)
+
+    @classmethod
+    def concat(cls, stores: Sequence["ProfileStore"]) -> "ProfileStore":
+        """One store with every row of `stores`, in order; each row keeps its own fetch time."""
+        if not stores:
+            return cls.from_profiles([])
+        platforms: List[str] = []
+        for store in stores:
+            platforms.extend(p for p in store.platforms if p not in platforms)
+        if len(platforms) > 255:
+            raise ValueError("ProfileStore supports at most 255 platforms")
+        # Platform codes are per store; remap each store's onto the merged list
+        codes = [np.array([platforms.index(p) for p in store.platforms], dtype=np.uint8) for store in stores]
+        columns = {"platform": np.concatenate([c[s.platform] for c, s in zip(codes, stores)])}
+        for name in ("followers", "bio_hash", "avatar_hash", "fetched_at", "flags", "username_data"):
+            columns[name] = np.concatenate([getattr(s, name) for s in stores])
+        offsets, base = [np.zeros(1, np.int64)], 0
+        for s in stores:
+            offsets.append(np.asarray(s.username_offsets[1:], dtype=np.int64) + base)
+            base += int(s.username_offsets[-1])
+        columns["username_offsets"] = np.concatenate(offsets)
+        return cls(platforms, columns)
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        for name in _COLUMNS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "platforms.json"), "w", encoding="utf-8") as f:
+            json.dump(self.platforms, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "ProfileStore":
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "platforms.json"), encoding="utf-8") as f:
+            platforms = json.load(f)
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in _COLUMNS}
+        return cls(platforms, columns)
+
+    # --- row access -------------------------------------------------------
+
+    def username(self, i: int) -> str:
+        start, end = self.username_offsets[i], self.username_offsets[i + 1]
+        return bytes(self.username_data[start:end]).decode("utf-8")
+
+    def usernames(self, idx: Optional[np.ndarray] = None) -> List[str]:
+        rows = range(len(self)) if idx is None else idx
+        return [self.username(int(i)) for i in rows]
+
+    def profile(self, i: int) -> CompactProfile:
+        followers = int(self.followers[i])
+        return CompactProfile(
+            platform=self.platforms[self.platform[i]],
+            username=self.username(i),
+            followers=None if followers < 0 else followers,
+        )
+
+    # --- vectorized filters and scoring ----------------------------------
+
+    def mask(
+        self,
+        platform: Optional[str] = None,
+        min_followers: Optional[int] = None,
+        has_bio: Optional[bool] = None,
+        has_avatar: Optional[bool] = None,
+        fetched_after: Optional[float] = None,
+    ) -> np.ndarray:
+        m = np.ones(len(self), dtype=bool)
+        if platform is not None:
+            if platform not in self.platforms:
+                return np.zeros(len(self), dtype=bool)
+            m &= self.platform == self.platforms.index(platform)
+        if min_followers is not None:
+            m &= self.followers >= min_followers
+        if has_bio is not None:
+            m &= ((self.flags & HAS_BIO) != 0) == has_bio
+        if has_avatar is not None:
+            m &= ((self.flags & HAS_AVATAR) != 0) == has_avatar
+        if fetched_after is not None:
+            m &= self.fetched_at >= fetched_after
+        return m
+
+    def _hash_similarity(self, column: np.ndarray, flag: int, query: int, idx: Optional[np.ndarray]) -> np.ndarray:
+        hashes = column if idx is None else column[idx]
+        flags = self.flags if idx is None else self.flags[idx]
+        sims = hash_similarity(hashes, np.uint64(query))
+        sims[(flags & flag) == 0] = math.nan
+        return sims
+
+    def bio_similarity(self, bio: Optional[str], idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """SimHash similarity of `bio` against every stored bio (NaN where a bio is missing)."""
+        if not bio:
+            return np.full(len(self) if idx is None else len(idx), math.nan)
+        return self._hash_similarity(self.bio_hash, HAS_BIO, simhash64(bio), idx)
+
+    def avatar_similarity(self, phash: Optional[int], idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """Same scale as image_similarity: 1 - hamming/64 (NaN where an avatar hash is missing)."""
+        if phash is None:
+            return np.full(len(self) if idx is None else len(idx), math.nan)
+        return self._hash_similarity(self.avatar_hash, HAS_AVATAR, phash, idx)
+
+    def username_similarity(self, username: str, idx: Optional[np.ndarray] = None) -> np.ndarray:
+        """compare_usernames() against every stored username (username_similarity_matrix, one row)."""
+        names = self.usernames(idx)
+        if not names:
+            return np.zeros(0)
+        return username_similarity_matrix([username], names)[0].astype(np.float64)
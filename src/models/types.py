@@ -1,5 +1,6 @@
+import sys
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 @dataclass
 class Profile:
@@ -12,3 +13,53 @@ class Profile:
     profile_url: Optional[str] = None
     avatar_url: Optional[str] = None
     extra: Optional[Dict[str, Any]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompactProfile:
+    """Immutable, __slots__-based Profile for large in-memory corpora.
+
+    No per-instance __dict__; platform strings are interned so millions of
+    profiles share a handful of platform objects, and `extra` is stored as a
+    tuple of items instead of a dict.
+    """
+
+    platform: str
+    username: str
+    display_name: Optional[str] = None
+    bio: Optional[str] = None
+    followers: Optional[int] = None
+    location: Optional[str] = None
+    profile_url: Optional[str] = None
+    avatar_url: Optional[str] = None
+    extra: Optional[Tuple[Tuple[str, Any], ...]] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "platform", sys.intern(self.platform))
+
+    @classmethod
+    def from_profile(cls, p: Profile) -> "CompactProfile":
+        return cls(
+            platform=p.platform,
+            username=p.username,
+            display_name=p.display_name,
+            bio=p.bio,
+            followers=p.followers,
+            location=p.location,
+            profile_url=p.profile_url,
+            avatar_url=p.avatar_url,
+            extra=tuple(p.extra.items()) if p.extra else None,
+        )
+
+    def to_profile(self) -> Profile:
+        return Profile(
+            platform=self.platform,
+            username=self.username,
+            display_name=self.display_name,
+            bio=self.bio,
+            followers=self.followers,
+            location=self.location,
+            profile_url=self.profile_url,
+            avatar_url=self.avatar_url,
+            extra=dict(self.extra) if self.extra else None,
+        )
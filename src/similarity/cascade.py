@@ -0,0 +1,86 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from src.models.types import Profile
+from src.similarity.matrix import score_matrix
+from src.similarity.scoring import CROSS_MATCH_MIN_SCORE, ComparisonScores, avatar_candidates, image_score, likelihood, text_scores
+from src.utils import metrics
+
+# Decision threshold on impersonation likelihood; 0.6 is where the UI starts flagging risk
+CASCADE_THRESHOLD = float(os.getenv("CASCADE_THRESHOLD") or "0.6")
+
+STAGES = ("username", "bio", "image")
+CASCADE_EXITS = metrics.counter("memap_cascade_exits_total", "Cascade scorings by the stage they stopped after", ("stage",))
+
+
+@dataclass
+class CascadeResult:
+    scores: ComparisonScores  # fields of stages that never ran keep their defaults
+    above: bool  # impersonation likelihood >= threshold
+    stage: str  # last stage that ran
+    lower: float  # bounds on the likelihood the full pipeline would have produced
+    upper: float
+
+
+def _bounds(scores: ComparisonScores, m, image_pending: bool) -> Tuple[float, float]:
+    bio_pending = m.bio is None
+    # Unknown bio counts as 1 only if some shared platform has bios on both sides
+    bio_hi = 1.0 if bio_pending and any(m.has_bio[m.index(p, p)] for p in scores.platform_scores) else scores.overall_bio
+    img_hi = 1.0 if image_pending else scores.image_similarity
+    lo = likelihood(scores.overall_bio, scores.overall_username, scores.mutual_presence, scores.image_similarity,
+                    m.best_cross())
+    hi = likelihood(bio_hi, scores.overall_username, scores.mutual_presence, img_hi, m.best_cross(upper=True))
+    return lo, hi
+
+
+def cascade_score(
+    user_a: str,
+    user_b: str,
+    profiles_a: Dict[str, Profile],
+    profiles_b: Dict[str, Profile],
+    threshold: float = CASCADE_THRESHOLD,
+    with_images: bool = True,
+) -> CascadeResult:
+    """Decide likelihood >= threshold, running expensive stages only while the answer is open.
+
+    Usernames, lookalike skeletons and display names come first; bio similarity
+    (possibly embeddings) runs only if the bounds still straddle the threshold,
+    and avatar hashing (two downloads) only if they still do after that. When all
+    stages run, the scores equal score_comparison().
+    """
+    m = score_matrix(user_a, user_b, profiles_a, profiles_b, with_bio=False)
+    scores = text_scores(user_a, user_b, profiles_a, profiles_b, m, with_matches=False)
+    image_pending = with_images and bool(avatar_candidates(profiles_a, profiles_b, list(scores.platform_scores)))
+
+    stage = STAGES[0]
+    lo, hi = _bounds(scores, m, image_pending)
+    if lo < threshold <= hi:
+        stage = STAGES[1]
+        m.fill_bio()
+        scores = text_scores(user_a, user_b, profiles_a, profiles_b, m)
+        lo, hi = _bounds(scores, m, image_pending)
+        if image_pending and lo < threshold <= hi:
+            stage = STAGES[2]
+            scores.image_similarity = image_score(profiles_a, profiles_b, list(scores.platform_scores))
+            lo, hi = _bounds(scores, m, image_pending=False)
+
+    if not scores.cross_matches:
+        scores.cross_matches = m.top_matches(k=5, min_score=CROSS_MATCH_MIN_SCORE)
+    scores.impersonation_likelihood = lo
+    CASCADE_EXITS.inc(stage)
+    return CascadeResult(scores=scores, above=lo >= threshold, stage=stage, lower=lo, upper=hi)
+
+
+def scan(
+    user: str,
+    profiles: Dict[str, Profile],
+    candidates: Dict[str, Dict[str, Profile]],
+    threshold: float = CASCADE_THRESHOLD,
+    with_images: bool = True,
+) -> List[Tuple[str, CascadeResult]]:
+    """Cascade-score one identity against many (e.g. a watchlist); likely impersonators first."""
+    results = [(name, cascade_score(user, name, profiles, cand, threshold, with_images))
+               for name, cand in candidates.items()]
+    results.sort(key=lambda r: (r[1].above, r[1].upper), reverse=True)
+    return results
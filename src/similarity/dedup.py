@@ -0,0 +1,92 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Sequence
+
+# MinHash with 64 permutations, banded into 16 LSH bands of 4 rows. Two snippets
+# with word-set Jaccard 0.8 share a band with probability ~0.9998; at Jaccard 0.2
+# it is ~2.5%, and candidates are then checked against JACCARD_THRESHOLD.
+NUM_PERM = 64
+LSH_BANDS = 16
+JACCARD_THRESHOLD = 0.6
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_perm_cache: Dict[int, tuple] = {}
+
+
+def _permutations(num_perm: int):
+    import numpy as np  # lazy import
+
+    if num_perm not in _perm_cache:
+        rng = np.random.default_rng(0x5EED)
+        a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)  # odd multipliers
+        b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        _perm_cache[num_perm] = (a, b)
+    return _perm_cache[num_perm]
+
+
+def minhash_signature(text: Optional[str], num_perm: int = NUM_PERM):
+    """MinHash signature (uint64 array) over lowercase word unigrams and bigrams, or None for empty text."""
+    if not text:
+        return None
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = set(tokens) | {a + " " + b for a, b in zip(tokens, tokens[1:])}
+    if not features:
+        return None
+    import numpy as np  # lazy import
+
+    digests = b"".join(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest() for f in features)
+    x = np.frombuffer(digests, dtype=np.uint64)
+    a, b = _permutations(num_perm)
+    # Multiply-add hashing mod 2**64 (uint64 arithmetic wraps)
+    return (a[:, None] * x[None, :] + b[:, None]).min(axis=1)
+
+
+def near_duplicate_groups(texts: Sequence[Optional[str]], threshold: float = JACCARD_THRESHOLD,
+                          num_perm: int = NUM_PERM, bands: int = LSH_BANDS) -> List[List[int]]:
+    """Group indices of near-duplicate texts; groups keep first-seen order.
+
+    Texts are only compared when they land in the same LSH bucket, so the cost is
+    linear in the number of texts. Empty texts stay singletons.
+    """
+    n = len(texts)
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = num_perm // bands
+    sigs = [minhash_signature(t, num_perm) for t in texts]
+    buckets: Dict[tuple, List[int]] = {}
+    for i, sig in enumerate(sigs):
+        if sig is None:
+            continue
+        for band in range(bands):
+            members = buckets.setdefault((band, sig[band * rows:(band + 1) * rows].tobytes()), [])
+            for j in members:
+                ri, rj = find(i), find(j)
+                if ri != rj and float((sig == sigs[j]).mean()) >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+            members.append(i)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def dedupe_mentions(mentions: List[Dict], threshold: float = JACCARD_THRESHOLD) -> List[Dict]:
+    """Collapse syndicated/mirrored mentions (by title + snippet) into one entry each.
+
+    The first (highest ranked) mention of each group is kept; the others' links are
+    listed under "duplicates".
+    """
+    texts = [f"{m.get('title') or ''} {m.get('snippet') or ''}" for m in mentions]
+    distinct: List[Dict] = []
+    for group in near_duplicate_groups(texts, threshold=threshold):
+        head = dict(mentions[group[0]])
+        head["duplicates"] = [mentions[i].get("link") for i in group[1:]]
+        distinct.append(head)
+    return distinct
@@ -0,0 +1,240 @@
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence
+
+from src.utils import metrics
+from src.utils.cache import get_cache
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# "process" (default): a worker process batches encode calls, off the API's GIL;
+# "thread": the model lives in this process (opt-out, e.g. where spawning is not allowed)
+EMBEDDINGS_WORKER = os.getenv("EMBEDDINGS_WORKER", "process").lower()
+EMBEDDINGS_TIMEOUT = float(os.getenv("EMBEDDINGS_TIMEOUT", "30"))
+EMBEDDINGS_MAX_BATCH = int(os.getenv("EMBEDDINGS_MAX_BATCH", "64"))
+EMBEDDINGS_MAX_WAIT_MS = float(os.getenv("EMBEDDINGS_MAX_WAIT_MS", "5"))
+
+EMBED_BATCH_SIZE = metrics.histogram(
+    "memap_embedding_batch_texts", "Texts encoded per worker batch", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+# Per-text vectors, keyed by model; shared across API workers with a shared cache backend
+_vector_cache = get_cache("embeddings", maxsize=int(os.getenv("EMBEDDING_CACHE_SIZE") or "20000"))
+
+_model = None
+_model_failed = False
+_model_lock = threading.Lock()
+
+_worker: Optional["EmbeddingWorker"] = None
+_worker_lock = threading.Lock()
+
+
+def get_model():
+    """Load the sentence-transformers model once; concurrent first callers wait for the same load."""
+    global _model, _model_failed
+    if _model is not None or _model_failed:
+        return _model
+    with _model_lock:
+        if _model is None and not _model_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(EMBEDDING_MODEL)
+            except Exception:
+                _model_failed = True
+    return _model
+
+
+def _worker_main(model_name: str, requests, results, max_batch: int, max_wait: float) -> None:
+    try:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name)
+        model.encode(["warm up"])
+    except Exception:
+        results.put((-1, False))
+        return
+    results.put((-1, True))
+
+    stopping = False
+    while not stopping:
+        item = requests.get()
+        if item is None:
+            break
+        batch = [item]
+        n = len(item[1])
+        deadline = time.monotonic() + max_wait
+        # Coalesce whatever other handlers submitted within the wait window
+        while n < max_batch:
+            try:
+                item = requests.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+            n += len(item[1])
+        texts = [t for _, ts in batch for t in ts]
+        results.put((-2, len(texts)))
+        try:
+            vecs = model.encode(texts, batch_size=max_batch, convert_to_numpy=True, normalize_embeddings=True)
+        except Exception:
+            for req_id, _ in batch:
+                results.put((req_id, None))
+            continue
+        i = 0
+        for req_id, ts in batch:
+            results.put((req_id, vecs[i:i + len(ts)]))
+            i += len(ts)
+
+
+class EmbeddingWorker:
+    """Out-of-process encoder: the model and its CPU work run in a separate process.
+
+    Handlers submit texts through a queue; the worker coalesces requests that
+    arrive within a few milliseconds into one `model.encode` batch.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, max_batch: int = EMBEDDINGS_MAX_BATCH,
+                 max_wait_ms: float = EMBEDDINGS_MAX_WAIT_MS):
+        ctx = mp.get_context("spawn")
+        self._requests = ctx.Queue()
+        self._results = ctx.Queue()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.ready = threading.Event()
+        self.available = False
+        self._proc = ctx.Process(
+            target=_worker_main,
+            args=(model_name, self._requests, self._results, max_batch, max_wait_ms / 1000.0),
+            daemon=True,
+            name="memap-embeddings",
+        )
+        self._proc.start()
+        self._collector = threading.Thread(target=self._collect, daemon=True, name="memap-embeddings-results")
+        self._collector.start()
+
+    def _collect(self) -> None:
+        while True:
+            try:
+                msg = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if self._proc.is_alive():
+                    continue
+                msg = None  # worker died (crash, OOM kill): fail pending and future calls fast
+            if msg is None:
+                self.ready.set()
+                self.available = False
+                break
+            req_id, payload = msg
+            if req_id == -1:  # model load finished
+                self.available = bool(payload)
+                self.ready.set()
+                if not self.available:
+                    break
+                continue
+            if req_id == -2:  # a batch was formed
+                EMBED_BATCH_SIZE.observe(payload)
+                continue
+            with self._lock:
+                fut = self._pending.pop(req_id, None)
+            if fut is not None:
+                fut.set_result(payload)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_result(None)
+
+    def encode(self, texts: Sequence[str], timeout: float = EMBEDDINGS_TIMEOUT):
+        if self.ready.is_set() and not self.available:
+            return None
+        fut: Future = Future()
+        req_id = next(self._ids)
+        with self._lock:
+            self._pending[req_id] = fut
+        self._requests.put((req_id, list(texts)))
+        try:
+            return fut.result(timeout=timeout)
+        except Exception:
+            with self._lock:
+                self._pending.pop(req_id, None)
+            return None
+
+    def close(self) -> None:
+        self._requests.put(None)
+        self._proc.join(timeout=5)
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._results.put(None)
+
+
+def get_worker() -> Optional[EmbeddingWorker]:
+    global _worker
+    if EMBEDDINGS_WORKER != "process":
+        return None
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = EmbeddingWorker()
+    return _worker
+
+
+def encode(texts: List[str]):
+    """L2-normalized embeddings (numpy array, one row per text), or None if unavailable."""
+    if not texts:
+        return _encode(texts)
+    cached = [_vector_cache.get((EMBEDDING_MODEL, t)) for t in texts]
+    missing = [t for t, v in zip(texts, cached) if v is None]
+    if missing:
+        fresh = _encode(list(dict.fromkeys(missing)))
+        if fresh is None:
+            return None
+        by_text = dict(zip(dict.fromkeys(missing), fresh))
+        for t, v in by_text.items():
+            _vector_cache.set((EMBEDDING_MODEL, t), v)
+        cached = [by_text[t] if v is None else v for t, v in zip(texts, cached)]
+    import numpy as np  # lazy import
+
+    return np.stack(cached)
+
+
+def _encode(texts: List[str]):
+    worker = get_worker()
+    if worker is not None:
+        return worker.encode(texts)
+    model = get_model()
+    if model is None:
+        return None
+    try:
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    except Exception:
+        return None
+
+
+def warm_up(background: bool = True) -> Optional[threading.Thread]:
+    """Load the model (or start the worker) ahead of the first request."""
+    def run():
+        worker = get_worker()
+        if worker is not None:
+            worker.ready.wait(EMBEDDINGS_TIMEOUT * 10)
+        else:
+            encode(["warm up"])
+
+    if not background:
+        run()
+        return None
+    t = threading.Thread(target=run, daemon=True, name="memap-embeddings-warmup")
+    t.start()
+    return t
+
+
+def shutdown() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.close()
+            _worker = None
@@ -2,27 +2,70 @@ import os
 from typing import Optional
 from io import BytesIO
 
-import requests
-from PIL import Image
+from src.utils.cache import get_cache
+from src.utils.metrics import timed
 
-def image_similarity(url1: Optional[str], url2: Optional[str]) -> Optional[float]:
-    if not url1 or not url2:
-        return None
+# Avatar URLs are content-addressed on most platforms, so hashes can live long
+_hash_cache = get_cache("avatar_phash", maxsize=int(os.getenv("AVATAR_HASH_CACHE_SIZE") or "4096"),
+                        ttl=float(os.getenv("AVATAR_HASH_CACHE_TTL") or str(24 * 3600)))
+
+def phash_bytes(data: bytes) -> Optional[int]:
+    """64-bit perceptual hash of an encoded image, or None if it can't be decoded."""
     try:
         import imagehash  # lazy import
+        from PIL import Image
+    except Exception:
+        return None
+    try:
+        img = Image.open(BytesIO(data)).convert('RGB')
+        return int(str(imagehash.phash(img)), 16)
     except Exception:
         return None
 
+def avatar_phash(url: Optional[str]) -> Optional[int]:
+    if not url:
+        return None
+    cached = _hash_cache.get(url)
+    if cached is not None:
+        return cached
+    from src.utils import http  # lazy: pulls in requests
+
     try:
-        r1 = requests.get(url1, timeout=20)
-        r2 = requests.get(url2, timeout=20)
-        r1.raise_for_status(); r2.raise_for_status()
-        img1 = Image.open(BytesIO(r1.content)).convert('RGB')
-        img2 = Image.open(BytesIO(r2.content)).convert('RGB')
-        h1 = imagehash.phash(img1)
-        h2 = imagehash.phash(img2)
-        dist = h1 - h2  # Hamming distance
-        bits = 64.0  # phash default 8x8
-        return max(0.0, min(1.0, 1.0 - (dist / bits)))
+        r = http.get(url, timeout=20)
+        r.raise_for_status()
     except Exception:
         return None
+    h = phash_bytes(r.content)
+    if h is not None:
+        _hash_cache.set(url, h)
+    return h
+
+def hash_similarity(h1, h2, bits: int = 64):
+    """1 - Hamming distance / bits. Either hash may be a uint64 NumPy array (e.g. a
+    ProfileStore column), giving one float64 score per element."""
+    if isinstance(h1, int) and isinstance(h2, int):
+        dist = bin(h1 ^ h2).count("1")  # Hamming distance
+        return max(0.0, min(1.0, 1.0 - (dist / bits)))
+    import numpy as np  # lazy import
+
+    dist = _popcount64(np.bitwise_xor(np.asarray(h1, dtype=np.uint64), np.asarray(h2, dtype=np.uint64)))
+    return np.clip(1.0 - dist.astype(np.float64) / bits, 0.0, 1.0)
+
+def _popcount64(x):
+    import numpy as np  # lazy import
+
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    # numpy < 2.0: byte-wise lookup table
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[np.ascontiguousarray(x).view(np.uint8).reshape(x.shape + (8,))].sum(axis=-1)
+
+@timed("image_similarity")
+def image_similarity(url1: Optional[str], url2: Optional[str]) -> Optional[float]:
+    if not url1 or not url2:
+        return None
+    h1 = avatar_phash(url1)
+    h2 = avatar_phash(url2)
+    if h1 is None or h2 is None:
+        return None
+    return hash_similarity(h1, h2)  # phash default 8x8 = 64 bits
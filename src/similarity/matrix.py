@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from src.models.types import Profile
+from src.similarity.text_similarity import bio_similarity_matrix, username_similarity_matrix
+from src.similarity.username_features import FEATURES, username_features, username_score
+
+ROOT = "root"
+
+# Signal weights; missing signals (no bio, no display name) are left out and the rest renormalized
+WEIGHTS = {"username": 0.5, "bio": 0.35, "display_name": 0.15}
+
+
+@dataclass
+class CrossMatch:
+    a: str  # "root" or the platform of one of A's profiles
+    b: str
+    username_a: str
+    username_b: str
+    score: float
+    evidence: Dict[str, float] = field(default_factory=dict)
+
+
+def _combine(username, bio, display, has_bio, has_name):
+    import numpy as np  # lazy import
+
+    w_sum = WEIGHTS["username"] + WEIGHTS["bio"] * has_bio + WEIGHTS["display_name"] * has_name
+    return (
+        WEIGHTS["username"] * username
+        + WEIGHTS["bio"] * np.where(has_bio, bio, 0.0)
+        + WEIGHTS["display_name"] * np.where(has_name, display, 0.0)
+    ) / w_sum
+
+
+@dataclass
+class ScoreMatrix:
+    """Every identity of A (root handle + profiles) scored against every identity of B.
+
+    Bio similarity is the expensive signal; built with `with_bio=False` it stays
+    None (and counts as 0 in `combined`) until fill_bio() is called.
+    """
+
+    rows: List[str]
+    cols: List[str]
+    handles_a: List[str]
+    handles_b: List[str]
+    bios_a: List[Optional[str]]
+    bios_b: List[Optional[str]]
+    username: "object"  # numpy arrays, rows x cols
+    display_name: "object"
+    has_bio: "object"
+    has_display_name: "object"
+    bio: "object" = None
+    combined: "object" = None
+    username_features: "object" = None  # rows x cols x len(FEATURES), see username_features()
+
+    def __post_init__(self):
+        import numpy as np  # lazy import
+
+        if self.combined is None:
+            self.combined = self._combined(self.bio)
+        self._upper = None
+        # Profile-vs-profile pairs on different platforms
+        rows = np.array([r != ROOT for r in self.rows])
+        cols = np.array([c != ROOT for c in self.cols])
+        same = np.array([[r == c for c in self.cols] for r in self.rows], dtype=bool)
+        self.cross_mask = np.outer(rows, cols) & ~same
+        # What top_matches may report: those plus a root handle against the other side's profiles
+        self.match_mask = self.cross_mask | np.outer(~rows, cols) | np.outer(rows, ~cols)
+
+    def _combined(self, bio):
+        import numpy as np  # lazy import
+
+        bio = np.zeros_like(self.username) if bio is None else bio
+        return _combine(self.username, bio, self.display_name, self.has_bio, self.has_display_name)
+
+    def fill_bio(self) -> None:
+        if self.bio is None:
+            self.bio = bio_similarity_matrix(self.bios_a, self.bios_b)
+            self.combined = self._combined(self.bio)
+
+    def combined_upper(self):
+        """`combined` with every unknown bio similarity taken as 1."""
+        import numpy as np  # lazy import
+
+        if self.bio is not None:
+            return self.combined
+        if self._upper is None:
+            self._upper = self._combined(np.ones_like(self.username))
+        return self._upper
+
+    def index(self, a: str, b: str) -> Optional[tuple]:
+        if a in self.rows and b in self.cols:
+            return self.rows.index(a), self.cols.index(b)
+        return None
+
+    def best_cross(self, upper: bool = False) -> float:
+        """Highest cross-platform pair score (with unknown bios taken as 1 when `upper`)."""
+        combined = self.combined_upper() if upper else self.combined
+        scores = combined[self.cross_mask]
+        return float(scores.max()) if scores.size else 0.0
+
+    def top_matches(self, k: int = 5, min_score: float = 0.0) -> List[CrossMatch]:
+        """Best cross-platform and root-vs-profile pairs, highest score first.
+
+        A handle pair reused across platforms is reported once, for its best-scoring
+        platforms.
+        """
+        import numpy as np  # lazy import
+
+        scores = np.where(self.match_mask, self.combined, -1.0)
+        # Ties go to profile pairs, which carry more evidence than a bare root handle
+        order = np.lexsort(((self.match_mask & ~self.cross_mask).ravel(), -scores.ravel()))
+        out: List[CrossMatch] = []
+        seen = set()
+        for flat in order:
+            i, j = divmod(int(flat), len(self.cols))
+            score = float(scores[i, j])
+            if len(out) >= k or score < min_score or score < 0:
+                break
+            pair = ((self.handles_a[i] or "").lower(), (self.handles_b[j] or "").lower())
+            if pair in seen:
+                continue
+            seen.add(pair)
+            evidence = {"username": round(float(self.username[i, j]), 4)}
+            if self.username_features is not None:
+                for flag in ("skeleton", "affix"):
+                    if self.username_features[i, j, FEATURES.index(flag)]:
+                        evidence[flag] = 1.0
+            if self.bio is not None and self.has_bio[i, j]:
+                evidence["bio"] = round(float(self.bio[i, j]), 4)
+            if self.has_display_name[i, j]:
+                evidence["display_name"] = round(float(self.display_name[i, j]), 4)
+            out.append(CrossMatch(self.rows[i], self.cols[j], self.handles_a[i], self.handles_b[j], round(score, 4), evidence))
+        return out
+
+
+def _identities(root: str, profiles: Dict[str, Profile]):
+    keys = [ROOT] + sorted(profiles)
+    handles = [root] + [profiles[k].username for k in keys[1:]]
+    bios = [None] + [profiles[k].bio for k in keys[1:]]
+    names = [None] + [profiles[k].display_name for k in keys[1:]]
+    return keys, handles, bios, names
+
+
+def _present(values: Sequence[Optional[str]]):
+    import numpy as np  # lazy import
+
+    return np.array([bool(v and v.strip()) for v in values])
+
+
+def score_matrix(user_a: str, user_b: str, profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile],
+                 with_bio: bool = True) -> ScoreMatrix:
+    """Score all of A's identities against all of B's in one batched pass per signal."""
+    import numpy as np  # lazy import
+
+    rows, handles_a, bios_a, names_a = _identities(user_a, profiles_a)
+    cols, handles_b, bios_b, names_b = _identities(user_b, profiles_b)
+    features = username_features(handles_a, handles_b)
+    m = ScoreMatrix(
+        rows, cols, handles_a, handles_b, bios_a, bios_b,
+        username=username_score(features),
+        display_name=username_similarity_matrix(names_a, names_b, token_sort=True),
+        has_bio=np.outer(_present(bios_a), _present(bios_b)),
+        has_display_name=np.outer(_present(names_a), _present(names_b)),
+        username_features=features,
+    )
+    if with_bio:
+        m.fill_bio()
+    return m
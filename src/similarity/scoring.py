@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.models.types import Profile
+from src.similarity.matrix import ROOT, CrossMatch, ScoreMatrix, score_matrix
+
+# Cross-platform pairs scoring at least this much are reported as matches
+CROSS_MATCH_MIN_SCORE = 0.5
+
+
+@dataclass
+class ComparisonScores:
+    platform_scores: Dict[str, float] = field(default_factory=dict)
+    overall_bio: float = 0.0
+    overall_username: float = 0.0
+    mutual_presence: float = 0.0
+    image_similarity: Optional[float] = None
+    impersonation_likelihood: float = 0.0
+    # Best pairs across different platforms (e.g. A on GitHub vs B on Instagram)
+    cross_matches: List[CrossMatch] = field(default_factory=list)
+
+
+def avatar_candidates(profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile],
+                       shared: List[str]) -> List[Tuple[str, str]]:
+    # Try image sim only across shared platforms first; fallback to main GH avatars
+    candidates = []
+    for platform in shared:
+        pa, pb = profiles_a[platform], profiles_b[platform]
+        if pa.avatar_url and pb.avatar_url:
+            candidates.append((pa.avatar_url, pb.avatar_url))
+    if not candidates:
+        ga, gb = profiles_a.get("github"), profiles_b.get("github")
+        if ga and gb and ga.avatar_url and gb.avatar_url:
+            candidates.append((ga.avatar_url, gb.avatar_url))
+    return candidates
+
+
+def likelihood(bio: float, username: float, presence: float, image: Optional[float], best_cross: float = 0.0) -> float:
+    """Impersonation likelihood (heuristic) from the overall signals."""
+    # 40% bio, 30% username, 20% mutual presence, 10% image similarity (if any)
+    value = 0.4 * bio + 0.3 * username + 0.2 * presence + 0.1 * (image or 0.0)
+    # A near-copy squatting another platform shares no platform with A, so presence-based
+    # terms miss it; let the best cross-platform match carry most of its own weight
+    if best_cross >= CROSS_MATCH_MIN_SCORE:
+        value = max(value, 0.8 * best_cross)
+    return max(0.0, min(1.0, value))
+
+
+def text_scores(user_a: str, user_b: str, profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile],
+                m: ScoreMatrix, with_matches: bool = True) -> ComparisonScores:
+    """Everything but the image score, from a score matrix (bio counts as 0 until it is filled)."""
+    scores = ComparisonScores()
+    bio_sims: List[float] = []
+    platforms = sorted(set(profiles_a) | set(profiles_b))
+    for platform in platforms:
+        ij = m.index(platform, platform)
+        if ij is not None:
+            user_sim = float(m.username[ij])
+            bio_sim = float(m.bio[ij]) if m.bio is not None else 0.0
+            # Weight usernames and bios
+            scores.platform_scores[platform] = (0.5 * user_sim) + (0.5 * bio_sim)
+            # Average bio similarity where both bios exist
+            if m.has_bio[ij]:
+                bio_sims.append(bio_sim)
+
+    # Lookalike handles already score 1.0 in the matrix (see username_features)
+    scores.overall_username = float(m.username[m.index(ROOT, ROOT)])
+    scores.overall_bio = sum(bio_sims) / len(bio_sims) if bio_sims else 0.0
+    scores.mutual_presence = len(scores.platform_scores) / len(platforms) if platforms else 0.0
+    if with_matches:
+        scores.cross_matches = m.top_matches(k=5, min_score=CROSS_MATCH_MIN_SCORE)
+    return scores
+
+
+def image_score(profiles_a: Dict[str, Profile], profiles_b: Dict[str, Profile], shared: List[str]) -> Optional[float]:
+    candidates = avatar_candidates(profiles_a, profiles_b, shared)
+    if not candidates:
+        return None
+    from src.similarity.image_similarity import image_similarity
+    return image_similarity(*candidates[0])
+
+
+def score_comparison(
+    user_a: str,
+    user_b: str,
+    profiles_a: Dict[str, Profile],
+    profiles_b: Dict[str, Profile],
+    with_images: bool = True,
+) -> ComparisonScores:
+    """Per-platform and overall similarity between two identities, shared by the API and the UI."""
+    m = score_matrix(user_a, user_b, profiles_a, profiles_b)
+    scores = text_scores(user_a, user_b, profiles_a, profiles_b, m)
+    if with_images:
+        scores.image_similarity = image_score(profiles_a, profiles_b, list(scores.platform_scores))
+    scores.impersonation_likelihood = likelihood(
+        scores.overall_bio, scores.overall_username, scores.mutual_presence, scores.image_similarity, m.best_cross()
+    )
+    return scores
@@ -1,41 +1,172 @@
+import hashlib
 import os
-from typing import Optional
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence
 from rapidfuzz import fuzz
 
+from src.utils.metrics import timed
+
 _ENABLE_EMB = os.getenv("ENABLE_EMBEDDINGS", "false").lower() == "true"
-_model = None
-
-def _get_model():
-    global _model
-    if _model is not None:
-        return _model
-    if not _ENABLE_EMB:
-        return None
-    try:
-        from sentence_transformers import SentenceTransformer
-        _model = SentenceTransformer('all-MiniLM-L6-v2')
-        return _model
-    except Exception:
-        return None
+# Bio similarity: "fuzzy" (partial_ratio), "ngram" (character n-gram cosine) or
+# "embeddings" (sentence-transformers); follows ENABLE_EMBEDDINGS when unset.
+# "tfidf" is the ngram tier's old name and still accepted.
+BIO_SIMILARITY_TIER = (os.getenv("BIO_SIMILARITY_TIER") or ("embeddings" if _ENABLE_EMB else "fuzzy")).lower()
+BIO_SIMILARITY_TIER = {"tfidf": "ngram"}.get(BIO_SIMILARITY_TIER, BIO_SIMILARITY_TIER)
+BIO_SIMILARITY_TIERS = ("fuzzy", "ngram", "embeddings")
+if BIO_SIMILARITY_TIER not in BIO_SIMILARITY_TIERS:
+    raise ValueError(f"BIO_SIMILARITY_TIER must be one of {', '.join(BIO_SIMILARITY_TIERS)}, not {BIO_SIMILARITY_TIER!r}")
+_NGRAM_RANGE = (2, 4)
+
+def warm_up(background: bool = True) -> None:
+    """Load the embedding model (or start its worker process) before the first request needs it."""
+    if BIO_SIMILARITY_TIER == "embeddings":
+        from src.similarity import embeddings
+        embeddings.warm_up(background=background)
+
+# Characters that render like a Latin letter (digits, Cyrillic, Greek), folded onto it. Applied
+# after casefolding; capital I is the one case-sensitive lookalike (of l) and is folded before that
+_UPPER_CONFUSABLES = str.maketrans({"I": "l"})
+_CONFUSABLES = str.maketrans({
+    "0": "o", "1": "l", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g", "|": "l",
+    "а": "a", "е": "e", "о": "o", "р": "p", "с": "c", "у": "y", "х": "x", "і": "i", "ј": "j", "һ": "h",
+    "ԁ": "d", "ѕ": "s", "ԛ": "q", "ԝ": "w", "ɡ": "g", "α": "a", "ο": "o", "ν": "v", "ρ": "p", "ι": "i",
+    "κ": "k", "τ": "t", "υ": "u", "χ": "x",
+})
+_MULTI_CONFUSABLES = (("rn", "m"), ("vv", "w"))
+_SEPARATORS_RE = re.compile(r"[\s._\-]+")
+
+def skeleton(handle: Optional[str]) -> str:
+    """Confusable skeleton: handles that look alike (0ctocat, оctocat, octo_cat, BILL/BlLL) share one."""
+    if not handle:
+        return ""
+    s = unicodedata.normalize("NFKC", handle).translate(_UPPER_CONFUSABLES).casefold()
+    s = _SEPARATORS_RE.sub("", s).translate(_CONFUSABLES)
+    for seq, repl in _MULTI_CONFUSABLES:
+        s = s.replace(seq, repl)
+    return s
 
 def compare_usernames(u1: Optional[str], u2: Optional[str]) -> float:
     if not u1 or not u2:
         return 0.0
     return fuzz.ratio(u1.lower(), u2.lower()) / 100.0
 
+@timed("bio_similarity")
 def bio_similarity(bio1: Optional[str], bio2: Optional[str]) -> float:
     if not bio1 or not bio2:
         return 0.0
-    model = _get_model()
-    if model:
-        try:
-            from sentence_transformers import util
-            emb1 = model.encode(bio1, convert_to_tensor=True)
-            emb2 = model.encode(bio2, convert_to_tensor=True)
-            score = float(util.cos_sim(emb1, emb2))
-            # cos_sim may produce >1e-6 float noise; clamp 0..1
+    if BIO_SIMILARITY_TIER == "embeddings":
+        from src.similarity import embeddings
+        vecs = embeddings.encode([bio1, bio2])
+        if vecs is not None:
+            score = float(vecs[0] @ vecs[1])
+            # normalized dot product may produce >1e-6 float noise; clamp 0..1
             return max(0.0, min(1.0, score))
-        except Exception:
-            pass
+    elif BIO_SIMILARITY_TIER == "ngram":
+        return float(_ngram_cosine([bio1], [bio2])[0, 0])
     # Fallback: fuzzy
     return fuzz.partial_ratio(bio1, bio2) / 100.0
+
+def _char_ngrams(text: str) -> Dict[str, int]:
+    """Character n-gram counts within space-padded words (scikit-learn's "char_wb" analyzer)."""
+    lo, hi = _NGRAM_RANGE
+    counts: Dict[str, int] = {}
+    for word in text.lower().split():
+        w = f" {word} "
+        for n in range(lo, hi + 1):
+            for i in range(len(w) - n + 1):
+                g = w[i:i + n]
+                counts[g] = counts.get(g, 0) + 1
+    return counts
+
+def _ngram_cosine(texts_a: Sequence[str], texts_b: Sequence[str]):
+    """len(a) x len(b) cosine similarity of sublinear-tf char n-gram vectors.
+
+    Deliberately not TF-IDF: document frequencies fitted on the batch would make a
+    pair's score depend on which other bios happen to be compared alongside it.
+    """
+    import numpy as np  # lazy import
+    from scipy import sparse
+
+    vocab: Dict[str, int] = {}
+    indices: List[int] = []
+    data: List[float] = []
+    indptr = [0]
+    for text in list(texts_a) + list(texts_b):
+        for g, c in _char_ngrams(text).items():
+            indices.append(vocab.setdefault(g, len(vocab)))
+            data.append(c)
+        indptr.append(len(indices))
+    docs = len(indptr) - 1
+    # Sublinear tf (1 + log count), L2-normalized per row
+    weights = np.log(np.asarray(data, dtype=np.float32)) + 1.0
+    rows = np.repeat(np.arange(docs), np.diff(indptr))
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=docs))
+    weights /= np.maximum(norms, 1e-12)[rows].astype(np.float32)
+    vecs = sparse.csr_matrix((weights, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+                             shape=(docs, max(1, len(vocab))))
+    # Rows are unit length, so the sparse Gram matrix holds the cosines; only A x B is kept
+    n = len(texts_a)
+    return np.clip((vecs @ vecs.T).toarray()[:n, n:], 0.0, 1.0)
+
+def _pairwise(a: Sequence[Optional[str]], b: Sequence[Optional[str]], scorer, processor=None):
+    """rows x cols rapidfuzz scores in 0..1, zero wherever either side is empty."""
+    import numpy as np  # lazy import
+    from rapidfuzz import process
+
+    out = np.zeros((len(a), len(b)), dtype=np.float32)
+    ia = [i for i, t in enumerate(a) if t]
+    ib = [j for j, t in enumerate(b) if t]
+    if ia and ib:
+        scores = process.cdist([a[i] for i in ia], [b[j] for j in ib], scorer=scorer, processor=processor,
+                               dtype=np.float32)
+        out[np.ix_(ia, ib)] = scores / 100.0
+    return out
+
+def username_similarity_matrix(a: Sequence[Optional[str]], b: Sequence[Optional[str]], token_sort: bool = False):
+    """compare_usernames for every pair of two lists (token_sort for display names)."""
+    from rapidfuzz import utils
+
+    if token_sort:
+        return _pairwise(a, b, fuzz.token_sort_ratio, processor=utils.default_process)
+    return _pairwise(a, b, fuzz.ratio, processor=str.lower)
+
+@timed("bio_similarity_matrix")
+def bio_similarity_matrix(bios_a: Sequence[Optional[str]], bios_b: Sequence[Optional[str]]):
+    """bio_similarity for every pair of two lists, with one embedding or n-gram batch for all bios."""
+    import numpy as np  # lazy import
+
+    if BIO_SIMILARITY_TIER in ("embeddings", "ngram"):
+        ia = [i for i, t in enumerate(bios_a) if t]
+        ib = [j for j, t in enumerate(bios_b) if t]
+        out = np.zeros((len(bios_a), len(bios_b)), dtype=np.float32)
+        if not ia or not ib:
+            return out
+        texts_a, texts_b = [bios_a[i] for i in ia], [bios_b[j] for j in ib]
+        if BIO_SIMILARITY_TIER == "embeddings":
+            from src.similarity import embeddings
+            vecs = embeddings.encode(texts_a + texts_b)
+            sims = None if vecs is None else np.clip(vecs[:len(ia)] @ vecs[len(ia):].T, 0.0, 1.0)
+        else:
+            sims = _ngram_cosine(texts_a, texts_b)
+        if sims is not None:
+            out[np.ix_(ia, ib)] = sims
+            return out
+    return _pairwise(bios_a, bios_b, fuzz.partial_ratio)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def simhash64(text: Optional[str]) -> int:
+    """64-bit SimHash over word unigrams and bigrams; near-duplicate texts differ in few bits."""
+    if not text:
+        return 0
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return 0
+    import numpy as np  # lazy import
+
+    digests = b"".join(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest() for f in features)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+    majority = bits.sum(axis=0) * 2 > len(features)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
@@ -0,0 +1,133 @@
+import re
+from typing import Dict, Optional, Sequence
+
+from src.similarity.text_similarity import skeleton
+
+# Feature order along the last axis of username_features()
+FEATURES = ("ratio", "jaro_winkler", "token_set", "partial", "keyboard", "affix", "skeleton")
+
+# Weights of the features in username_score(); a skeleton match acts as a floor
+WEIGHTS = {"ratio": 0.25, "jaro_winkler": 0.2, "token_set": 0.15, "partial": 0.1, "keyboard": 0.15, "affix": 0.15}
+# "alice" vs "alice_official" / "realalice" / "alice99": one handle is the other plus a known
+# affix (digits and separators included), or the shared stem is long and most of the longer handle
+KNOWN_AFFIXES = frozenset({"real", "official", "the", "its", "iam", "im", "hq", "team", "dev", "app", "tv"})
+_MIN_AFFIX_STEM = 3
+_MIN_BARE_STEM = 5
+_AFFIX_NOISE_RE = re.compile(r"[\d._\-]+")
+# Only near pairs (few edits) get the per-pair keyboard pass; the rest use plain Levenshtein
+_KEYBOARD_MAX_EDITS = 2
+_SUBSTITUTE_ADJACENT = 0.5
+# Below this many pairs, starting cdist worker threads costs more than it saves
+_PARALLEL_MIN_PAIRS = 2500
+
+_SEPARATORS_RE = re.compile(r"[._\-]+")
+_KEYBOARD_ROWS = ("1234567890", "qwertyuiop", "asdfghjkl", "zxcvbnm")
+
+
+def _keyboard_neighbours() -> Dict[str, frozenset]:
+    pos = {ch: (r, c) for r, row in enumerate(_KEYBOARD_ROWS) for c, ch in enumerate(row)}
+    return {
+        ch: frozenset(o for o, (r2, c2) in pos.items() if o != ch and abs(r - r2) <= 1 and abs(c - c2) <= 1)
+        for ch, (r, c) in pos.items()
+    }
+
+
+_NEIGHBOURS = _keyboard_neighbours()
+
+
+def keyboard_distance(a: str, b: str) -> float:
+    """Levenshtein distance where swapping a key for an adjacent one costs half an edit."""
+    from rapidfuzz.distance import Levenshtein
+
+    ops = Levenshtein.editops(a, b).as_list()
+    adjacent = sum(1 for tag, i, j in ops if tag == "replace" and b[j] in _NEIGHBOURS.get(a[i], ()))
+    return len(ops) - (1.0 - _SUBSTITUTE_ADJACENT) * adjacent
+
+
+def is_affixed(stem: str, handle: str) -> bool:
+    """Whether `handle` is `stem` plus a prefix or suffix that marks the same person."""
+    if len(stem) < _MIN_AFFIX_STEM or len(handle) <= len(stem):
+        return False
+    extras = [handle[len(stem):] if handle.startswith(stem) else None,
+              handle[:-len(stem)] if handle.endswith(stem) else None]
+    for extra in extras:
+        if extra is None:
+            continue
+        if _AFFIX_NOISE_RE.sub("", extra) in KNOWN_AFFIXES | {""}:
+            return True
+        if len(stem) >= _MIN_BARE_STEM and len(stem) * 2 > len(handle):
+            return True
+    return False
+
+
+def username_features(a: Sequence[Optional[str]], b: Sequence[Optional[str]], workers: int = -1):
+    """rows x cols x len(FEATURES) float32 array of similarity signals in 0..1.
+
+    Every graded metric is one rapidfuzz.process.cdist call over the whole batch
+    (on `workers` threads once the batch is big enough); only pairs within a couple
+    of edits get the Python keyboard-adjacency pass. Empty handles score 0 on everything.
+    """
+    import numpy as np  # lazy import
+    from rapidfuzz import fuzz, process
+    from rapidfuzz.distance import JaroWinkler, Levenshtein, Postfix, Prefix
+
+    out = np.zeros((len(a), len(b), len(FEATURES)), dtype=np.float32)
+    ia = [i for i, t in enumerate(a) if t]
+    ib = [j for j, t in enumerate(b) if t]
+    if not ia or not ib:
+        return out
+    la = [a[i].lower() for i in ia]
+    lb = [b[j].lower() for j in ib]
+    if len(la) * len(lb) < _PARALLEL_MIN_PAIRS:
+        workers = 1
+
+    def cdist(x, y, scorer, dtype=np.float32):
+        return process.cdist(x, y, scorer=scorer, dtype=dtype, workers=workers)
+
+    ratio = cdist(la, lb, fuzz.ratio) / 100.0
+    jaro = cdist(la, lb, JaroWinkler.normalized_similarity)
+    tokens = cdist([_SEPARATORS_RE.sub(" ", s) for s in la], [_SEPARATORS_RE.sub(" ", s) for s in lb],
+                   fuzz.token_set_ratio) / 100.0
+    partial = cdist(la, lb, fuzz.partial_ratio) / 100.0
+
+    lev = cdist(la, lb, Levenshtein.distance, dtype=np.int32)
+    len_a = np.array([len(s) for s in la])[:, None]
+    len_b = np.array([len(s) for s in lb])[None, :]
+    keyboard = lev.astype(np.float32)
+    for i, j in np.argwhere((lev > 0) & (lev <= _KEYBOARD_MAX_EDITS)).tolist():
+        keyboard[i, j] = keyboard_distance(la[i], lb[j])
+    keyboard = 1.0 - keyboard / np.maximum(len_a, len_b)
+
+    # Skeletons see the original case: capital I looks like l, lowercase i does not
+    sa = np.array([skeleton(a[i]) for i in ia], dtype=object)
+    sb = np.array([skeleton(b[j]) for j in ib], dtype=object)
+    same = sa[:, None] == sb[None, :]
+
+    # One handle is the other with something bolted on the front or back; the batch
+    # prefix/suffix lengths pick the few candidate pairs, is_affixed() judges the extra part.
+    # A stray separator ("octocat_") is a lookalike, not an affix.
+    ca = [_SEPARATORS_RE.sub("", s) for s in la]
+    cb = [_SEPARATORS_RE.sub("", s) for s in lb]
+    shorter = np.minimum(np.array([len(s) for s in ca])[:, None], np.array([len(s) for s in cb])[None, :])
+    prefix = cdist(ca, cb, Prefix.similarity, dtype=np.int32)
+    suffix = cdist(ca, cb, Postfix.similarity, dtype=np.int32)
+    affix = np.zeros_like(same)
+    for i, j in np.argwhere(~same & (shorter >= _MIN_AFFIX_STEM) & ((prefix == shorter) | (suffix == shorter))).tolist():
+        x, y = ca[i], cb[j]
+        affix[i, j] = is_affixed(x, y) if len(x) < len(y) else is_affixed(y, x)
+
+    f = np.stack([ratio, jaro, tokens, partial, keyboard, affix, same], axis=-1).astype(np.float32, copy=False)
+    if len(la) == len(a) and len(lb) == len(b):
+        return f
+    out[np.ix_(ia, ib)] = f
+    return out
+
+
+def username_score(features):
+    """Combine username_features() into one 0..1 score per pair."""
+    import numpy as np  # lazy import
+
+    graded = sum(w * features[..., FEATURES.index(name)] for name, w in WEIGHTS.items())
+    # Same skeleton means the handles look identical
+    floor = np.where(features[..., FEATURES.index("skeleton")] > 0, 1.0, 0.0)
+    return np.maximum(graded, floor).astype(np.float32)
@@ -0,0 +1,222 @@
+import atexit
+import hashlib
+import math
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, saves are last-writer-wins
+    fcntl = None
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (~1.8 bytes per entry at a 0.1% false-positive rate)."""
+
+    _HEADER = struct.Struct("<4sIIQd")  # magic, k, n entries, m bits, created
+    _MAGIC = b"BLM1"
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, *, m: Optional[int] = None,
+                 k: Optional[int] = None, created: Optional[float] = None):
+        self.capacity = capacity
+        self.m = m or max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.k = k or max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.count = 0
+        self.created = created or time.time()
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        d = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(d[:8], "little")
+        h2 = int.from_bytes(d[8:], "little") | 1
+        m = self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def add(self, item: str) -> None:
+        for p in self._positions(item):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def union(self, other: "BloomFilter") -> None:
+        """Add every item of `other` (same m and k). The count becomes an estimate from the set bits,
+        so merging a filter that shares items with this one doesn't double count them."""
+        if (other.m, other.k) != (self.m, self.k):
+            raise ValueError("bloom filters differ in size")
+        merged = int.from_bytes(self.bits, "little") | int.from_bytes(other.bits, "little")
+        self.bits[:] = merged.to_bytes(len(self.bits), "little")
+        filled = min(merged.bit_count(), self.m - 1)
+        self.count = max(self.count, other.count, round(-self.m / self.k * math.log(1 - filled / self.m)))
+        self.created = min(self.created, other.created)
+
+    def to_bytes(self) -> bytes:
+        return self._HEADER.pack(self._MAGIC, self.k, self.count, self.m, self.created) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int) -> "BloomFilter":
+        magic, k, count, m, created = cls._HEADER.unpack_from(data)
+        if magic != cls._MAGIC:
+            raise ValueError("not a bloom filter")
+        bf = cls(capacity, m=m, k=k, created=created)
+        body = data[cls._HEADER.size:]
+        if len(body) != len(bf.bits):
+            raise ValueError("truncated bloom filter")
+        bf.bits[:] = body
+        bf.count = count
+        return bf
+
+
+class NegativeIndex:
+    """Handles recently confirmed absent on one platform.
+
+    Two Bloom generations rotate when the current one fills up or gets older than
+    `ttl`, so entries expire after one to two TTLs without needing deletion. With
+    a `path`, both generations are persisted (atomically) and reloaded on start.
+    Worker processes sharing a path merge what is on disk into their own filters
+    before each save, so no process's negatives overwrite another's.
+    """
+
+    def __init__(self, capacity: int, ttl: float, error_rate: float = 0.001, path: Optional[str] = None,
+                 save_interval: float = 30.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.error_rate = error_rate
+        self.path = path
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous: Optional[BloomFilter] = None
+        self._dirty = False
+        self._last_save = time.monotonic()
+        if path and os.path.exists(path):
+            try:
+                gens = self._read()
+            except (OSError, ValueError, struct.error):
+                gens = []
+            if gens:
+                self._current = gens[0]
+                self._previous = gens[1] if len(gens) > 1 else None
+
+    def _rotate_if_needed(self) -> None:
+        now = time.time()
+        if self._previous is not None and now - self._previous.created > 2 * self.ttl:
+            self._previous = None
+        if self._current.count >= self.capacity or now - self._current.created > self.ttl:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._dirty = True
+
+    def __contains__(self, handle: str) -> bool:
+        key = handle.lower()
+        with self._lock:
+            self._rotate_if_needed()
+            return key in self._current or (self._previous is not None and key in self._previous)
+
+    def add(self, handle: str) -> None:
+        with self._lock:
+            self._rotate_if_needed()
+            self._current.add(handle.lower())
+            self._dirty = True
+            if self.path and time.monotonic() - self._last_save > self.save_interval:
+                self._save_locked()
+
+    def save(self) -> None:
+        with self._lock:
+            if self.path and self._dirty:
+                self._save_locked()
+
+    def _save_locked(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with _file_lock(self.path):
+            self._merge_from_disk()
+            gens = [self._current] + ([self._previous] if self._previous is not None else [])
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(struct.pack("<B", len(gens)))
+                for g in gens:
+                    blob = g.to_bytes()
+                    f.write(struct.pack("<Q", len(blob)))
+                    f.write(blob)
+            os.replace(tmp, self.path)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def _merge_from_disk(self) -> None:
+        """OR the generations another process saved into ours (caller holds the file lock)."""
+        try:
+            gens = self._read() if os.path.exists(self.path) else []
+        except (OSError, ValueError, struct.error):
+            return
+        now = time.time()
+        for g in gens:
+            if now - g.created > 2 * self.ttl or (g.m, g.k) != (self._current.m, self._current.k):
+                continue
+            # Generations started before our current one hold older entries: they belong with our previous
+            if g.created < self._current.created and self._previous is not None:
+                self._previous.union(g)
+            elif g.created < self._current.created and now - g.created > self.ttl:
+                self._previous = g
+            else:
+                self._current.union(g)
+
+    def _read(self) -> List[BloomFilter]:
+        with open(self.path, "rb") as f:
+            data = f.read()
+        (n,) = struct.unpack_from("<B", data)
+        offset = 1
+        gens = []
+        for _ in range(n):
+            (size,) = struct.unpack_from("<Q", data, offset)
+            offset += 8
+            gens.append(BloomFilter.from_bytes(data[offset:offset + size], self.capacity))
+            offset += size
+        return gens
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    with open(f"{path}.lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+NEGATIVE_INDEX_ENABLED = os.getenv("NEGATIVE_INDEX", "true").lower() == "true"
+# Where per-platform filters are persisted; empty keeps them in memory only
+NEGATIVE_INDEX_DIR = os.getenv("NEGATIVE_INDEX_DIR", "")
+NEGATIVE_INDEX_CAPACITY = int(os.getenv("NEGATIVE_INDEX_CAPACITY", "1000000"))
+NEGATIVE_INDEX_TTL = float(os.getenv("NEGATIVE_INDEX_TTL", str(24 * 3600)))
+
+_indexes: Dict[str, NegativeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def negative_index(platform: str) -> Optional[NegativeIndex]:
+    if not NEGATIVE_INDEX_ENABLED:
+        return None
+    idx = _indexes.get(platform)
+    if idx is None:
+        with _indexes_lock:
+            idx = _indexes.get(platform)
+            if idx is None:
+                path = os.path.join(NEGATIVE_INDEX_DIR, f"{platform}.bloom") if NEGATIVE_INDEX_DIR else None
+                idx = _indexes[platform] = NegativeIndex(NEGATIVE_INDEX_CAPACITY, NEGATIVE_INDEX_TTL, path=path)
+    return idx
+
+
+@atexit.register
+def save_all() -> None:
+    for idx in list(_indexes.values()):
+        idx.save()
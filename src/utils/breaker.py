@@ -0,0 +1,105 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from src.utils import metrics
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Consecutive failed lookups before a platform is skipped
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES") or "5")
+# How long an open breaker skips the platform before letting trial lookups through
+BREAKER_COOLDOWN_S = float(os.getenv("BREAKER_COOLDOWN_S") or "30")
+# Concurrent trial lookups allowed while half-open
+BREAKER_HALF_OPEN_TRIALS = int(os.getenv("BREAKER_HALF_OPEN_TRIALS") or "1")
+
+BREAKER_STATE = metrics.gauge("memap_breaker_state", "Circuit breaker state per platform (0 closed, 1 half-open, 2 open)", ("platform",))
+BREAKER_TRANSITIONS = metrics.counter("memap_breaker_transitions_total", "Circuit breaker state changes", ("platform", "state"))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed/open."""
+
+    def __init__(self, name: str, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN_S,
+                 half_open_trials: int = BREAKER_HALF_OPEN_TRIALS):
+        self.name = name
+        self.failures = failures
+        self.cooldown = cooldown
+        self.half_open_trials = half_open_trials
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(name, value=0)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        BREAKER_STATE.set(self.name, value=_STATE_VALUE[state])
+        BREAKER_TRANSITIONS.inc(self.name, state)
+
+    def current_state(self) -> str:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self.state
+
+    def allow(self) -> bool:
+        """Whether a lookup may go out now; every allowed call must report success or failure."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._transition(HALF_OPEN)
+                self._trials = 0
+            if self._trials >= self.half_open_trials:
+                return False
+            self._trials += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                self._transition(CLOSED)
+
+    def release(self) -> None:
+        """An allowed call that said nothing about platform health (e.g. not configured)."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if error is not None:
+                self.last_error = f"{type(error).__name__}: {error}"[:200]
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failures):
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "state": self.current_state(),
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(platform: str) -> CircuitBreaker:
+    cb = _breakers.get(platform)
+    if cb is None:
+        with _breakers_lock:
+            cb = _breakers.get(platform)
+            if cb is None:
+                cb = _breakers[platform] = CircuitBreaker(platform)
+    return cb
@@ -1,5 +1,13 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Callable, Any, Dict, Tuple
+from typing import Callable, Any, Dict, Hashable, Optional, Tuple
+
+from src.utils.metrics import CACHE_HITS, CACHE_MISSES
 
 def memoize(func: Callable[..., Any]) -> Callable[..., Any]:
     cache: Dict[Tuple, Any] = {}
@@ -14,3 +22,231 @@ def memoize(func: Callable[..., Any]) -> Callable[..., Any]:
         return result
 
     return wrapper
+
+
+class LRUCache:
+    """Thread-safe bounded cache with optional per-entry TTL (seconds).
+
+    Named caches report hits/misses to the metrics registry.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] and item[0] < time.monotonic():
+                del self._data[key]
+                item = None
+            if item is not None:
+                self._data.move_to_end(key)
+        if self.name:
+            (CACHE_HITS if item is not None else CACHE_MISSES).inc(self.name)
+        return default if item is None else item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_MISSING = object()
+
+
+class SQLiteCache:
+    """Cache in a SQLite file in WAL mode, shared by every process on the host.
+
+    Values are pickled. Each thread keeps its own connection; readers never block
+    the writer under WAL. Errors (locked or corrupt file) degrade to misses.
+    """
+
+    _SWEEP_EVERY = 256
+
+    def __init__(self, path: str, namespace: str, maxsize: int = 10000, ttl: Optional[float] = None):
+        self.path = path
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "ns TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires REAL NOT NULL, "
+            "written REAL NOT NULL DEFAULT 0, PRIMARY KEY (ns, key)) WITHOUT ROWID"
+        )
+        try:
+            # Files created before rows carried their write time
+            conn.execute("ALTER TABLE entries ADD COLUMN written REAL NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (ns, expires)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_written ON entries (ns, written)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires FROM entries WHERE ns = ? AND key = ?", (self.namespace, repr(key))
+            ).fetchone()
+        except sqlite3.Error:
+            return default
+        # Wall clock, since expiry times are shared between processes
+        if row is None or (row[1] and row[1] < time.time()):
+            return default
+        try:
+            return pickle.loads(row[0])
+        except Exception:
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        expires = now + self.ttl if self.ttl else 0.0
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (ns, key, value, expires, written) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, repr(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires, now),
+            )
+            with self._writes_lock:
+                self._writes += 1
+                sweep = self._writes % self._SWEEP_EVERY == 0
+            if sweep:
+                self._sweep(conn)
+        except sqlite3.Error:
+            pass
+
+    def _sweep(self, conn: sqlite3.Connection) -> None:
+        # Drop expired rows, then the least recently written beyond maxsize; rows
+        # without a TTL only go once no row with one is left to evict
+        conn.execute("DELETE FROM entries WHERE ns = ? AND expires > 0 AND expires < ?", (self.namespace, time.time()))
+        conn.execute(
+            "DELETE FROM entries WHERE ns = ? AND key IN (SELECT key FROM entries WHERE ns = ? "
+            "ORDER BY expires = 0, written LIMIT max(0, (SELECT count(*) FROM entries WHERE ns = ?) - ?))",
+            (self.namespace, self.namespace, self.namespace, self.maxsize),
+        )
+
+    def clear(self) -> None:
+        try:
+            self._conn().execute("DELETE FROM entries WHERE ns = ?", (self.namespace,))
+        except sqlite3.Error:
+            pass
+
+
+class RedisCache:
+    """Cache in Redis (or any server speaking its protocol); eviction is left to the server."""
+
+    def __init__(self, url: str, namespace: str, ttl: Optional[float] = None):
+        import redis  # lazy import: optional dependency
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._client.ping()  # fail now (and fall back to memory) rather than on every lookup
+        self._prefix = f"memap:{namespace}:"
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = self._client.get(self._prefix + repr(key))
+            return default if raw is None else pickle.loads(raw)
+        except Exception:
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        try:
+            px = int(self.ttl * 1000) if self.ttl else None
+            self._client.set(self._prefix + repr(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=px)
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        try:
+            for k in self._client.scan_iter(self._prefix + "*"):
+                self._client.delete(k)
+        except Exception:
+            pass
+
+
+class TieredCache:
+    """A per-process LRUCache in front of a shared backend.
+
+    Hot keys are served from memory; misses fall through to the shared store, so
+    a value computed by one worker process is a hit in all the others.
+    """
+
+    def __init__(self, local: LRUCache, shared: Any, name: Optional[str] = None):
+        self.local = local
+        self.shared = shared
+        self.name = name
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING)
+            if value is not _MISSING:
+                self.local.set(key, value)
+        if self.name:
+            (CACHE_HITS if value is not _MISSING else CACHE_MISSES).inc(self.name)
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.local.set(key, value)
+        self.shared.set(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+
+# "memory" (per process), "sqlite" (one WAL file shared by all workers on the host) or "redis"
+CACHE_BACKEND = (os.getenv("CACHE_BACKEND") or "memory").lower()
+CACHE_PATH = os.getenv("CACHE_PATH") or os.path.join(".cache", "memap.sqlite3")
+REDIS_URL = os.getenv("REDIS_URL") or "redis://localhost:6379/0"
+# Entries per cache kept in each process in front of the shared backend
+CACHE_LOCAL_SIZE = int(os.getenv("CACHE_LOCAL_SIZE") or "256")
+
+
+def get_cache(name: str, maxsize: int = 256, ttl: Optional[float] = None):
+    """Named cache on the configured backend; falls back to memory if it can't be opened."""
+    if CACHE_BACKEND in ("sqlite", "redis"):
+        try:
+            if CACHE_BACKEND == "sqlite":
+                shared: Any = SQLiteCache(CACHE_PATH, name, maxsize=maxsize, ttl=ttl)
+            else:
+                shared = RedisCache(REDIS_URL, name, ttl=ttl)
+            return TieredCache(LRUCache(min(maxsize, CACHE_LOCAL_SIZE), ttl=ttl), shared, name=name)
+        except Exception:
+            pass
+    return LRUCache(maxsize=maxsize, ttl=ttl, name=name)
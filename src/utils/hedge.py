@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from src.utils import metrics, profiling
+
+T = TypeVar("T")
+
+# Platforms whose lookups get a duplicate request once their p95 has elapsed; empty disables hedging
+HEDGE_PLATFORMS = {p.strip() for p in (os.getenv("HEDGE_PLATFORMS") or "").split(",") if p.strip()}
+# Overall budget for a request's platform lookups; stragglers are reported as incomplete
+FETCH_DEADLINE_S = float(os.getenv("FETCH_DEADLINE_S") or "8")
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS") or "32")
+# p95 is only trusted once a platform has this many samples
+_MIN_SAMPLES = 20
+_WINDOW = 200
+
+HEDGES = metrics.counter("memap_hedged_requests_total", "Duplicate lookups issued after the p95 elapsed", ("platform",))
+HEDGE_WINS = metrics.counter("memap_hedge_wins_total", "Hedged lookups where the duplicate answered first", ("platform",))
+DEADLINE_MISSES = metrics.counter("memap_deadline_misses_total", "Lookups still running when the request deadline hit", ("platform",))
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per key."""
+
+    def __init__(self, window: int = _WINDOW, min_samples: int = _MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: str, seconds: float) -> None:
+        with self._lock:
+            q = self._samples.get(key)
+            if q is None:
+                q = self._samples[key] = deque(maxlen=self.window)
+            q.append(seconds)
+
+    def quantile(self, key: str, q: float = 0.95) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class Hedger:
+    """Runs lookups on a shared pool; `call` races a duplicate against slow attempts."""
+
+    def __init__(self, max_workers: int = FETCH_WORKERS, tracker: Optional[LatencyTracker] = None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="memap-fetch")
+        # Hedged attempts run on their own pool: `call` blocks on them from the fetch pool's threads
+        self._attempts = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="memap-hedge")
+        self.tracker = tracker or LatencyTracker()
+
+    def _timed(self, key: str, fn: Callable[..., T], *args) -> T:
+        start = time.perf_counter()
+        result = fn(*args)
+        self.tracker.observe(key, time.perf_counter() - start)
+        return result
+
+    def submit(self, fn: Callable[..., T], *args) -> "Future[T]":
+        return self._pool.submit(profiling.worker(fn), *args)
+
+    def call(self, key: str, fn: Callable[..., T], *args, hedge: bool = False) -> T:
+        """`fn(*args)`, timed into `key`'s p95; with `hedge`, a duplicate races it once that p95 passes.
+
+        One logical call gives one outcome: the first copy to succeed, or the first
+        failure once no other copy can still succeed.
+        """
+        delay = self.tracker.quantile(key) if hedge else None
+        if delay is None:
+            return self._timed(key, fn, *args)
+        first = self._attempts.submit(profiling.worker(self._timed), key, fn, *args)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        HEDGES.inc(key)
+        second = self._attempts.submit(profiling.worker(self._timed), key, fn, *args)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    for other in pending:
+                        other.cancel()  # still queued: don't spend the request; running: feeds the p95
+                    if fut is second:
+                        HEDGE_WINS.inc(key)
+                    return fut.result()
+                error = error or fut.exception()
+        raise error
+
+
+_hedger: Optional[Hedger] = None
+_hedger_lock = threading.Lock()
+
+
+def get_hedger() -> Hedger:
+    global _hedger
+    if _hedger is None:
+        with _hedger_lock:
+            if _hedger is None:
+                _hedger = Hedger()
+    return _hedger
+
+
+def gather(calls: Sequence[Tuple[str, Callable[..., T], tuple]], deadline: Deadline) -> Tuple[List[Optional[T]], List[str]]:
+    """Run `(platform, fn, args)` calls concurrently until `deadline`.
+
+    Returns results in call order (None for calls that missed the deadline) and the
+    sorted platforms that missed it. Missed calls still queued are cancelled so they
+    don't spend quota or workers on an answer nobody reads; ones already running
+    finish in the background so their latency still feeds the p95. Hedging happens
+    inside each call (see platform_fetcher), below its cache and circuit breaker.
+    """
+    hedger = get_hedger()
+    futures = [hedger.submit(fn, *args) for _key, fn, args in calls]
+    done, _ = wait(futures, timeout=deadline.remaining())
+    results: List[Optional[T]] = []
+    missed = set()
+    for (key, _fn, _args), fut in zip(calls, futures):
+        if fut in done and fut.exception() is None:
+            results.append(fut.result())
+        else:
+            if fut not in done:
+                fut.cancel()  # no-op once running
+                DEADLINE_MISSES.inc(key)
+                missed.add(key)
+            results.append(None)
+    return results, sorted(missed)
@@ -0,0 +1,185 @@
+import base64
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlencode, urlsplit, parse_qsl
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.metrics import RATE_LIMITED
+
+# Record/replay: HTTP_CASSETTE=path/to/cassette.jsonl, HTTP_CASSETTE_MODE=record|replay
+_CASSETTE_PATH = os.getenv("HTTP_CASSETTE")
+_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "").lower()
+
+# Query parameters that carry credentials and must not end up in cassettes
+_SECRET_PARAMS = {"key", "access_token", "client_secret"}
+# Response headers and JSON body fields likewise kept out of (or blanked in) cassettes
+_SECRET_HEADERS = {"set-cookie", "authorization", "proxy-authorization", "www-authenticate"}
+_SECRET_FIELDS = {"access_token", "refresh_token", "id_token", "token", "client_secret", "password"}
+_REDACTED = "REDACTED"
+
+# Platform the current call is made for; labels RATE_LIMITED. Hostnames can't: stubbed
+# platforms all share one host, and praw / CSE talk to several hosts each.
+_platform: ContextVar[str] = ContextVar("memap_http_platform", default="other")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode when no recorded response matches a request."""
+
+
+def _cassette_key(method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query) + list((params or {}).items())
+    query = sorted((k, str(v)) for k, v in query if k not in _SECRET_PARAMS)
+    return f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+
+
+@contextmanager
+def for_platform(platform: str) -> Iterator[None]:
+    """Attribute requests made inside the block to `platform` in metrics."""
+    token = _platform.set(platform)
+    try:
+        yield
+    finally:
+        _platform.reset(token)
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _REDACTED if k in _SECRET_FIELDS else _redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+def _redact_body(body: bytes, headers: Dict[str, str]) -> bytes:
+    """JSON response body with credential fields (OAuth tokens and the like) blanked."""
+    ctype = next((v for k, v in headers.items() if k.lower() == "content-type"), "")
+    if "json" not in ctype.lower():
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    redacted = _redact(data)
+    return body if redacted == data else json.dumps(redacted).encode("utf-8")
+
+
+def _note_rate_limit(r: requests.Response) -> None:
+    remaining = r.headers.get("X-RateLimit-Remaining") or r.headers.get("x-rate-limit-remaining")
+    if r.status_code == 429 or (r.status_code == 403 and remaining == "0"):
+        RATE_LIMITED.inc(_platform.get())
+
+
+class CassetteSession(requests.Session):
+    """requests.Session that can record responses to, or replay them from, a JSONL cassette."""
+
+    def __init__(self, path: Optional[str] = None, mode: str = ""):
+        super().__init__()
+        self.cassette_path = path
+        self.mode = mode if path else ""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[int, Dict[str, str], bytes]] = {}
+        if self.mode == "replay" or (self.mode == "record" and path and os.path.exists(path)):
+            self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.cassette_path):
+            return
+        with open(self.cassette_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    e = json.loads(line)
+                    self._entries[e["key"]] = (e["status"], e["headers"], base64.b64decode(e["body"]))
+
+    def request(self, method, url, params=None, **kwargs):  # type: ignore[override]
+        if not self.mode:
+            r = super().request(method, url, params=params, **kwargs)
+            _note_rate_limit(r)
+            return r
+        key = _cassette_key(method, url, params)
+        if self.mode == "replay":
+            entry = self._entries.get(key)
+            if entry is None:
+                raise CassetteMiss(f"no cassette entry for {key}")
+            status, headers, body = entry
+            r = requests.Response()
+            r.status_code = status
+            r.headers = CaseInsensitiveDict(headers)
+            r._content = body
+            r.url = url
+            r.encoding = "utf-8"
+            _note_rate_limit(r)
+            return r
+
+        r = super().request(method, url, params=params, **kwargs)
+        _note_rate_limit(r)
+        headers = {k: v for k, v in r.headers.items()
+                   if k.lower() not in _SECRET_HEADERS | {"content-encoding", "transfer-encoding"}}
+        body = _redact_body(r.content, headers)
+        with self._lock:
+            self._entries[key] = (r.status_code, headers, body)
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "key": key,
+                    "status": r.status_code,
+                    "headers": headers,
+                    "body": base64.b64encode(body).decode("ascii"),
+                }) + "\n")
+        return r
+
+    def fork(self) -> "CassetteSession":
+        """A session with its own headers and cookies on the same cassette and connection pool.
+
+        For clients (praw) that set session-wide headers such as User-Agent, which must
+        not leak into every other platform's requests.
+        """
+        s = CassetteSession()
+        s.cassette_path, s.mode = self.cassette_path, self.mode
+        s._lock, s._entries = self._lock, self._entries
+        for prefix, adapter in self.adapters.items():
+            s.mount(prefix, adapter)
+        return s
+
+
+class GoogleHttp:
+    """httplib2.Http stand-in that sends googleapiclient requests through a CassetteSession.
+
+    Lets Google CSE calls be recorded and replayed like every other client's.
+    """
+
+    def __init__(self, session: CassetteSession, timeout: float = 15):
+        self.session = session
+        self.timeout = timeout
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        import httplib2  # lazy import
+
+        r = self.session.request(method, uri, data=body, headers=headers, timeout=self.timeout,
+                                 allow_redirects=redirections > 0)
+        info = {k.lower(): v for k, v in r.headers.items()}
+        info["status"] = str(r.status_code)
+        return httplib2.Response(info), r.content
+
+
+def _build_session() -> CassetteSession:
+    s = CassetteSession(_CASSETTE_PATH, _CASSETTE_MODE)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+# One pooled session shared by every platform client (praw gets a fork(), see reddit_client)
+session = _build_session()
+
+
+def get(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+        timeout: float = 15) -> requests.Response:
+    return session.get(url, params=params, headers=headers, timeout=timeout)
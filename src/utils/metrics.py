@@ -0,0 +1,170 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Seconds; covers in-process scoring (ms) up to slow platform fetches (tens of s)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    # Exposition format: label values escape backslash, double quote and newline
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labelnames, k)} {v:g}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    def _samples(self) -> List[str]:
+        out = []
+        for labels, row in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, c in zip(self.buckets + (float("inf"),), row):
+                cumulative += c
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _fmt_labels(self.labelnames, labels, f'le="{le}"')
+                out.append(f"{self.name}_bucket{bucket_labels} {cumulative:g}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {row[-1]:g}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {cumulative:g}")
+        return out
+
+
+_REGISTRY: Dict[str, _Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(cls, name: str, help: str, labelnames: Sequence[str] = (), **kwargs):
+    with _registry_lock:
+        metric = _REGISTRY.get(name)
+        if metric is None:
+            metric = _REGISTRY[name] = cls(name, help, labelnames, **kwargs)
+        return metric
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge, name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    lines: List[str] = []
+    for name in sorted(_REGISTRY):
+        lines.extend(_REGISTRY[name].render())
+    return "\n".join(lines) + "\n"
+
+
+STAGE_SECONDS = histogram("memap_stage_duration_seconds", "Time spent per pipeline stage", ("stage",))
+STAGE_CALLS = counter("memap_stage_calls_total", "Calls per pipeline stage", ("stage",))
+STAGE_ERRORS = counter("memap_stage_errors_total", "Calls per pipeline stage that raised", ("stage",))
+STAGE_IN_FLIGHT = gauge("memap_stage_in_flight", "Calls per pipeline stage currently running", ("stage",))
+CACHE_HITS = counter("memap_cache_hits_total", "Cache hits", ("cache",))
+CACHE_MISSES = counter("memap_cache_misses_total", "Cache misses", ("cache",))
+RATE_LIMITED = counter("memap_rate_limited_total", "Upstream responses signalling a rate limit", ("platform",))
+
+
+@contextmanager
+def track(stage: str, expected: Tuple[type, ...] = ()) -> Iterator[None]:
+    """Record calls, errors, in-flight count and duration for one execution of `stage`.
+
+    Exceptions listed in `expected` propagate without being counted as errors.
+    """
+    STAGE_CALLS.inc(stage)
+    STAGE_IN_FLIGHT.inc(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    except expected:
+        raise
+    except BaseException:
+        STAGE_ERRORS.inc(stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage)
+        STAGE_IN_FLIGHT.dec(stage)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    def decorate(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,209 @@
+import cProfile
+import hmac
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, List, Mapping, Optional
+
+# Profiling is only wired up when an admin token is configured
+ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN") or None
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "memap-profiles")
+SAMPLE_INTERVAL_S = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000.0
+MODES = ("pstats", "sample")
+
+
+@dataclass
+class ProfileRun:
+    mode: str
+    id: str = ""
+    path: str = ""
+    wall_ms: float = 0.0
+    peak_kb: float = 0.0
+
+
+# Set by the request middleware for the single request being profiled
+_current: ContextVar[Optional[ProfileRun]] = ContextVar("memap_profile_run", default=None)
+# tracemalloc is process-wide: one profiled handler at a time, or peaks mix and one run's
+# stop() ends tracing under another
+_run_lock = threading.Lock()
+_POOL_SUFFIX_RE = re.compile(r"_\d+$")
+
+
+class _Active:
+    """Collects what a profiled handler's pool tasks (platform fetches) did on their threads."""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.profiles: List[cProfile.Profile] = []
+        self.threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def trace(self, fn: Callable, args, kwargs):
+        ident = threading.get_ident()
+        if self.mode == "sample":
+            with self._lock:
+                self.threads[ident] = _POOL_SUFFIX_RE.sub("", threading.current_thread().name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.threads.pop(ident, None)
+        prof = cProfile.Profile()
+        try:
+            return prof.runcall(fn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.profiles.append(prof)
+
+
+# The run a handler is executing under; worker() carries it into pool threads
+_active: ContextVar[Optional[_Active]] = ContextVar("memap_profile_active", default=None)
+
+
+def worker(fn: Callable) -> Callable:
+    """`fn` for a pool thread, profiled as part of the request that submits it (if profiled).
+
+    Wrap at submit time, on the submitting thread; unprofiled requests get `fn` back.
+    """
+    active = _active.get()
+    if active is None:
+        return fn
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        token = _active.set(active)  # so tasks this one submits are traced too
+        try:
+            return active.trace(fn, args, kwargs)
+        finally:
+            _active.reset(token)
+    return run
+
+
+def is_admin(headers: Mapping[str, str]) -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(headers.get("x-admin-token", ""), ADMIN_TOKEN)
+
+
+def requested_mode(headers: Mapping[str, str], query: Mapping[str, str]) -> Optional[str]:
+    """Profiling mode for an admin-authorized request, else None."""
+    mode = headers.get("x-profile") or query.get("profile")
+    if not mode or not is_admin(headers):
+        return None
+    return mode if mode in MODES else "pstats"
+
+
+def start(mode: str) -> ProfileRun:
+    run = ProfileRun(mode=mode)
+    _current.set(run)
+    return run
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    for ext in (".pstats", ".collapsed"):
+        path = os.path.join(PROFILE_DIR, os.path.basename(profile_id) + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class _StackSampler(threading.Thread):
+    """Samples the handler thread's Python stack, and those of the pool threads working
+    for it, at a fixed interval into collapsed-stack counts rooted at the thread's role."""
+
+    def __init__(self, thread_id: int, interval: float, active: _Active):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.active = active
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            with self.active._lock:
+                roles = dict(self.active.threads)
+            roles[self.thread_id] = "handler"
+            frames = sys._current_frames()
+            for ident, role in roles.items():
+                frame = frames.get(ident)
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if names:
+                    self.stacks[";".join([role] + names[::-1])] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _run_profiled(run: ProfileRun, func: Callable, args, kwargs):
+    with _run_lock:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        run.id = uuid.uuid4().hex[:12]
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        active = _Active(run.mode)
+        token = _active.set(active)
+        t0 = time.perf_counter()
+        try:
+            if run.mode == "sample":
+                sampler = _StackSampler(threading.get_ident(), SAMPLE_INTERVAL_S, active)
+                sampler.start()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    sampler.stop()
+                    run.path = os.path.join(PROFILE_DIR, f"{run.id}.collapsed")
+                    with open(run.path, "w", encoding="utf-8") as f:
+                        for stack, n in sampler.stacks.most_common():
+                            f.write(f"{stack} {n}\n")
+            else:
+                prof = cProfile.Profile()
+                try:
+                    return prof.runcall(func, *args, **kwargs)
+                finally:
+                    # Fetches still running past the deadline are left out; they finish unprofiled
+                    stats = pstats.Stats(prof)
+                    with active._lock:
+                        for worker_prof in active.profiles:
+                            stats.add(worker_prof)
+                    run.path = os.path.join(PROFILE_DIR, f"{run.id}.pstats")
+                    stats.dump_stats(run.path)
+        finally:
+            _active.reset(token)
+            run.wall_ms = (time.perf_counter() - t0) * 1000.0
+            run.peak_kb = tracemalloc.get_traced_memory()[1] / 1024.0
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def profiled(func: Callable) -> Callable:
+    """Run the handler under the profiler when the current request asked for it.
+
+    The check is a single ContextVar lookup; unprofiled requests call straight through.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        run = _current.get()
+        if run is None:
+            return func(*args, **kwargs)
+        _current.set(None)  # nested profiled calls (e.g. exports) run plainly
+        try:
+            return _run_profiled(run, func, args, kwargs)
+        finally:
+            _current.set(run)
+    return wrapper
@@ -0,0 +1,35 @@
+import importlib
+
+import pytest
+
+from src.similarity import text_similarity
+
+A = "Security researcher. Python, Rust and open source. Opinions are my own."
+B = "Security researcher | python & rust | open-source maintainer. Views my own."
+C = "I like cats and climbing"
+
+
+@pytest.fixture
+def ngram(monkeypatch):
+    monkeypatch.setattr(text_similarity, "BIO_SIMILARITY_TIER", "ngram")
+
+
+def test_ngram_pair_score_does_not_depend_on_the_batch(ngram):
+    pair = text_similarity.bio_similarity(A, B)
+    matrix = text_similarity.bio_similarity_matrix([A, C, None], [B, C])
+    assert matrix[0, 0] == pytest.approx(pair, abs=1e-6)
+    assert matrix[2].tolist() == [0.0, 0.0]
+
+
+def test_ngram_ranks_related_bios_above_unrelated(ngram):
+    assert text_similarity.bio_similarity(A, A) == pytest.approx(1.0, abs=1e-6)
+    assert text_similarity.bio_similarity(A, B) > 0.5 > text_similarity.bio_similarity(A, C)
+
+
+def test_tfidf_is_accepted_as_the_ngram_tier(monkeypatch):
+    monkeypatch.setenv("BIO_SIMILARITY_TIER", "tfidf")
+    try:
+        assert importlib.reload(text_similarity).BIO_SIMILARITY_TIER == "ngram"
+    finally:
+        monkeypatch.delenv("BIO_SIMILARITY_TIER")
+        importlib.reload(text_similarity)
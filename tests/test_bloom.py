@@ -0,0 +1,65 @@
+import time
+
+from src.utils.bloom import BloomFilter, NegativeIndex
+
+
+def test_bloom_filter_round_trips_through_bytes():
+    bf = BloomFilter(1000)
+    for i in range(100):
+        bf.add(f"user{i}")
+    loaded = BloomFilter.from_bytes(bf.to_bytes(), 1000)
+    assert all(f"user{i}" in loaded for i in range(100)) and loaded.count == 100
+    assert sum(f"other{i}" in loaded for i in range(1000)) < 10
+
+
+def test_union_estimates_the_count_instead_of_adding():
+    a, b = BloomFilter(1000), BloomFilter(1000)
+    for i in range(200):
+        a.add(f"user{i}")
+        b.add(f"user{i + 100}")
+    a.union(b)
+    assert all(f"user{i}" in a for i in range(300))
+    a.union(b)
+    assert 270 <= a.count <= 330
+
+
+def test_rotation_keeps_one_previous_generation():
+    idx = NegativeIndex(capacity=2, ttl=3600)
+    idx.add("a")
+    idx.add("b")
+    idx.add("c")  # current was full: a and b move to the previous generation
+    assert "a" in idx and "c" in idx
+    idx.add("d")
+    idx.add("e")  # rotates again: a and b are gone
+    assert "a" not in idx and "c" in idx and "e" in idx
+
+
+def test_entries_expire_after_two_ttls():
+    idx = NegativeIndex(capacity=100, ttl=0.05)
+    idx.add("Alice")
+    assert "alice" in idx
+    time.sleep(0.07)
+    assert "alice" in idx  # rotated into the previous generation
+    time.sleep(0.06)
+    assert "alice" not in idx
+
+
+def test_persists_and_reloads(tmp_path):
+    path = str(tmp_path / "github.bloom")
+    idx = NegativeIndex(capacity=100, ttl=3600, path=path)
+    idx.add("ghost")
+    idx.save()
+    assert "ghost" in NegativeIndex(capacity=100, ttl=3600, path=path)
+
+
+def test_processes_sharing_a_file_keep_each_others_negatives(tmp_path):
+    path = str(tmp_path / "github.bloom")
+    worker_a = NegativeIndex(capacity=100, ttl=3600, path=path)
+    worker_b = NegativeIndex(capacity=100, ttl=3600, path=path)
+    worker_a.add("ghost-a")
+    worker_b.add("ghost-b")
+    worker_a.save()
+    worker_b.save()
+    reloaded = NegativeIndex(capacity=100, ttl=3600, path=path)
+    assert "ghost-a" in reloaded and "ghost-b" in reloaded
+    assert not list(tmp_path.glob("*.tmp"))
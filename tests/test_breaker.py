@@ -0,0 +1,38 @@
+import time
+
+from src.utils.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_opens_after_consecutive_failures_and_success_resets():
+    cb = CircuitBreaker("t", failures=3, cooldown=60)
+    cb.record_failure()
+    cb.record_failure()
+    cb.record_success()
+    cb.record_failure()
+    cb.record_failure()
+    assert cb.state == CLOSED and cb.allow()
+    cb.record_failure(ValueError("boom"))
+    assert cb.state == OPEN and not cb.allow()
+    assert cb.snapshot()["last_error"] == "ValueError: boom"
+
+
+def test_half_open_admits_limited_trials():
+    cb = CircuitBreaker("t", failures=1, cooldown=0.01, half_open_trials=1)
+    cb.record_failure()
+    time.sleep(0.02)
+    assert cb.current_state() == HALF_OPEN
+    assert cb.allow()
+    assert not cb.allow()  # the one trial is in flight
+    cb.release()
+    assert cb.allow()
+    cb.record_success()
+    assert cb.state == CLOSED
+
+
+def test_failed_trial_reopens():
+    cb = CircuitBreaker("t", failures=1, cooldown=0.01)
+    cb.record_failure()
+    time.sleep(0.02)
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == OPEN and not cb.allow()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from src.utils.cache import LRUCache, SQLiteCache, TieredCache
+
+
+def test_lru_evicts_least_recently_used_and_expires():
+    c = LRUCache(maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert "b" not in c and c.get("a") == 1 and c.get("c") == 3
+
+    c = LRUCache(maxsize=2, ttl=0.01)
+    c.set("a", 1)
+    time.sleep(0.02)
+    assert c.get("a", "gone") == "gone"
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path, "profiles").set(("github", "alice"), {"bio": "hi"})
+    assert SQLiteCache(path, "profiles").get(("github", "alice")) == {"bio": "hi"}
+    assert SQLiteCache(path, "other").get(("github", "alice")) is None
+
+
+def test_sqlite_cache_expires(tmp_path):
+    c = SQLiteCache(str(tmp_path / "cache.sqlite3"), "ns", ttl=0.01)
+    c.set("k", 1)
+    time.sleep(0.02)
+    assert c.get("k", "gone") == "gone"
+
+
+def test_sweep_evicts_oldest_writes_and_keeps_rows_without_ttl(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    forever = SQLiteCache(path, "ns", maxsize=3)
+    expiring = SQLiteCache(path, "ns", maxsize=3, ttl=3600)
+    forever.set("pinned", 0)
+    for i in range(4):
+        time.sleep(0.002)
+        expiring.set(i, i)
+    expiring._sweep(expiring._conn())
+    assert [expiring.get(k, "gone") for k in ("pinned", 0, 1, 2, 3)] == [0, "gone", "gone", 2, 3]
+
+
+def test_sweeps_run_on_schedule_under_concurrent_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(SQLiteCache, "_SWEEP_EVERY", 10)
+    c = SQLiteCache(str(tmp_path / "cache.sqlite3"), "ns", maxsize=5)
+    sweeps = []
+    original = c._sweep
+    monkeypatch.setattr(c, "_sweep", lambda conn: (sweeps.append(1), original(conn)))
+
+    def writer(base):
+        for i in range(25):
+            c.set((base, i), i)
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c._writes == 100 and len(sweeps) == 10
+
+
+def test_tiered_cache_falls_through_to_the_shared_store(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    a = TieredCache(LRUCache(), SQLiteCache(path, "ns"))
+    b = TieredCache(LRUCache(), SQLiteCache(path, "ns"))
+    a.set("k", "v")
+    assert b.get("k") == "v" and "k" in b.local
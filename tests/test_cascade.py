@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from src.models.types import Profile
+from src.similarity import text_similarity
+from src.similarity.cascade import cascade_score
+from src.similarity.scoring import score_comparison
+
+PLATFORMS = ["github", "reddit", "instagram", "mastodon", "hackernews"]
+WORDS = "python rust security cats climbing coffee maintainer music travel".split()
+HANDLES = ["alice", "al1ce", "alice_dev", "realalice", "a1ice", "alicf", "bob", "carol", "sam", "samuel"]
+
+
+def _person(rng):
+    return {
+        p: Profile(platform=p, username=rng.choice(HANDLES), display_name=rng.choice([None, "Alice", "Bob"]),
+                   bio=rng.choice([None, " ".join(rng.sample(WORDS, 3))]))
+        for p in rng.sample(PLATFORMS, rng.randint(0, 4))
+    }
+
+
+@pytest.mark.parametrize("tier", ["fuzzy", "ngram"])
+def test_cascade_agrees_with_full_scoring(monkeypatch, tier):
+    monkeypatch.setattr(text_similarity, "BIO_SIMILARITY_TIER", tier)
+    rng = random.Random(3)
+    for _ in range(750):
+        user_a, user_b, pa, pb = rng.choice(HANDLES), rng.choice(HANDLES), _person(rng), _person(rng)
+        threshold = rng.random()
+        full = score_comparison(user_a, user_b, pa, pb, with_images=False).impersonation_likelihood
+        result = cascade_score(user_a, user_b, pa, pb, threshold=threshold, with_images=False)
+        assert result.above == (full >= threshold)
+        assert result.lower - 1e-6 <= full <= result.upper + 1e-6
@@ -0,0 +1,56 @@
+from src.data.crawler import crawl_identity, extract_links
+from src.models.types import Profile
+from src.utils.hedge import Deadline
+
+# github:alice -> twitter:alice_tw -> instagram:alice.ig -> reddit:alice_r -> back to github:alice
+WORLD = {
+    ("github", "alice"): Profile(platform="github", username="alice", bio="https://github.com/about",
+                                 extra={"twitter_username": "alice_tw", "blog": ""}),
+    ("twitter", "alice_tw"): Profile(platform="twitter", username="alice_tw", bio="pics: instagram.com/alice.ig"),
+    ("instagram", "alice.ig"): Profile(platform="instagram", username="alice.ig", bio="u/alice_r and github.com/alice"),
+    ("reddit", "alice_r"): Profile(platform="reddit", username="alice_r", bio="see github.com/Alice"),
+}
+
+
+def _fetchers(calls):
+    def fetcher(platform):
+        def fetch(username):
+            calls.append((platform, username))
+            return WORLD.get((platform, username))
+        return fetch
+    return {p: fetcher(p) for p in ("github", "twitter", "instagram", "reddit")}
+
+
+def test_extract_links_skips_site_pages_and_self_links():
+    assert extract_links(WORLD[("github", "alice")]) == [("twitter", "alice_tw", "twitter_username")]
+    assert extract_links(WORLD[("instagram", "alice.ig")]) == [("github", "alice", "bio"), ("reddit", "alice_r", "bio")]
+
+
+def test_depth_limits_how_far_the_crawl_goes():
+    calls = []
+    result = crawl_identity([WORLD[("github", "alice")]], max_depth=2, fetchers=_fetchers(calls))
+    assert set(result.profiles) == {"twitter:alice_tw", "instagram:alice.ig"}
+    assert calls == [("twitter", "alice_tw"), ("instagram", "alice.ig")]
+    # instagram links back to the seed (an edge, no fetch) and on to reddit (past the depth limit)
+    assert ("instagram:alice.ig", "github:alice", "bio") in result.edges
+    assert result.truncated
+
+
+def test_known_accounts_are_fetched_once_and_linked():
+    calls = []
+    result = crawl_identity([WORLD[("github", "alice")]], max_depth=5, fetchers=_fetchers(calls))
+    assert sorted(calls) == sorted([("twitter", "alice_tw"), ("instagram", "alice.ig"), ("reddit", "alice_r")])
+    assert ("reddit:alice_r", "github:alice", "bio") in result.edges
+    assert result.requests == 3 and not result.truncated
+
+
+def test_request_budget_caps_lookups():
+    calls = []
+    result = crawl_identity([WORLD[("github", "alice")]], max_depth=5, max_requests=2, fetchers=_fetchers(calls))
+    assert len(calls) == 2 and result.requests == 2 and result.truncated
+
+
+def test_expired_deadline_starts_nothing():
+    calls = []
+    result = crawl_identity([WORLD[("github", "alice")]], fetchers=_fetchers(calls), deadline=Deadline(0))
+    assert calls == [] and result.truncated and result.incomplete == {"twitter"}
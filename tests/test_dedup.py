@@ -0,0 +1,41 @@
+from src.similarity.dedup import dedupe_mentions, minhash_signature, near_duplicate_groups
+
+WORDS = [f"w{i}" for i in range(40)]
+# Each window overlaps its neighbour by 14 of 20 words; the two ends overlap by 8
+A, B, C = (" ".join(WORDS[k:k + 20]) for k in (0, 6, 12))
+
+
+def _estimate(x, y):
+    return float((minhash_signature(x) == minhash_signature(y)).mean())
+
+
+def test_signature_is_deterministic_and_case_insensitive():
+    assert (minhash_signature("Hello World") == minhash_signature("hello world")).all()
+    assert minhash_signature("") is None and minhash_signature("  ...  ") is None
+
+
+def test_band_grouping_separates_unrelated_texts():
+    groups = near_duplicate_groups(["the quick brown fox jumps", "The quick brown fox jumps!", "lorem ipsum dolor sit amet"])
+    assert groups == [[0, 1], [2]]
+
+
+def test_union_find_merges_chains_transitively():
+    assert _estimate(A, B) >= 0.4 and _estimate(B, C) >= 0.4 and _estimate(A, C) < 0.4
+    assert near_duplicate_groups([A, C, B], threshold=0.4) == [[0, 1, 2]]
+    assert near_duplicate_groups([A, C], threshold=0.4) == [[0], [1]]
+
+
+def test_empty_texts_stay_singletons():
+    assert near_duplicate_groups([A, "", None, A]) == [[0, 3], [1], [2]]
+
+
+def test_dedupe_mentions_keeps_first_and_lists_duplicates():
+    mentions = [
+        {"title": "Alice joins Acme", "snippet": "Alice Smith has joined Acme as CTO", "link": "https://a.example"},
+        {"title": "Unrelated", "snippet": "Weather report for Tuesday", "link": "https://b.example"},
+        {"title": "Alice joins Acme", "snippet": "Alice Smith has joined Acme as CTO.", "link": "https://c.example"},
+    ]
+    distinct = dedupe_mentions(mentions)
+    assert [m["link"] for m in distinct] == ["https://a.example", "https://b.example"]
+    assert distinct[0]["duplicates"] == ["https://c.example"] and distinct[1]["duplicates"] == []
+    assert "duplicates" not in mentions[0]
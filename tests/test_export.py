@@ -0,0 +1,51 @@
+import csv
+import io
+
+import networkx as nx
+
+from src.api.server import Edge, Node
+from src.graph.export import iter_csv_edges, iter_graphml, to_columnar
+
+NODES = [
+    Node(id="user:o'cat", label="o'cat", group="user"),
+    Node(id="github:octocat", label="github:octocat", group="github",
+         meta={"bio": 'Says "hi" & <waves>', "followers": 42, "internal": "not exported"}),
+    Node(id="reddit:octocat", label="reddit:octocat", group="reddit", x=1.5, y=-2.0),
+]
+EDGES = [
+    Edge(source="user:o'cat", target="github:octocat", weight=0.75),
+    Edge(source="github:octocat", target="reddit:octocat", label="bio link, \"blog\""),
+    Edge(source="github:octocat", target="gone:node"),
+]
+
+
+def test_graphml_round_trips_through_networkx():
+    g = nx.read_graphml(io.BytesIO("".join(iter_graphml(NODES, EDGES[:2])).encode("utf-8")))
+    assert set(g.nodes) == {n.id for n in NODES}
+    assert g.nodes["github:octocat"]["bio"] == 'Says "hi" & <waves>'
+    assert g.nodes["github:octocat"]["followers"] == "42"
+    assert "internal" not in g.nodes["github:octocat"]
+    assert g.edges["user:o'cat", "github:octocat"]["weight"] == 0.75
+    assert g.edges["github:octocat", "reddit:octocat"]["label"] == 'bio link, "blog"'
+
+
+def test_csv_edges_round_trip_across_chunks():
+    chunks = list(iter_csv_edges(EDGES, chunk_rows=1))
+    assert len(chunks) == len(EDGES) + 1
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert [(r["source"], r["target"], r["weight"], r["label"]) for r in rows] == [
+        ("user:o'cat", "github:octocat", "0.75", ""),
+        ("github:octocat", "reddit:octocat", "", 'bio link, "blog"'),
+        ("github:octocat", "gone:node", "", ""),
+    ]
+
+
+def test_columnar_rebuilds_the_graph():
+    col = to_columnar(NODES, EDGES, include_meta=True)
+    ids = col["nodes"]["id"]
+    assert [col["groups"][g] for g in col["nodes"]["group"]] == ["user", "github", "reddit"]
+    # Edges to nodes outside the graph are dropped; the rest reference node indexes
+    assert [(ids[s], ids[t]) for s, t in zip(col["edges"]["source"], col["edges"]["target"])] == [
+        (e.source, e.target) for e in EDGES[:2]]
+    assert col["nodes"]["x"] == [None, None, 1.5]
+    assert col["meta"]["followers"] == [None, 42, None]
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from src.data import fetching
+from src.models.types import Profile
+from src.utils import hedge
+from src.utils.breaker import CLOSED, breaker
+
+
+@pytest.fixture
+def hedger(monkeypatch):
+    """A hedger that duplicates any call still running after 50 ms."""
+    h = hedge.Hedger(max_workers=4, tracker=hedge.LatencyTracker(min_samples=1))
+    monkeypatch.setattr(hedge, "_hedger", h)
+    return h
+
+
+def _attempts(*behaviours):
+    """fn whose n-th invocation sleeps, then returns or raises as behaviours[n] says."""
+    calls = []
+    lock = threading.Lock()
+
+    def fn(arg):
+        with lock:
+            n = len(calls)
+            calls.append(arg)
+        delay, outcome = behaviours[n]
+        time.sleep(delay)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    fn.calls = calls
+    return fn
+
+
+def test_duplicate_wins_when_the_first_attempt_is_slow(hedger):
+    hedger.tracker.observe("k", 0.05)
+    fn = _attempts((0.5, "first"), (0.0, "second"))
+    assert hedger.call("k", fn, "x", hedge=True) == "second"
+
+
+def test_a_failed_attempt_waits_for_the_other(hedger):
+    hedger.tracker.observe("k", 0.05)
+    fn = _attempts((0.1, RuntimeError("first")), (0.2, "second"))
+    assert hedger.call("k", fn, "x", hedge=True) == "second"
+    fn = _attempts((0.1, RuntimeError("first")), (0.0, RuntimeError("second")))
+    with pytest.raises(RuntimeError):
+        hedger.call("k", fn, "x", hedge=True)
+
+
+def test_fast_calls_are_not_duplicated(hedger):
+    hedger.tracker.observe("k", 0.05)
+    fn = _attempts((0.0, "only"))
+    assert hedger.call("k", fn, "x", hedge=True) == "only"
+    assert len(fn.calls) == 1
+
+
+def test_gather_reports_deadline_misses(hedger):
+    calls = [("fast", _attempts((0.0, 1)), (None,)), ("slow", _attempts((0.5, 2)), (None,))]
+    results, missed = hedge.gather(calls, hedge.Deadline(0.2))
+    assert results == [1, None] and missed == ["slow"]
+
+
+def _platform_fetcher(monkeypatch, hedger, platform, fn):
+    monkeypatch.setattr(fetching, "PROFILE_CACHE_TTL", 0)
+    monkeypatch.setattr(fetching, "negative_index", lambda _platform: None)
+    monkeypatch.setattr(hedge, "HEDGE_PLATFORMS", {platform})
+    hedger.tracker.observe(platform, 0.05)
+    return fetching.platform_fetcher(platform)(fn)
+
+
+def test_half_open_trial_is_not_lost_to_its_hedge(monkeypatch, hedger):
+    cb = breaker("hedge-half-open")
+    cb.failures, cb.cooldown = 1, 0.0
+    cb.record_failure()
+    profile = Profile(platform="hedge-half-open", username="alice")
+    fetch = _platform_fetcher(monkeypatch, hedger, "hedge-half-open", _attempts((0.3, profile), (0.3, profile)))
+    assert fetch("alice") == profile
+    assert cb.state == CLOSED
+
+
+def test_a_hedged_failure_counts_once(monkeypatch, hedger):
+    cb = breaker("hedge-closed")
+    fetch = _platform_fetcher(monkeypatch, hedger, "hedge-closed",
+                              _attempts((0.2, RuntimeError("a")), (0.0, RuntimeError("b"))))
+    assert fetch("alice") is None
+    assert cb.consecutive_failures == 1
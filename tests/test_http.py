@@ -0,0 +1,52 @@
+import json
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.http import CassetteSession
+
+
+class _TokenAdapter(BaseAdapter):
+    """Answers every request like an OAuth token endpoint."""
+
+    def send(self, request, **kwargs):
+        r = requests.Response()
+        r.status_code = 200
+        r.headers = CaseInsensitiveDict({"Content-Type": "application/json", "Set-Cookie": "session=abc"})
+        r._content = json.dumps({"access_token": "s3cret", "scope": "*", "nested": [{"refresh_token": "r"}]}).encode()
+        r.url = request.url
+        r.request = request
+        return r
+
+    def close(self):
+        pass
+
+
+def _recorder(path):
+    s = CassetteSession(str(path), "record")
+    s.mount("https://", _TokenAdapter())
+    return s
+
+
+def test_recorded_cassettes_hold_no_credentials(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    live = _recorder(path).post("https://www.reddit.com/api/v1/access_token")
+    assert live.json()["access_token"] == "s3cret"
+
+    on_disk = path.read_text()
+    assert "s3cret" not in on_disk and "session=abc" not in on_disk
+    replayed = CassetteSession(str(path), "replay").post("https://www.reddit.com/api/v1/access_token")
+    assert replayed.json() == {"access_token": "REDACTED", "scope": "*", "nested": [{"refresh_token": "REDACTED"}]}
+    assert "Set-Cookie" not in replayed.headers
+
+
+def test_fork_has_its_own_headers_but_shares_the_cassette(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    shared = _recorder(path)
+    forked = shared.fork()
+    forked.headers["User-Agent"] = "praw"
+    assert shared.headers["User-Agent"] != "praw"
+
+    forked.get("https://oauth.reddit.com/user/alice/about")
+    assert any(k.startswith("GET https://oauth.reddit.com/user/alice/about") for k in shared._entries)
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from src.graph import layout
+
+
+def _star(n):
+    nodes = ["root"] + [f"p{i}" for i in range(n - 1)]
+    return nodes, [("root", p) for p in nodes[1:]]
+
+
+@pytest.fixture(autouse=True)
+def cold_cache():
+    layout._layout_cache.clear()
+
+
+def test_small_graphs_are_left_to_the_browser():
+    assert layout.compute_layout(*_star(layout.LAYOUT_MIN_NODES - 1)) == {}
+
+
+@pytest.mark.parametrize("n", [layout.LAYOUT_MIN_NODES, layout._SPRING_MAX_NODES + 1])
+def test_large_graphs_get_distinct_positions_for_every_node(n):
+    nodes, edges = _star(n)
+    positions = layout.compute_layout(nodes, edges)
+    assert set(positions) == set(nodes)
+    assert len({(round(x, 3), round(y, 3)) for x, y in positions.values()}) == n
+
+
+def test_layouts_are_cached_by_topology():
+    nodes, edges = _star(layout.LAYOUT_MIN_NODES)
+    first = layout.compute_layout(nodes, edges)
+    assert layout.compute_layout(reversed(nodes), [(b, a) for a, b in edges]) == first
+
+
+def test_static_options_turn_physics_off():
+    opts = json.loads(layout.static_options(json.dumps({"physics": {"enabled": True}, "edges": {"smooth": True}})))
+    assert opts["physics"] == {"enabled": False} and opts["edges"]["smooth"] is False
@@ -0,0 +1,23 @@
+from src.models.types import Profile
+from src.similarity.matrix import ROOT, score_matrix
+
+
+def _profiles(handles):
+    return {p: Profile(platform=p, username=h) for p, h in handles.items()}
+
+
+def test_top_matches_reports_each_handle_pair_once():
+    a = _profiles({"github": "alice", "reddit": "alice", "instagram": "alice"})
+    b = _profiles({"github": "al1ce", "reddit": "al1ce", "instagram": "al1ce"})
+    matches = score_matrix("alice", "al1ce", a, b, with_bio=False).top_matches(k=5)
+    pairs = [(m.username_a, m.username_b) for m in matches]
+    assert pairs == [("alice", "al1ce")]
+    assert ROOT not in (matches[0].a, matches[0].b)
+
+
+def test_top_matches_includes_root_vs_profile_pairs():
+    a = _profiles({"github": "bob"})
+    b = _profiles({"github": "carol", "reddit": "alice_official"})
+    matches = score_matrix("alice", "carol", a, b, with_bio=False).top_matches(k=5)
+    assert ("alice", "alice_official") in [(m.username_a, m.username_b) for m in matches]
+    assert all(not (m.a == ROOT and m.b == ROOT) for m in matches)
@@ -0,0 +1,23 @@
+import requests
+
+from src.utils import http, metrics
+
+
+def _response(status: int) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    return r
+
+
+def test_rate_limits_are_labelled_by_platform():
+    before = metrics.RATE_LIMITED.value("github")
+    with http.for_platform("github"):
+        http._note_rate_limit(_response(429))
+    http._note_rate_limit(_response(200))
+    assert metrics.RATE_LIMITED.value("github") == before + 1
+
+
+def test_label_values_are_escaped():
+    c = metrics.Counter("memap_test_total", "test", ("platform",))
+    c.inc('a"b\\c\nd')
+    assert c.render()[-1] == 'memap_test_total{platform="a\\"b\\\\c\\nd"} 1'
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.models.profile_store import ProfileStore
+from src.models.types import Profile
+from src.similarity.image_similarity import hash_similarity
+from src.similarity.text_similarity import compare_usernames, simhash64
+
+BIO = "Security researcher. Python, Rust and open source."
+
+
+def _store(handles, platform="github", fetched_at=None, avatars=None):
+    profiles = [Profile(platform=platform, username=h, bio=BIO if i % 2 == 0 else None, followers=i,
+                        avatar_url=f"https://example.com/{h}.png") for i, h in enumerate(handles)]
+    return ProfileStore.from_profiles(profiles, avatar_hashes=avatars, fetched_at=fetched_at)
+
+
+def test_rows_keep_their_own_fetch_time():
+    store = _store(["a", "b", "c"], fetched_at=[100.0, 200.0, 300.0])
+    assert store.usernames(np.flatnonzero(store.mask(fetched_after=150))) == ["b", "c"]
+    with pytest.raises(ValueError):
+        _store(["a", "b"], fetched_at=[1.0])
+
+
+def test_concat_remaps_platforms_and_keeps_fetch_times():
+    merged = ProfileStore.concat([_store(["old"], "github", fetched_at=100.0),
+                                  _store(["new", "newer"], "reddit", fetched_at=[300.0, 400.0])])
+    assert merged.usernames() == ["old", "new", "newer"]
+    assert [merged.profile(i).platform for i in range(3)] == ["github", "reddit", "reddit"]
+    assert merged.usernames(np.flatnonzero(merged.mask(fetched_after=200))) == ["new", "newer"]
+    assert merged.usernames(np.flatnonzero(merged.mask(platform="github"))) == ["old"]
+
+
+def test_save_and_memory_mapped_load_round_trip(tmp_path):
+    store = _store(["alice", "bób"], fetched_at=[1.0, 2.0])
+    store.save(str(tmp_path))
+    loaded = ProfileStore.load(str(tmp_path))
+    assert loaded.usernames() == ["alice", "bób"] and loaded.fetched_at.tolist() == [1.0, 2.0]
+
+
+def test_scores_match_the_pairwise_similarity_functions():
+    store = _store(["alice", "al1ce_dev", "bob"], avatars={"https://example.com/alice.png": 0xF0F0})
+    assert store.username_similarity("Alice").tolist() == pytest.approx(
+        [compare_usernames("Alice", h) for h in ["alice", "al1ce_dev", "bob"]], abs=1e-6)
+    query = "Security researcher: Python and Rust, open source."
+    bio = store.bio_similarity(query)
+    assert bio[0] == pytest.approx(hash_similarity(simhash64(query), simhash64(BIO)))
+    assert math.isnan(bio[1])
+    avatar = store.avatar_similarity(0xF0F1)
+    assert avatar[0] == pytest.approx(hash_similarity(0xF0F1, 0xF0F0)) and math.isnan(avatar[1])
@@ -0,0 +1,67 @@
+import pstats
+import threading
+import time
+
+import pytest
+
+from src.utils import hedge, profiling
+
+
+def slow_platform_lookup(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _handler():
+    results, _missed = hedge.gather([("slow", slow_platform_lookup, (0.2,))], hedge.Deadline(5))
+    return results
+
+
+@pytest.fixture
+def profile_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "SAMPLE_INTERVAL_S", 0.005)
+
+
+def _profile(mode):
+    run = profiling.start(mode)
+    assert profiling.profiled(_handler)() == [0.2]
+    profiling._current.set(None)
+    return run
+
+
+def test_pstats_include_pool_threads(profile_dir):
+    run = _profile("pstats")
+    funcs = {name for _file, _line, name in pstats.Stats(run.path).stats}
+    assert "slow_platform_lookup" in funcs
+
+
+def test_samples_name_the_pool_thread_and_lookup(profile_dir):
+    run = _profile("sample")
+    with open(run.path, encoding="utf-8") as f:
+        stacks = f.read()
+    assert any(line.startswith("memap-fetch;") and "slow_platform_lookup" in line for line in stacks.splitlines())
+
+
+def test_profiled_runs_are_serialized(profile_dir):
+    inside = []
+
+    def handler():
+        inside.append(1)
+        overlap = len(inside) > 1
+        time.sleep(0.05)
+        inside.pop()
+        return overlap
+
+    overlaps = []
+
+    def request():
+        profiling.start("pstats")
+        overlaps.append(profiling.profiled(handler)())
+
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert overlaps == [False, False, False]
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.models.types import Profile
+
+
+def test_full_name_search_limit_counts_distinct_profiles(monkeypatch):
+    # Every candidate handle resolves to the same GitHub account (as case/separator variants
+    # of one name often do); Reddit has a distinct account per candidate
+    fetchers = {
+        "github": lambda cand: Profile(platform="github", username="janedoe"),
+        "reddit": lambda cand: Profile(platform="reddit", username=cand),
+        "instagram": lambda cand: None,
+        "twitter": lambda cand: None,
+    }
+    monkeypatch.setattr(server, "_fetchers", lambda: fetchers)
+    graph = TestClient(server.app).get("/footprint", params={"full_name": "Jane Doe", "limit": 4,
+                                                             "per_platform": 10}).json()
+    profile_nodes = [n for n in graph["nodes"] if n["group"] != "user"]
+    assert len(profile_nodes) == 4
+    assert [n["id"] for n in profile_nodes].count("github:janedoe") == 1
@@ -0,0 +1,33 @@
+import pytest
+
+from src.similarity.text_similarity import skeleton
+
+
+@pytest.mark.parametrize("a, b", [
+    ("octocat", "0ctocat"),
+    ("octocat", "оctocat"),  # Cyrillic о
+    ("octocat", "octo_cat"),
+    ("octocat", "OctoCat"),
+    ("BILL", "BlLL"),  # capital I vs lowercase l
+    ("paypal", "paypa1"),
+    ("modern", "rnodern"),
+    ("wave", "vvave"),
+    ("alice", "аlіce"),  # Cyrillic а and і
+])
+def test_lookalikes_share_a_skeleton(a, b):
+    assert skeleton(a) == skeleton(b)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("kim", "klm"),  # lowercase i and l do not look alike
+    ("kim", "kIm"),
+    ("clare", "dare"),
+    ("sam", "samuel"),
+    ("alice", "alicf"),
+])
+def test_distinct_handles_keep_distinct_skeletons(a, b):
+    assert skeleton(a) != skeleton(b)
+
+
+def test_empty():
+    assert skeleton(None) == skeleton("") == ""